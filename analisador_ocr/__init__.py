@@ -0,0 +1,40 @@
+"""Implementação de referência, em Python, da leitura de ofertas do OcrService.kt.
+
+Reproduz o sanitizeOcrErrors e as versões do analyzeSmartData sobre a lista de
+blocos {"text", "h", "y"} que o WindowMonitorService manda, para avaliar
+quadros capturados sem instalar nada no celular:
+
+    from analisador_ocr import analisar_quadro
+    resultado = analisar_quadro([{"text": "R$ 25,90", "h": 90, "y": 800}, ...],
+                                pacote="com.ubercab.driver", altura_tela=2400)
+
+Em lote: python -m analisador_ocr quadros.jsonl
+Bloco a bloco (fluxo ao vivo): python -m analisador_ocr.incremental < fluxo.jsonl
+Corpus a partir dos logs do saveLog: python -m analisador_ocr.reproducao extrair motorista_pro_logs.txt
+Corpus colunar (mmap): python -m analisador_ocr.colunar converter corpus.jsonl --saida corpus.ocrc
+Comparação das variantes sobre um corpus: python -m analisador_ocr.avaliacao corpus/*.jsonl.gz
+Quais filtros anti-espelho/ruído mais descartam blocos: python -m analisador_ocr.filtros corpus.jsonl
+Benchmark por etapa (JSON do pytest-benchmark): python -m analisador_ocr.benchmark --json base.json
+Calibragem dos limites sobre o histórico (requer numpy): python -m analisador_ocr.lote corridas.jsonl
+"""
+
+from .modelo import RideData, Limites, Resultado, OTIMA, RECUSAR, ANALISAR, classificar, valores_por_unidade
+from .sanitizacao import sanitizar_erros_ocr
+from .tokenizador import Tokens, extrair_tokens
+from .variantes import VARIANTES, ESTADOS, nova_logica, novo_analyze
+from .analisador import AnalisadorOcr, CacheQuadros, analisar_quadro
+
+# Módulos com CLI próprio (python -m analisador_ocr.<módulo>) não são importados
+# aqui: carregá-los junto com o pacote faz o runpy avisar ao rodar o CLI
+IMPORTACAO_SOB_DEMANDA = {"FiltroBlocos": ".filtros", "LeituraIncremental": ".incremental"}
+
+def __getattr__(nome):
+    if nome in IMPORTACAO_SOB_DEMANDA:
+        from importlib import import_module
+        return getattr(import_module(IMPORTACAO_SOB_DEMANDA[nome], __name__), nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+__all__ = [
+    "RideData", "Limites", "Resultado", "OTIMA", "RECUSAR", "ANALISAR", "classificar", "valores_por_unidade",
+    "sanitizar_erros_ocr", "Tokens", "extrair_tokens", "FiltroBlocos", "VARIANTES", "ESTADOS", "nova_logica", "novo_analyze", "LeituraIncremental", "AnalisadorOcr", "CacheQuadros", "analisar_quadro",
+]
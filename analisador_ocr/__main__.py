@@ -0,0 +1,67 @@
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from dataclasses import asdict
+
+from .modelo import Limites
+from .variantes import VARIANTES, VARIANTES_COM_FILTRO
+from .filtros import carregar_filtro
+from .analisador import AnalisadorOcr, CacheQuadros
+
+# Entrada: um quadro por linha (JSONL)
+#   {"blocos": [{"text": "...", "h": 90, "y": 800}, ...], "pacote": "com.ubercab.driver", "altura_tela": 2400}
+# Saída: uma linha por quadro com o resultado (ou null quando o card não apareceria)
+
+def ler_quadros(arquivo):
+    for linha in arquivo:
+        if linha.strip():
+            yield json.loads(linha)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr",
+                                     description="Avalia quadros de OCR capturados com a lógica do analyzeSmartData.")
+    parser.add_argument("quadros", help="Arquivo JSONL de quadros ('-' para stdin).")
+    parser.add_argument("--variante", choices=sorted(VARIANTES), default="nova_logica")
+    parser.add_argument("--saida", help="Grava os resultados em JSONL (padrão: stdout).")
+    parser.add_argument("--sem-duplicidade", action="store_true",
+                        help="Avalia cada quadro isolado (desliga o anti-duplicidade do lastRideData).")
+    parser.add_argument("--cache", type=int, default=0, metavar="N",
+                        help="Guarda a leitura dos últimos N quadros distintos (telas repetidas não são lidas de novo).")
+    parser.add_argument("--vocabulario", help="JSON {\"regra\": [\"termo\", ...]} dos filtros (padrão: os do NOVA_LOGICA).")
+    parser.add_argument("--good-km", type=float, default=Limites.good_km)
+    parser.add_argument("--bad-km", type=float, default=Limites.bad_km)
+    parser.add_argument("--good-hour", type=float, default=Limites.good_hour)
+    parser.add_argument("--bad-hour", type=float, default=Limites.bad_hour)
+    args = parser.parse_args()
+
+    if args.vocabulario and args.variante not in VARIANTES_COM_FILTRO:
+        parser.error(f"--vocabulario só vale para: {', '.join(VARIANTES_COM_FILTRO)}")
+    try:
+        filtro = carregar_filtro(args.vocabulario)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    limites = Limites(args.good_km, args.bad_km, args.good_hour, args.bad_hour)
+    cache = CacheQuadros(args.cache) if args.cache > 0 else None
+    analisador = AnalisadorOcr(args.variante, limites, cache=cache, filtro=filtro)
+    entrada = sys.stdin if args.quadros == "-" else open(args.quadros, 'r', encoding='utf-8')
+    saida = open(args.saida, 'w', encoding='utf-8') if args.saida else sys.stdout
+
+    contagem = Counter()
+    inicio = time.perf_counter()
+    with entrada, saida:
+        for quadro in ler_quadros(entrada):
+            if args.sem_duplicidade:
+                analisador.reiniciar()
+            resultado = analisador.processar(quadro["blocos"], quadro.get("pacote", ""), quadro.get("altura_tela", 2000))
+            contagem["quadros"] += 1
+            contagem[resultado.status if resultado else "sem card"] += 1
+            saida.write(json.dumps(asdict(resultado) if resultado else None, ensure_ascii=False) + "\n")
+    segundos = time.perf_counter() - inicio
+
+    resumo = " | ".join(f"{k}: {v}" for k, v in contagem.most_common())
+    if cache:
+        e = cache.estatisticas()
+        resumo += f" | cache: {e['acertos']} acertos, {e['falhas']} falhas ({100 * e['taxa_acerto']:.1f}%)"
+    print(f"{resumo} | {contagem['quadros'] / segundos if segundos else 0:.0f} quadros/s", file=sys.stderr)
@@ -0,0 +1,113 @@
+import json
+from collections import OrderedDict
+
+from .modelo import Limites, montar_resultado
+from .variantes import CORTES_TOPO, obter_variante, kotlin_double, detectar_app, inteiro_json
+
+# ==============================================================================
+# ANALISADOR (ESTADO ENTRE QUADROS)
+# ==============================================================================
+# O OcrService guarda lastRideData entre chamadas: a mesma leitura repetida não
+# mostra o card de novo, até o card sumir (hideCard / ACTION_HIDE_CARD zeram o
+# estado). O AnalisadorOcr reproduz isso para uma sequência de quadros.
+
+# ==============================================================================
+# CACHE DE QUADROS
+# ==============================================================================
+# Cada evento de acessibilidade manda o quadro inteiro de novo, e os corpus de
+# reprodução são quase só repetições da mesma tela. O CacheQuadros guarda a
+# leitura (RideData, app) de cada quadro já visto, com despejo LRU.
+#
+# A impressão digital só leva o que muda a leitura: o app (não o pacote), e o
+# texto e a altura dos blocos abaixo do corte do topo da variante (CORTES_TOPO;
+# o y só decide se o bloco entra). Telas iguais que só rolaram alguns pixels caem na mesma chave.
+# O filtro entra na chave: analisadores com vocabulários diferentes podem
+# dividir o mesmo cache. Num acerto a variante não roda, então as linhas de LIDO/CANDIDATO do
+# novo_analyze não são registradas de novo.
+
+class CacheQuadros:
+
+    def __init__(self, capacidade=1024):
+        self.capacidade = capacidade
+        self.entradas = OrderedDict()
+        self.acertos = self.falhas = self.despejos = 0
+
+    def impressao_digital(self, variante, blocos, pacote, altura_tela, filtro=None):
+        limite_topo = altura_tela * CORTES_TOPO[variante]
+        visiveis = []
+        for bloco in blocos:
+            if inteiro_json(bloco["y"]) >= limite_topo:
+                visiveis.append((str(bloco["text"]), inteiro_json(bloco["h"])))
+        return variante, filtro, detectar_app(pacote), tuple(visiveis)
+
+    def obter(self, chave):
+        if chave in self.entradas:
+            self.entradas.move_to_end(chave)
+            self.acertos += 1
+            return self.entradas[chave]
+        self.falhas += 1
+        return None
+
+    def guardar(self, chave, leitura):
+        self.entradas[chave] = leitura
+        if len(self.entradas) > self.capacidade:
+            self.entradas.popitem(last=False)
+            self.despejos += 1
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {"acertos": self.acertos, "falhas": self.falhas, "despejos": self.despejos,
+                "entradas": len(self.entradas), "taxa_acerto": self.acertos / consultas if consultas else 0.0}
+
+class AnalisadorOcr:
+
+    def __init__(self, variante="nova_logica", limites=None, registrar=None, cache=None, filtro=None):
+        self.nome_variante = variante
+        self.filtro = filtro  # FiltroBlocos opcional no lugar do vocabulário padrão
+        self.variante = obter_variante(variante, filtro)
+        self.limites = limites or Limites()
+        self.registrar = registrar or (lambda msg: None)
+        self.cache = cache  # CacheQuadros opcional (pode ser dividido entre analisadores)
+        self.ultimo = None  # lastRideData
+
+    def reiniciar(self):
+        """Equivale ao card sumir: a próxima leitura igual volta a aparecer."""
+        self.ultimo = None
+
+    def processar(self, blocos, pacote="", altura_tela=2000):
+        """Analisa um quadro. Retorna o Resultado que o card mostraria, ou None."""
+        if isinstance(blocos, str):
+            blocos = json.loads(blocos)
+        try:
+            ride, app = self.ler(blocos, pacote, altura_tela)
+        except (KeyError, TypeError, ValueError) as e:
+            # O Kotlin engole qualquer exceção do quadro (JSON inválido, campo faltando)
+            if self.nome_variante == "novo_analyze":
+                self.registrar(f"ERRO FATAL NA ANÁLISE: {e}")
+            return None
+        if ride is None:
+            return None
+        if self.ultimo is not None and self.ultimo == ride:
+            if self.nome_variante == "novo_analyze":
+                self.registrar("AÇÃO: Ignorado (Duplicidade)")
+            return None
+        self.ultimo = ride
+        if self.nome_variante == "nova_logica":
+            self.registrar(f"SUCESSO: R$ {kotlin_double(ride.price)} | {kotlin_double(ride.dist)} km | "
+                           f"{kotlin_double(ride.time)} min")
+        return montar_resultado(ride, app, self.limites)
+
+    def ler(self, blocos, pacote, altura_tela):
+        """(RideData ou None, app) do quadro, pelo cache quando houver."""
+        if self.cache is None:
+            return self.variante(blocos, pacote, altura_tela, self.registrar)
+        chave = self.cache.impressao_digital(self.nome_variante, blocos, pacote, altura_tela, self.filtro)
+        leitura = self.cache.obter(chave)
+        if leitura is None:
+            leitura = self.variante(blocos, pacote, altura_tela, self.registrar)
+            self.cache.guardar(chave, leitura)
+        return leitura
+
+def analisar_quadro(blocos, pacote="", altura_tela=2000, variante="nova_logica", limites=None, filtro=None):
+    """Versão sem estado: o Resultado de um quadro isolado (sem anti-duplicidade), ou None."""
+    return AnalisadorOcr(variante, limites, filtro=filtro).processar(blocos, pacote, altura_tela)
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import time
+import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .variantes import VARIANTES, VARIANTES_COM_FILTRO, obter_variante
+from .filtros import FiltroBlocos, carregar_vocabulario
+from .reproducao import ler_corpus
+
+# ==============================================================================
+# AVALIAÇÃO DAS VARIANTES SOBRE UM CORPUS ROTULADO
+# ==============================================================================
+# Roda N variantes do analyzeSmartData sobre os mesmos quadros e mede, por
+# variante, quantas leituras batem com o rótulo (card sim/não, preço, distância
+# e tempo), a vazão e os percentis de latência por quadro. Cada arquivo do
+# corpus vira uma tarefa de um pool de processos; os resultados são somados.
+#
+# Rótulo de um registro do corpus (JSONL, .gz, .ocrc ou o próprio log):
+#   "rotulo": {"price", "dist", "time"}  o card certo (null = não devia aparecer)
+#   sem "rotulo", vale o veredito do log ("esperado" do analisador_ocr.reproducao)
+#   sem nenhum dos dois, o quadro só entra na vazão e na latência.
+#
+# Com um vocabulário de filtros (--vocabulario), as variantes que aceitam
+# filtro (VARIANTES_COM_FILTRO) rodam com ele; as outras não mudam.
+#
+# Tolerâncias padrão: a precisão em que o log grava os valores (preço com
+# centavos, distância com 1 casa e tempo em minutos inteiros).
+
+TOLERANCIAS = {"price": 0.005, "dist": 0.05, "time": 0.5}
+CAMPOS = ("price", "dist", "time")
+PERCENTIS = (50, 90, 99)
+
+def rotulo(registro):
+    """(tem_rotulo, card) do registro; card é {"price", "dist", "time"} ou None."""
+    if "rotulo" in registro:
+        return True, registro["rotulo"]
+    if "esperado" in registro:
+        e = registro["esperado"]
+        if e and e.get("completo", True) and not registro.get("erro"):
+            return True, e
+        return True, None
+    return False, None
+
+def novas_metricas():
+    return {"quadros": 0, "rotulados": 0, "card_ok": 0, "com_card": 0,
+            "price_ok": 0, "dist_ok": 0, "time_ok": 0, "segundos": 0.0, "latencias": array('d')}
+
+def avaliar_arquivo(caminho, variantes, tolerancias=None, vocabulario=None):
+    """Métricas por variante para um arquivo do corpus (roda dentro de um processo do pool)."""
+    tolerancias = tolerancias or TOLERANCIAS
+    # O filtro é montado no processo do pool; só o vocabulário (dict) atravessa
+    filtro = FiltroBlocos(vocabulario) if vocabulario is not None else None
+    funcoes = [(nome, obter_variante(nome, filtro if nome in VARIANTES_COM_FILTRO else None)) for nome in variantes]
+    metricas = {nome: novas_metricas() for nome in variantes}
+    relogio = time.perf_counter_ns
+    for registro in ler_corpus(caminho):
+        blocos = registro["blocos"]
+        pacote = registro.get("pacote", "")
+        altura = registro.get("altura_tela", 2000)
+        tem_rotulo, certo = rotulo(registro)
+        for nome, funcao in funcoes:
+            inicio = relogio()
+            try:
+                ride, _ = funcao(blocos, pacote, altura)
+            except (KeyError, TypeError, ValueError):
+                ride = None
+            duracao = (relogio() - inicio) / 1000.0  # µs
+            m = metricas[nome]
+            m["quadros"] += 1
+            m["latencias"].append(duracao)
+            if not tem_rotulo:
+                continue
+            m["rotulados"] += 1
+            m["card_ok"] += (ride is None) == (certo is None)
+            if certo is None:
+                continue
+            m["com_card"] += 1
+            if ride is not None:
+                for campo in CAMPOS:
+                    m[campo + "_ok"] += abs(getattr(ride, campo) - certo[campo]) <= tolerancias[campo]
+    for m in metricas.values():
+        m["segundos"] = sum(m["latencias"]) / 1e6
+    return metricas
+
+def juntar(total, parcial):
+    for nome, m in parcial.items():
+        if nome not in total:
+            total[nome] = novas_metricas()
+        for chave, valor in m.items():
+            if chave == "latencias":
+                total[nome]["latencias"].extend(valor)
+            else:
+                total[nome][chave] += valor
+    return total
+
+def percentil(ordenados, p):
+    """Percentil pelo posto mais próximo (nearest-rank)."""
+    if not ordenados:
+        return 0.0
+    posto = max(1, -(-p * len(ordenados) // 100))
+    return ordenados[int(posto) - 1]
+
+def resumir(metricas):
+    """Números finais de uma variante (sem as latências brutas). Acertos sem nada
+    rotulado (ou sem card rotulado, para preço/distância/tempo) ficam None."""
+    ordenadas = sorted(metricas["latencias"])
+    rotulados = metricas["rotulados"]
+    com_card = metricas["com_card"]
+    resumo = {
+        "quadros": metricas["quadros"],
+        "rotulados": rotulados,
+        "com_card": com_card,
+        "acerto_card": metricas["card_ok"] / rotulados if rotulados else None,
+        "quadros_por_s": metricas["quadros"] / metricas["segundos"] if metricas["segundos"] else 0.0,
+    }
+    for campo in CAMPOS:
+        resumo[f"acerto_{campo}"] = metricas[campo + "_ok"] / com_card if com_card else None
+    for p in PERCENTIS:
+        resumo[f"p{p}_us"] = percentil(ordenadas, p)
+    return resumo
+
+def avaliar(arquivos, variantes=None, processos=None, tolerancias=None, vocabulario=None):
+    """Avalia as variantes sobre todos os arquivos; {variante: resumo} e os segundos de relógio."""
+    variantes = list(variantes or VARIANTES)
+    inicio = time.perf_counter()
+    total = {}
+    if processos == 1 or len(arquivos) == 1:
+        for caminho in arquivos:
+            juntar(total, avaliar_arquivo(caminho, variantes, tolerancias, vocabulario))
+    else:
+        with ProcessPoolExecutor(max_workers=processos or min(len(arquivos), os.cpu_count() or 1)) as pool:
+            for parcial in pool.map(avaliar_arquivo, arquivos, [variantes] * len(arquivos),
+                                    [tolerancias] * len(arquivos), [vocabulario] * len(arquivos)):
+                juntar(total, parcial)
+    return {nome: resumir(total[nome]) for nome in variantes if nome in total}, time.perf_counter() - inicio
+
+def porcentagem(acerto):
+    return f"{'—':>8}" if acerto is None else f"{100 * acerto:>7.1f}%"
+
+def imprimir_tabela(resumos):
+    cabecalho = f"{'variante':<14}{'quadros':>9}{'card':>8}{'preço':>8}{'dist':>8}{'tempo':>8}{'quadros/s':>11}" \
+                + "".join(f"{f'p{p} µs':>9}" for p in PERCENTIS)
+    print(cabecalho)
+    print("-" * len(cabecalho))
+    for nome, r in sorted(resumos.items(), key=lambda item: -(item[1]["acerto_card"] or 0.0)):
+        print(f"{nome:<14}{r['quadros']:>9}" + "".join(porcentagem(r[f"acerto_{c}"]) for c in ("card",) + CAMPOS)
+              + f"{r['quadros_por_s']:>11.0f}" + "".join(f"{r[f'p{p}_us']:>9.1f}" for p in PERCENTIS))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr.avaliacao",
+                                     description="Compara as variantes do analyzeSmartData sobre um corpus rotulado.")
+    parser.add_argument("arquivos", nargs="+", help="Corpus JSONL(.gz), .ocrc ou logs; cada arquivo é uma tarefa do pool.")
+    parser.add_argument("--variantes", default=",".join(VARIANTES),
+                        help=f"Lista separada por vírgula (padrão: todas: {','.join(VARIANTES)}).")
+    parser.add_argument("--processos", type=int, help="Tamanho do pool (padrão: um por arquivo, até o nº de CPUs).")
+    parser.add_argument("--tol-dist", type=float, default=TOLERANCIAS["dist"], help="Tolerância da distância em km.")
+    parser.add_argument("--tol-tempo", type=float, default=TOLERANCIAS["time"], help="Tolerância do tempo em minutos.")
+    parser.add_argument("--vocabulario", help="JSON {\"regra\": [\"termo\", ...]} dos filtros (padrão: os do NOVA_LOGICA).")
+    parser.add_argument("--json", help="Grava os resumos em JSON.")
+    args = parser.parse_args()
+
+    variantes = [v.strip() for v in args.variantes.split(",") if v.strip()]
+    desconhecidas = [v for v in variantes if v not in VARIANTES]
+    if desconhecidas:
+        parser.error(f"variantes desconhecidas: {', '.join(desconhecidas)} (opções: {', '.join(VARIANTES)})")
+    tolerancias = dict(TOLERANCIAS, dist=args.tol_dist, time=args.tol_tempo)
+    try:
+        vocabulario = carregar_vocabulario(args.vocabulario) if args.vocabulario else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    resumos, segundos = avaliar(args.arquivos, variantes, args.processos, tolerancias, vocabulario)
+    imprimir_tabela(resumos)
+    print(f"{len(args.arquivos)} arquivo(s) em {segundos:.2f} s", file=sys.stderr)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"segundos": segundos, "variantes": resumos}, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import cProfile
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+from .sanitizacao import sanitizar_erros_ocr
+from .tokenizador import extrair_tokens, extrair_referencia
+from .variantes import VARIANTES
+from .filtros import FILTRO_NOVA_LOGICA
+from .reproducao import ler_corpus
+
+# ==============================================================================
+# BENCHMARK DO PIPELINE DE TEXTO DO OCR
+# ==============================================================================
+# Mede cada etapa do analyzeSmartData em separado (sanitizeOcrErrors, filtros
+# anti-espelho, tokens de preço/distância/tempo) e as variantes inteiras, sobre
+# quadros sintéticos de vários tamanhos (blocos por quadro) e, se dado, sobre
+# quadros gravados de um corpus. A saída JSON segue o formato do
+# pytest-benchmark, então dá para comparar com as ferramentas dele; o
+# --comparar daqui já falha (código 1) se alguma medida piorar além do limite,
+# para pegar a regressão do próximo patch antes de ele ir para o app.
+#
+# Ganchos: objetos com antes(etapa, grupo) e depois(etapa, grupo, ns), chamados
+# em volta de cada rodada de cada etapa. Vêm dois: o Cronometro (sempre ligado,
+# gera as estatísticas) e o GanchoPerfil (--perfil PASTA: um .prof do cProfile
+# por etapa, para abrir no snakeviz/pstats). Ganchos com intrusivo = True (o
+# cProfile pesa muito mais em código com muitas chamadas Python) só rodam em
+# rodadas extras, depois das medidas, para não distorcer o cronômetro.
+
+TAMANHOS_PADRAO = (5, 20, 80, 320)
+QUADROS_POR_RODADA = 20
+TEMPO_MINIMO = 0.2  # Segundos de rodadas por medida (com pelo menos MIN_RODADAS)
+MIN_RODADAS = 5
+
+# Textos típicos dos cards da Uber/99, do app e da tela (inclui os que os filtros derrubam)
+TEXTOS_SINTETICOS = (
+    "R$ 25,90", "R$ 7,45", "RS 132,00", "4 min (1,2 km) de distância", "Viagem: 18 min (9,8 km)",
+    "1 h 5 min (52 km)", "Chegada 12:30", "UberX", "Comfort", "Aceitar", "★ 4,92 (310)", "Verificado",
+    "Rua das Flores, 123 - Centro", "Av. Paulista, 1578", "Pagamento no app", "Dinheiro", "Prioridade",
+    "[12/03 18:40] LIDO: r$ 25.90", "Motorista Pro", "R$/km 2,10", "Ganhe R$ 50 extras", "Meta de ganhos",
+    "Configurações", "12", "25.90", "800 m", "3 minutos", "mais de 30 min", "", "Toque para ver",
+)
+
+class Cronometro:
+    """Guarda a duração de cada rodada por (grupo, etapa)."""
+    intrusivo = False
+
+    def __init__(self):
+        self.rodadas = {}
+
+    def antes(self, etapa, grupo):
+        pass
+
+    def depois(self, etapa, grupo, ns):
+        self.rodadas.setdefault((grupo, etapa), []).append(ns)
+
+class GanchoPerfil:
+    """Perfila cada etapa com cProfile e grava PASTA/<grupo>-<etapa>.prof no fim."""
+    intrusivo = True
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+        self.perfis = {}
+
+    def antes(self, etapa, grupo):
+        self.perfis.setdefault((grupo, etapa), cProfile.Profile()).enable()
+
+    def depois(self, etapa, grupo, ns):
+        self.perfis[(grupo, etapa)].disable()
+
+    def gravar(self):
+        os.makedirs(self.pasta, exist_ok=True)
+        for (grupo, etapa), perfil in self.perfis.items():
+            perfil.dump_stats(os.path.join(self.pasta, f"{grupo}-{etapa}.prof".replace(":", "_")))
+
+def quadros_sinteticos(tamanho, quantidade, semente=0):
+    """Quadros determinísticos com `tamanho` blocos cada (preço em fonte grande, resto pequeno)."""
+    sorteio = random.Random(f"{semente}-{tamanho}")
+    quadros = []
+    for _ in range(quantidade):
+        blocos = []
+        for _ in range(tamanho):
+            texto = sorteio.choice(TEXTOS_SINTETICOS)
+            h = sorteio.choice((90, 95)) if texto.startswith("R$ ") else sorteio.choice((30, 40, 45))
+            blocos.append({"text": texto, "h": h, "y": sorteio.randint(0, 2400)})
+        quadros.append({"blocos": blocos, "pacote": "com.ubercab.driver", "altura_tela": 2400})
+    return quadros
+
+def quadros_gravados(caminhos, quantidade):
+    quadros = []
+    for caminho in caminhos:
+        for registro in ler_corpus(caminho):
+            quadros.append(registro)
+            if len(quadros) >= quantidade:
+                return quadros
+    return quadros
+
+def etapas(variantes):
+    """{nome: (preparar(quadros) -> entrada, executar(entrada))}; preparar fica fora da medida."""
+    def textos(quadros):
+        return [str(b["text"]) for q in quadros for b in q["blocos"]]
+
+    def limpos(quadros):
+        return [sanitizar_erros_ocr(t) for t in textos(quadros)]
+
+    def rodar_variante(funcao):
+        def executar(quadros):
+            for q in quadros:
+                funcao(q["blocos"], q.get("pacote", ""), q.get("altura_tela", 2000))
+        return executar
+
+    mapa = {
+        "sanitizacao": (textos, lambda entrada: [sanitizar_erros_ocr(t) for t in entrada]),
+        "filtros": (limpos, lambda entrada: [FILTRO_NOVA_LOGICA.descarta(l) for l in entrada]),
+        "tokens": (limpos, lambda entrada: [extrair_tokens(l) for l in entrada]),
+        "tokens_regex": (limpos, lambda entrada: [extrair_referencia(l) for l in entrada]),
+    }
+    for nome in variantes:
+        mapa[f"variante:{nome}"] = (lambda quadros: quadros, rodar_variante(VARIANTES[nome]))
+    return mapa
+
+def rodada(etapa, grupo, executar, entrada, ganchos):
+    for g in ganchos:
+        g.antes(etapa, grupo)
+    inicio = time.perf_counter_ns()
+    executar(entrada)
+    ns = time.perf_counter_ns() - inicio
+    for g in reversed(ganchos):
+        g.depois(etapa, grupo, ns)
+    return ns
+
+def medir(grupo, quadros, mapa, ganchos, tempo_minimo=TEMPO_MINIMO, min_rodadas=MIN_RODADAS):
+    medidores = [g for g in ganchos if not getattr(g, "intrusivo", False)]
+    intrusivos = [g for g in ganchos if getattr(g, "intrusivo", False)]
+    for etapa, (preparar, executar) in mapa.items():
+        entrada = preparar(quadros)
+        executar(entrada)  # Aquece (cache de regex, caches internos)
+        gasto = rodadas = 0
+        while rodadas < min_rodadas or gasto < tempo_minimo * 1e9:
+            gasto += rodada(etapa, grupo, executar, entrada, medidores)
+            rodadas += 1
+        if intrusivos:
+            for _ in range(min_rodadas):
+                rodada(etapa, grupo, executar, entrada, intrusivos)
+
+def estatisticas(ns_rodadas, operacoes):
+    """Estatísticas no formato do pytest-benchmark (segundos por operação = um quadro)."""
+    dados = sorted(ns / 1e9 / operacoes for ns in ns_rodadas)
+    n = len(dados)
+    q1, mediana, q3 = statistics.quantiles(dados, n=4, method="inclusive") if n > 1 else (dados[0],) * 3
+    iqr = q3 - q1
+    media = statistics.fmean(dados)
+    desvio = statistics.stdev(dados) if n > 1 else 0.0
+    return {
+        "min": dados[0], "max": dados[-1], "mean": media, "stddev": desvio, "rounds": n,
+        "median": mediana, "iqr": iqr, "q1": q1, "q3": q3,
+        "iqr_outliers": sum(1 for d in dados if d < q1 - 1.5 * iqr or d > q3 + 1.5 * iqr),
+        "stddev_outliers": sum(1 for d in dados if abs(d - media) > desvio),
+        "outliers": "", "ld15iqr": next((d for d in dados if d >= q1 - 1.5 * iqr), dados[0]),
+        "hd15iqr": next((d for d in reversed(dados) if d <= q3 + 1.5 * iqr), dados[-1]),
+        "ops": 1 / media if media else 0.0, "total": sum(ns_rodadas) / 1e9, "iterations": operacoes,
+    }
+
+def info_commit():
+    try:
+        saida = subprocess.run(["git", "log", "-1", "--format=%H%n%cI%n%s"], capture_output=True, text=True, check=True)
+        sujo = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        ramo = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], capture_output=True, text=True)
+        ident, quando, assunto = (saida.stdout.split("\n") + ["", "", ""])[:3]
+        return {"id": ident, "time": quando, "author_time": quando, "dirty": bool(sujo.stdout.strip()),
+                "project": os.path.basename(os.getcwd()), "branch": ramo.stdout.strip(), "message": assunto}
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+
+def relatorio(cronometro, operacoes_por_grupo):
+    benchmarks = []
+    for (grupo, etapa), ns_rodadas in cronometro.rodadas.items():
+        benchmarks.append({
+            "group": grupo, "name": f"{etapa}[{grupo}]", "fullname": f"analisador_ocr.benchmark::{etapa}[{grupo}]",
+            "params": {"etapa": etapa, "grupo": grupo}, "param": grupo, "extra_info": {},
+            "options": {"timer": "perf_counter_ns", "min_rounds": MIN_RODADAS, "min_time": TEMPO_MINIMO, "warmup": True},
+            "stats": estatisticas(ns_rodadas, operacoes_por_grupo[grupo]),
+        })
+    return {
+        "machine_info": {"node": platform.node(), "processor": platform.processor(), "machine": platform.machine(),
+                         "python_implementation": platform.python_implementation(),
+                         "python_version": platform.python_version(), "system": platform.system(),
+                         "release": platform.release(), "cpu": {"count": os.cpu_count()}},
+        "commit_info": info_commit(),
+        "benchmarks": benchmarks,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "version": "analisador_ocr",
+    }
+
+def comparar(atual, base, limite):
+    """[(nome, media_base, media_atual, variacao)] das medidas que pioraram mais que `limite` (0.10 = 10%)."""
+    medias_base = {b["fullname"]: b["stats"]["mean"] for b in base["benchmarks"]}
+    piores = []
+    for b in atual["benchmarks"]:
+        anterior = medias_base.get(b["fullname"])
+        if anterior:
+            variacao = b["stats"]["mean"] / anterior - 1
+            if variacao > limite:
+                piores.append((b["name"], anterior, b["stats"]["mean"], variacao))
+    return piores
+
+def imprimir_tabela(dados):
+    print(f"{'medida':<36}{'média µs/quadro':>17}{'mediana':>11}{'desvio':>10}{'rodadas':>9}{'quadros/s':>12}")
+    print("-" * 95)
+    for b in sorted(dados["benchmarks"], key=lambda b: (b["group"], b["name"])):
+        s = b["stats"]
+        print(f"{b['name']:<36}{s['mean'] * 1e6:>17.1f}{s['median'] * 1e6:>11.1f}{s['stddev'] * 1e6:>10.1f}"
+              f"{s['rounds']:>9}{s['ops']:>12.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr.benchmark",
+                                     description="Benchmark por etapa do pipeline de texto do OCR.")
+    parser.add_argument("--tamanhos", default=",".join(map(str, TAMANHOS_PADRAO)),
+                        help="Blocos por quadro dos grupos sintéticos (lista separada por vírgula).")
+    parser.add_argument("--corpus", nargs="*", default=[], help="Corpus (JSONL, .ocrc, logs) para o grupo 'gravado'.")
+    parser.add_argument("--quadros", type=int, default=QUADROS_POR_RODADA, help="Quadros por rodada.")
+    parser.add_argument("--variantes", default="nova_logica,novo_analyze", help="Variantes medidas inteiras.")
+    parser.add_argument("--tempo-minimo", type=float, default=TEMPO_MINIMO, help="Segundos mínimos por medida.")
+    parser.add_argument("--json", help="Grava o resultado no formato do pytest-benchmark.")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior; sai com erro se algo piorar além do --limite.")
+    parser.add_argument("--limite", type=float, default=10.0, help="Piora máxima aceita em %% (padrão: 10).")
+    parser.add_argument("--perfil", help="Pasta para os .prof do cProfile de cada etapa.")
+    args = parser.parse_args()
+
+    variantes = [v for v in args.variantes.split(",") if v]
+    desconhecidas = [v for v in variantes if v not in VARIANTES]
+    if desconhecidas:
+        parser.error(f"variantes desconhecidas: {', '.join(desconhecidas)}")
+    grupos = {f"sintetico-{n}": quadros_sinteticos(int(n), args.quadros) for n in args.tamanhos.split(",") if n}
+    if args.corpus:
+        grupos["gravado"] = quadros_gravados(args.corpus, args.quadros)
+        if not grupos["gravado"]:
+            parser.error("o corpus não tem quadros")
+
+    cronometro = Cronometro()
+    ganchos = [cronometro]
+    perfil = GanchoPerfil(args.perfil) if args.perfil else None
+    if perfil:
+        ganchos.append(perfil)
+    mapa = etapas(variantes)
+    for grupo, quadros in grupos.items():
+        print(f"medindo {grupo} ({len(quadros)} quadros)...", file=sys.stderr)
+        medir(grupo, quadros, mapa, ganchos, args.tempo_minimo)
+
+    dados = relatorio(cronometro, {g: len(q) for g, q in grupos.items()})
+    imprimir_tabela(dados)
+    if perfil:
+        perfil.gravar()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=2, ensure_ascii=False)
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            piores = comparar(dados, json.load(f), args.limite / 100)
+        for nome, antes, depois, variacao in piores:
+            print(f"REGRESSÃO {nome}: {antes * 1e6:.1f} -> {depois * 1e6:.1f} µs/quadro (+{100 * variacao:.0f}%)")
+        sys.exit(1 if piores else 0)
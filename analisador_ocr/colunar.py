@@ -0,0 +1,293 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import shutil
+import argparse
+import tempfile
+from array import array
+
+from .variantes import inteiro_json
+
+# ==============================================================================
+# CORPUS COLUNAR (.ocrc)
+# ==============================================================================
+# Os quadros chegam como JSON ({"text", "h", "y"} por bloco). Guardar corpus
+# grandes assim é pesado e reler custa um json.loads por linha. O .ocrc guarda
+# o mesmo conteúdo em colunas binárias, abertas com mmap: abrir é instantâneo e
+# um quadro qualquer é lido sem desserializar o resto.
+#
+#   cabeçalho   "OCRC", versão, e (deslocamento, quantidade) de cada coluna
+#   quadro_*    início do quadro em bloco_* (n+1 posições), pacote, altura_tela
+#               e os campos extras (rótulo, origem...) como JSON
+#   bloco_*     id do texto, h, y
+#   texto_*     tabela de textos únicos: início de cada um (n+1) e os bytes UTF-8
+#
+# Textos (dos blocos, pacotes e extras) são internados: a mesma tela repetida
+# mil vezes guarda cada texto uma vez. O id 0 é sempre "". Colunas alinhadas em
+# 8 bytes, inteiros little-endian; h e y precisam caber em int32.
+#
+# A gravação é em fluxo: as colunas de blocos vão para arquivos temporários e
+# o .ocrc final é montado no fim (grava num .tmp e renomeia).
+
+MAGICA = b"OCRC"
+VERSAO = 1
+COLUNAS = (
+    ("quadro_inicio", "Q"),
+    ("quadro_pacote", "I"),
+    ("quadro_altura", "i"),
+    ("quadro_extra", "I"),
+    ("bloco_texto", "I"),
+    ("bloco_h", "i"),
+    ("bloco_y", "i"),
+    ("texto_inicio", "Q"),
+    ("texto_dados", "B"),
+)
+CABECALHO = struct.Struct("<4sI" + "QQ" * len(COLUNAS))
+CAMPOS_FIXOS = ("blocos", "pacote", "altura_tela")
+EXTENSAO = ".ocrc"
+
+class ErroColunar(Exception):
+    pass
+
+def alinhar(posicao):
+    return (posicao + 7) & ~7
+
+class Internador:
+    """Dá um id a cada texto distinto e acumula os bytes num arquivo temporário."""
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.ids = {"": 0}
+        self.inicios = array('Q', [0, 0])  # O texto k vai de inicios[k] a inicios[k + 1]
+
+    def id(self, texto):
+        existente = self.ids.get(texto)
+        if existente is not None:
+            return existente
+        dados = texto.encode('utf-8', errors='surrogatepass')
+        self.arquivo.write(dados)
+        self.inicios.append(self.inicios[-1] + len(dados))
+        novo = self.ids[texto] = len(self.ids)
+        return novo
+
+class GravadorColunar:
+    """Grava registros de quadro ({"blocos", "pacote", "altura_tela", ...}) num .ocrc."""
+
+    def __init__(self, caminho):
+        if sys.byteorder != "little":
+            raise ErroColunar("o formato .ocrc é little-endian")
+        self.caminho = caminho
+        self.pasta_tmp = tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(caminho)) or ".")
+        self.colunas = {nome: open(os.path.join(self.pasta_tmp.name, nome), 'wb')
+                        for nome, _ in COLUNAS if nome != "quadro_inicio" and nome != "texto_inicio"}
+        self.textos = Internador(self.colunas["texto_dados"])
+        self.quadro_inicio = array('Q', [0])
+        self.n_blocos = 0
+        self.resumo = None
+
+    def adicionar(self, registro):
+        textos, hs, ys = array('I'), array('i'), array('i')
+        for bloco in registro["blocos"]:
+            textos.append(self.textos.id(str(bloco["text"])))
+            hs.append(inteiro_json(bloco["h"]))
+            ys.append(inteiro_json(bloco["y"]))
+        extras = {k: v for k, v in registro.items() if k not in CAMPOS_FIXOS}
+        textos.tofile(self.colunas["bloco_texto"])
+        hs.tofile(self.colunas["bloco_h"])
+        ys.tofile(self.colunas["bloco_y"])
+        array('I', [self.textos.id(registro.get("pacote", ""))]).tofile(self.colunas["quadro_pacote"])
+        array('i', [int(registro.get("altura_tela", 2000))]).tofile(self.colunas["quadro_altura"])
+        extra = json.dumps(extras, ensure_ascii=False, separators=(",", ":")) if extras else ""
+        array('I', [self.textos.id(extra)]).tofile(self.colunas["quadro_extra"])
+        self.n_blocos += len(textos)
+        self.quadro_inicio.append(self.n_blocos)
+
+    def fechar(self):
+        """Monta o .ocrc final a partir das colunas temporárias."""
+        for f in self.colunas.values():
+            f.close()
+        n_quadros = len(self.quadro_inicio) - 1
+        # Colunas que ficaram em memória; as demais são copiadas dos temporários
+        itens = {"quadro_inicio": self.quadro_inicio, "texto_inicio": self.textos.inicios}
+        quantidades = {
+            "quadro_inicio": n_quadros + 1, "quadro_pacote": n_quadros, "quadro_altura": n_quadros,
+            "quadro_extra": n_quadros, "bloco_texto": self.n_blocos, "bloco_h": self.n_blocos,
+            "bloco_y": self.n_blocos, "texto_inicio": len(self.textos.inicios),
+            "texto_dados": self.textos.inicios[-1],
+        }
+
+        tmp = self.caminho + ".tmp"
+        posicoes = []
+        with open(tmp, 'wb') as saida:
+            saida.write(b"\0" * CABECALHO.size)
+            for nome, codigo in COLUNAS:
+                saida.write(b"\0" * (alinhar(saida.tell()) - saida.tell()))
+                posicoes.append((saida.tell(), quantidades[nome]))
+                if nome in itens:
+                    itens[nome].tofile(saida)
+                else:
+                    with open(os.path.join(self.pasta_tmp.name, nome), 'rb') as coluna:
+                        shutil.copyfileobj(coluna, saida, 1 << 20)
+                if saida.tell() != posicoes[-1][0] + quantidades[nome] * array(codigo).itemsize:
+                    raise ErroColunar(f"coluna {nome} com tamanho inesperado")
+            saida.seek(0)
+            saida.write(CABECALHO.pack(MAGICA, VERSAO, *[v for par in posicoes for v in par]))
+        os.replace(tmp, self.caminho)
+        self.pasta_tmp.cleanup()
+        self.resumo = (n_quadros, self.n_blocos, len(self.textos.ids))
+        return self.resumo
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, tb):
+        if tipo is None:
+            self.fechar()
+        else:
+            for f in self.colunas.values():
+                f.close()
+            self.pasta_tmp.cleanup()
+
+def gravar_colunar(registros, caminho):
+    """Grava um iterável de registros; retorna (quadros, blocos, textos distintos)."""
+    with GravadorColunar(caminho) as gravador:
+        for registro in registros:
+            gravador.adicionar(registro)
+    return gravador.resumo
+
+class CorpusColunar:
+    """Leitura de um .ocrc via mmap: len(), corpus[i], corpus[a:b] e iteração."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.arquivo = open(caminho, 'rb')
+        tamanho = os.fstat(self.arquivo.fileno()).st_size
+        if tamanho < CABECALHO.size:
+            self.arquivo.close()
+            raise ErroColunar(f"{caminho}: arquivo curto demais para um .ocrc")
+        self.mapa = mmap.mmap(self.arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        campos = CABECALHO.unpack_from(self.mapa, 0)
+        if campos[0] != MAGICA or campos[1] != VERSAO:
+            self.fechar()
+            raise ErroColunar(f"{caminho}: não é um .ocrc versão {VERSAO}")
+        self.visao = visao = memoryview(self.mapa)
+        self.colunas = {}
+        for i, (nome, codigo) in enumerate(COLUNAS):
+            inicio, quantidade = campos[2 + 2 * i], campos[3 + 2 * i]
+            fim = inicio + quantidade * array(codigo).itemsize
+            if fim > tamanho:
+                self.fechar()
+                raise ErroColunar(f"{caminho}: coluna {nome} passa do fim do arquivo (truncado?)")
+            self.colunas[nome] = visao[inicio:fim].cast(codigo)
+        self.cache_textos = {}
+
+    def __len__(self):
+        return len(self.colunas["quadro_pacote"])
+
+    @property
+    def n_blocos(self):
+        return len(self.colunas["bloco_texto"])
+
+    @property
+    def n_textos(self):
+        return len(self.colunas["texto_inicio"]) - 1
+
+    def texto(self, ident):
+        texto = self.cache_textos.get(ident)
+        if texto is None:
+            inicios = self.colunas["texto_inicio"]
+            texto = bytes(self.colunas["texto_dados"][inicios[ident]:inicios[ident + 1]]).decode('utf-8', 'surrogatepass')
+            self.cache_textos[ident] = texto
+        return texto
+
+    def quadro(self, i):
+        c = self.colunas
+        inicio, fim = c["quadro_inicio"][i], c["quadro_inicio"][i + 1]
+        texto = self.texto
+        blocos = [{"text": texto(t), "h": h, "y": y}
+                  for t, h, y in zip(c["bloco_texto"][inicio:fim], c["bloco_h"][inicio:fim], c["bloco_y"][inicio:fim])]
+        registro = {"blocos": blocos, "pacote": texto(c["quadro_pacote"][i]), "altura_tela": c["quadro_altura"][i]}
+        extra = c["quadro_extra"][i]
+        if extra:
+            registro.update(json.loads(texto(extra)))
+        return registro
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.quadro(i) for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        return self.quadro(indice)
+
+    def __iter__(self):
+        return self.quadros()
+
+    def quadros(self, inicio=0, fim=None):
+        for i in range(inicio, len(self) if fim is None else min(fim, len(self))):
+            yield self.quadro(i)
+
+    def fechar(self):
+        for coluna in getattr(self, "colunas", {}).values():
+            coluna.release()
+        self.colunas = {}
+        if getattr(self, "visao", None) is not None:
+            self.visao.release()
+            self.visao = None
+        if getattr(self, "mapa", None) is not None:
+            self.mapa.close()
+            self.mapa = None
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+def ler_colunar(caminho, inicio=0, fim=None):
+    """Gera os registros de um .ocrc (fecha o arquivo no fim)."""
+    with CorpusColunar(caminho) as corpus:
+        yield from corpus.quadros(inicio, fim)
+
+if __name__ == "__main__":
+    from .reproducao import ler_corpus, abrir_texto
+
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr.colunar",
+                                     description="Converte corpus de quadros (JSONL/logs) para o formato colunar .ocrc e vice-versa.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_conv = sub.add_parser("converter", help="JSONL(.gz), logs do saveLog ou .ocrc -> .ocrc")
+    p_conv.add_argument("entradas", nargs="+")
+    p_conv.add_argument("--saida", required=True, help="Arquivo .ocrc gerado.")
+    p_info = sub.add_parser("info", help="Tamanhos de um .ocrc.")
+    p_info.add_argument("corpus")
+    p_exp = sub.add_parser("exportar", help=".ocrc -> JSONL (opcionalmente só uma faixa de quadros).")
+    p_exp.add_argument("corpus")
+    p_exp.add_argument("--de", type=int, default=0)
+    p_exp.add_argument("--ate", type=int, help="Índice final (exclusivo).")
+    p_exp.add_argument("--saida", default="-")
+    args = parser.parse_args()
+
+    try:
+        if args.comando == "converter":
+            with GravadorColunar(args.saida) as gravador:
+                for entrada in args.entradas:
+                    for registro in ler_corpus(entrada):
+                        gravador.adicionar(registro)
+            with CorpusColunar(args.saida) as corpus:
+                tamanho = os.path.getsize(args.saida)
+                print(f"{args.saida}: {len(corpus)} quadros, {corpus.n_blocos} blocos, "
+                      f"{corpus.n_textos} textos distintos, {tamanho / 1024 / 1024:.1f} MB")
+        elif args.comando == "info":
+            with CorpusColunar(args.corpus) as corpus:
+                print(f"quadros: {len(corpus)} | blocos: {corpus.n_blocos} | textos distintos: {corpus.n_textos} | "
+                      f"{os.path.getsize(args.corpus) / 1024 / 1024:.1f} MB")
+        else:
+            with abrir_texto(args.saida, 'w') as saida:
+                for registro in ler_colunar(args.corpus, args.de, args.ate):
+                    saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except (ErroColunar, OSError) as e:
+        parser.exit(1, f"Erro: {e}\n")
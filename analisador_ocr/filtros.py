@@ -0,0 +1,161 @@
+import re
+import json
+import argparse
+from collections import Counter
+
+# ==============================================================================
+# FILTROS ANTI-ESPELHO E DE RUÍDO
+# ==============================================================================
+# O NOVA_LOGICA descarta o bloco que contém qualquer termo de uma lista
+# (lido:, candidato, motorista pro, r$/km...), com um contains por termo. Aqui
+# o vocabulário vira um autômato só: uma trie de todos os termos compilada
+# numa regex (o motor de regex em C percorre a trie a partir de cada posição,
+# pulando as que não começam nenhum termo), então o custo por bloco não cresce
+# com a quantidade de termos como a corrente de contains.
+#
+# Cada termo pertence a uma regra com nome; as regras têm a prioridade da
+# ordem em que são declaradas (a ordem dos ifs do Kotlin), e verificar()
+# devolve a de maior prioridade entre os termos achados. A regra "espelho"
+# (texto que começa com "[" e tem "]", as linhas do próprio log) é estrutural,
+# não um termo, e vem sempre primeiro quando ligada.
+#
+# Vocabulário em JSON: {"regra": ["termo", ...], ...} (ordem do arquivo = prioridade).
+# O AnalisadorOcr, a LeituraIncremental e os CLIs (python -m analisador_ocr,
+# .incremental, .reproducao, .avaliacao) recebem esse arquivo em --vocabulario.
+
+REGRA_ESPELHO = "espelho"
+
+# Mesma ordem dos contains do NOVA_LOGICA (fix_ocr_logic.py)
+VOCABULARIO_NOVA_LOGICA = {
+    "log_lido": ["lido:"],
+    "log_limpo": ["limpo:"],
+    "log_conclusao": ["conclusão:"],
+    "log_candidato": ["candidato"],
+    "log_detectada": ["detectada:"],
+    "app_proprio": ["motorista pro", "configurações"],
+    "promocao": ["ganhe r$", "meta de ganhos"],
+    "indicador": ["r$/km", "r$/h"],
+}
+
+FIM = ""  # Marca de fim de termo nos nós da trie
+
+def montar_trie(termos):
+    raiz = {}
+    for termo in termos:
+        no = raiz
+        for c in termo:
+            no = no.setdefault(c, {})
+        no[FIM] = termo
+    return raiz
+
+def padrao_trie(no):
+    """Regex da trie: prefixos comuns fatorados, termo mais longo primeiro."""
+    filhos = [re.escape(c) + padrao_trie(sub) for c, sub in sorted(no.items()) if c != FIM]
+    if not filhos:
+        return ""
+    corpo = filhos[0] if len(filhos) == 1 else "(?:" + "|".join(filhos) + ")"
+    return f"(?:{corpo})?" if FIM in no else corpo
+
+class FiltroBlocos:
+    """Filtros do NOVA_LOGICA compilados; contar=True guarda quantos blocos cada regra derrubou."""
+
+    def __init__(self, vocabulario=None, espelho=True, contar=False):
+        vocabulario = VOCABULARIO_NOVA_LOGICA if vocabulario is None else vocabulario
+        self.espelho = espelho
+        self.contar = contar
+        self.regras = ([REGRA_ESPELHO] if espelho else []) + list(vocabulario)
+        self.prioridade = {}  # termo -> (posição da regra, nome da regra)
+        for regra, termos in vocabulario.items():
+            for termo in termos:
+                termo = termo.lower()
+                if termo and termo not in self.prioridade:
+                    self.prioridade[termo] = (self.regras.index(regra), regra)
+        self.trie = montar_trie(self.prioridade)
+        padrao = padrao_trie(self.trie)
+        # Sem termos, nada casa (a regex vazia casaria com tudo)
+        self.regex = re.compile(padrao) if padrao else None
+        self.inicios = re.compile(f"(?=(?:{padrao}))") if padrao else None
+        self.contagem = Counter()
+
+    def regra_dos_termos(self, texto):
+        """A regra de maior prioridade entre todos os termos presentes (inclusive sobrepostos)."""
+        melhor = None
+        for m in self.inicios.finditer(texto):
+            no = self.trie
+            for c in texto[m.start():]:
+                no = no.get(c)
+                if no is None:
+                    break
+                if FIM in no:
+                    achada = self.prioridade[no[FIM]]
+                    if melhor is None or achada < melhor:
+                        melhor = achada
+            if melhor is not None and melhor[0] == (1 if self.espelho else 0):
+                break  # Já é a primeira regra de termos, não tem como melhorar
+        return melhor[1]
+
+    def verificar(self, limpo):
+        """Nome da regra que descarta o bloco (texto já sanitizado), ou None."""
+        if self.espelho and limpo.startswith("[") and "]" in limpo:
+            regra = REGRA_ESPELHO
+        elif self.regex is not None and self.regex.search(limpo):
+            regra = self.regra_dos_termos(limpo)
+        else:
+            regra = None
+        if self.contar:
+            self.contagem["verificados"] += 1
+            if regra:
+                self.contagem["descartados"] += 1
+                self.contagem[regra] += 1
+        return regra
+
+    def descarta(self, limpo):
+        """Só o sim/não, sem descobrir qual regra (o caminho rápido do parser)."""
+        if self.espelho and limpo.startswith("[") and "]" in limpo:
+            return True
+        return self.regex is not None and self.regex.search(limpo) is not None
+
+    def estatisticas(self):
+        """{"verificados", "descartados", "por_regra": {regra: n}} em ordem de prioridade."""
+        return {"verificados": self.contagem["verificados"], "descartados": self.contagem["descartados"],
+                "por_regra": {regra: self.contagem[regra] for regra in self.regras}}
+
+def carregar_vocabulario(caminho):
+    with open(caminho, 'r', encoding='utf-8') as f:
+        vocabulario = json.load(f)
+    if not isinstance(vocabulario, dict) or not all(isinstance(t, list) for t in vocabulario.values()):
+        raise ValueError(f"{caminho}: esperado {{\"regra\": [\"termo\", ...]}}")
+    return vocabulario
+
+def carregar_filtro(caminho):
+    """FiltroBlocos do vocabulário em JSON (o --vocabulario dos CLIs); None sem arquivo."""
+    return FiltroBlocos(carregar_vocabulario(caminho)) if caminho else None
+
+FILTRO_NOVA_LOGICA = FiltroBlocos()
+
+if __name__ == "__main__":
+    from .sanitizacao import sanitizar_erros_ocr
+    from .reproducao import ler_corpus
+
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr.filtros",
+                                     description="Mostra quais filtros anti-espelho/ruído derrubam mais blocos de um corpus.")
+    parser.add_argument("corpus", nargs="+", help="Corpus JSONL(.gz), .ocrc ou logs.")
+    parser.add_argument("--vocabulario", help="JSON {\"regra\": [\"termo\", ...]} (padrão: os filtros do NOVA_LOGICA).")
+    parser.add_argument("--sem-espelho", action="store_true", help="Desliga a regra de texto entre colchetes.")
+    args = parser.parse_args()
+
+    try:
+        vocabulario = carregar_vocabulario(args.vocabulario) if args.vocabulario else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    filtro = FiltroBlocos(vocabulario, espelho=not args.sem_espelho, contar=True)
+    for caminho in args.corpus:
+        for registro in ler_corpus(caminho):
+            for bloco in registro["blocos"]:
+                filtro.verificar(sanitizar_erros_ocr(str(bloco["text"])))
+
+    e = filtro.estatisticas()
+    total = e["verificados"] or 1
+    print(f"{e['verificados']} blocos | descartados: {e['descartados']} ({100 * e['descartados'] / total:.1f}%)")
+    for regra, n in sorted(e["por_regra"].items(), key=lambda item: -item[1]):
+        print(f"  {regra:<16}{n:>10}  {100 * n / total:5.1f}%")
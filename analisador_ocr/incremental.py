@@ -0,0 +1,112 @@
+import sys
+import json
+import argparse
+from dataclasses import asdict
+
+from .variantes import ESTADOS, VARIANTES_COM_FILTRO
+
+# ==============================================================================
+# LEITURA INCREMENTAL
+# ==============================================================================
+# O analyzeSmartData só roda com o quadro inteiro montado. Aqui os blocos entram
+# um a um, na ordem do WindowMonitorService, e o estado da variante (preço de
+# maior fonte, busca/viagem de distância e tempo) é atualizado na hora. Assim
+# que houver preço e distância ou tempo sai uma RideData provisória, e ela
+# volta a sair sempre que mudar (um preço de fonte maior, a distância da
+# viagem...). No fim do quadro, concluir() dá exatamente o que a variante em
+# lote daria com os mesmos blocos.
+#
+# Fluxo (python -m analisador_ocr.incremental), um JSON por linha:
+#   {"quadro": {"pacote": "...", "altura_tela": 2400}}   começa um quadro
+#   {"text": "...", "h": 90, "y": 800}                   um bloco
+#   {"fim": true}                                         fecha o quadro (opcional)
+# Saída: {"quadro": n, "blocos": k, "provisoria": {...}} a cada mudança e
+# {"quadro": n, "blocos": k, "final": {...} ou null} ao fechar.
+
+class LeituraIncremental:
+
+    def __init__(self, variante="nova_logica", pacote="", altura_tela=2000, registrar=None, filtro=None):
+        if variante not in ESTADOS:
+            raise ValueError(f"variante sem leitura incremental: {variante} (opções: {', '.join(ESTADOS)})")
+        if filtro is None:
+            self.estado = ESTADOS[variante](pacote, altura_tela, registrar)
+        elif variante in VARIANTES_COM_FILTRO:
+            self.estado = ESTADOS[variante](pacote, altura_tela, registrar, filtro)
+        else:
+            raise ValueError(f"variante sem filtros configuráveis: {variante} (opções: {', '.join(VARIANTES_COM_FILTRO)})")
+        self.provisoria = None
+        self.blocos = 0
+
+    @property
+    def app(self):
+        return self.estado.app
+
+    def adicionar(self, bloco):
+        """Processa um bloco; retorna a nova RideData provisória se ela mudou, senão None."""
+        if isinstance(bloco, str):
+            bloco = json.loads(bloco)
+        self.estado.adicionar(bloco)
+        self.blocos += 1
+        atual = self.estado.parcial()
+        if atual is not None and atual != self.provisoria:
+            self.provisoria = atual
+            return atual
+        return None
+
+    def concluir(self):
+        """(RideData ou None, app) do quadro completo, igual à variante em lote."""
+        return self.estado.concluir()
+
+def ler_fluxo(eventos, variante="nova_logica", filtro=None):
+    """Gera as saídas (dicts) de um fluxo de eventos já decodificados."""
+    leitura = None
+    numero = 0
+
+    def fechar():
+        ride, _ = leitura.concluir()
+        return {"quadro": numero, "blocos": leitura.blocos, "final": asdict(ride) if ride else None}
+
+    for evento in eventos:
+        if "quadro" in evento:
+            if leitura is not None:
+                yield fechar()
+            numero += 1
+            config = evento["quadro"] or {}
+            leitura = LeituraIncremental(variante, config.get("pacote", ""), config.get("altura_tela", 2000),
+                                         filtro=filtro)
+        elif evento.get("fim"):
+            if leitura is not None:
+                yield fechar()
+                leitura = None
+        else:
+            if leitura is None:  # Bloco sem cabeçalho: quadro com os padrões
+                numero += 1
+                leitura = LeituraIncremental(variante, filtro=filtro)
+            provisoria = leitura.adicionar(evento)
+            if provisoria is not None:
+                yield {"quadro": numero, "blocos": leitura.blocos, "provisoria": asdict(provisoria)}
+    if leitura is not None:
+        yield fechar()
+
+if __name__ == "__main__":
+    from .filtros import carregar_filtro
+
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr.incremental",
+                                     description="Lê um fluxo de blocos de OCR e emite leituras provisórias e finais.")
+    parser.add_argument("fluxo", nargs="?", default="-", help="Arquivo JSONL de eventos ('-' = stdin, padrão).")
+    parser.add_argument("--variante", choices=sorted(ESTADOS), default="nova_logica")
+    parser.add_argument("--vocabulario", help="JSON {\"regra\": [\"termo\", ...]} dos filtros (padrão: os do NOVA_LOGICA).")
+    args = parser.parse_args()
+
+    if args.vocabulario and args.variante not in VARIANTES_COM_FILTRO:
+        parser.error(f"--vocabulario só vale para: {', '.join(VARIANTES_COM_FILTRO)}")
+    try:
+        filtro = carregar_filtro(args.vocabulario)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    entrada = sys.stdin if args.fluxo == "-" else open(args.fluxo, 'r', encoding='utf-8')
+    with entrada:
+        eventos = (json.loads(linha) for linha in entrada if linha.strip())
+        for saida in ler_fluxo(eventos, args.variante, filtro):
+            print(json.dumps(saida, ensure_ascii=False), flush=True)
@@ -0,0 +1,186 @@
+import sys
+import json
+import time
+import argparse
+import itertools
+
+try:
+    import numpy as np
+except ImportError:  # Opcional: só o escore em lote precisa dele
+    np = None
+
+from .modelo import Limites, OTIMA, ANALISAR, RECUSAR
+
+# ==============================================================================
+# ESCORE EM LOTE (NUMPY)
+# ==============================================================================
+# A classificação do card (ÓTIMA / ANALISAR / RECUSAR) para milhões de corridas
+# do histórico e muitas combinações de limites de uma vez, para calibrar os
+# goodKm/badKm/goodHour/badHour de um motorista sem laço Python por corrida.
+#
+# Mesmas contas do modelo.valores_por_unidade (safeDist 0.1, safeTime 1.0, e
+# (preço / tempo) * 60 nessa ordem), então cada status bate com o classificar().
+# classificar_lote devolve o status de cada corrida e processa os limites em
+# fatias para a matriz limites x corridas não passar de ELEMENTOS_POR_FATIA;
+# contar_lote (o que a calibragem usa) só conta, sem montar essa matriz.
+
+# Códigos dos status nas matrizes (int8); STATUS[codigo] devolve o nome
+STATUS = (ANALISAR, OTIMA, RECUSAR)
+COD_ANALISAR, COD_OTIMA, COD_RECUSAR = range(3)
+ELEMENTOS_POR_FATIA = 1 << 24
+
+def exigir_numpy():
+    if np is None:
+        raise RuntimeError("o escore em lote requer o pacote 'numpy' (pip install numpy)")
+
+def valores_em_lote(precos, dists, tempos):
+    """Arrays (R$/km, R$/hora) com as proteções do app: 0 km vira 0.1 e 0 min vira 1."""
+    exigir_numpy()
+    precos = np.asarray(precos, dtype=np.float64)
+    dists = np.asarray(dists, dtype=np.float64)
+    tempos = np.asarray(tempos, dtype=np.float64)
+    safe_dist = np.where(dists == 0.0, 0.1, dists)
+    safe_time = np.where(tempos == 0.0, 1.0, tempos)
+    return precos / safe_dist, (precos / safe_time) * 60.0
+
+def colunas_limites(limites):
+    """Uma lista de Limites vira 4 colunas (C, 1), prontas para broadcast com as corridas."""
+    tabela = np.array([(l.good_km, l.bad_km, l.good_hour, l.bad_hour) for l in limites], dtype=np.float64)
+    return [tabela[:, i:i + 1] for i in range(4)]
+
+def fatias_limites(limites, n_corridas):
+    passo = max(1, ELEMENTOS_POR_FATIA // max(1, n_corridas))
+    for inicio in range(0, len(limites), passo):
+        yield inicio, limites[inicio:inicio + passo]
+
+def classificar_fatia(valor_km, valor_hora, limites):
+    good_km, bad_km, good_hour, bad_hour = colunas_limites(limites)
+    otima = (valor_km >= good_km) & (valor_hora >= good_hour)
+    recusar = (valor_km <= bad_km) & (valor_hora <= bad_hour) & ~otima
+    codigos = np.full(otima.shape, COD_ANALISAR, dtype=np.int8)
+    codigos[otima] = COD_OTIMA
+    codigos[recusar] = COD_RECUSAR
+    return codigos
+
+def classificar_lote(valor_km, valor_hora, limites):
+    """Matriz int8 (len(limites) x corridas) com os códigos de STATUS."""
+    exigir_numpy()
+    limites = [limites] if isinstance(limites, Limites) else list(limites)
+    valor_km = np.asarray(valor_km, dtype=np.float64)
+    valor_hora = np.asarray(valor_hora, dtype=np.float64)
+    saida = np.empty((len(limites), valor_km.size), dtype=np.int8)
+    for inicio, fatia in fatias_limites(limites, valor_km.size):
+        saida[inicio:inicio + len(fatia)] = classificar_fatia(valor_km, valor_hora, fatia)
+    return saida
+
+def contagem_acumulada(ix, iy, nx, ny):
+    """C[j, k] = quantas corridas têm ix <= j e iy <= k (histograma 2D acumulado)."""
+    hist = np.bincount(ix * ny + iy, minlength=nx * ny).reshape(nx, ny)
+    return hist.cumsum(axis=0).cumsum(axis=1)
+
+def contar_lote(valor_km, valor_hora, limites):
+    """Matriz (len(limites) x 3) com quantas corridas caem em cada STATUS.
+
+    Não monta a matriz limites x corridas: cada corrida é posicionada uma vez
+    entre os valores de limite distintos (searchsorted) e as contagens saem de
+    histogramas 2D acumulados, então o custo é O(corridas * log(limites) + limites).
+    """
+    exigir_numpy()
+    limites = [limites] if isinstance(limites, Limites) else list(limites)
+    valor_km = np.asarray(valor_km, dtype=np.float64)
+    valor_hora = np.asarray(valor_hora, dtype=np.float64)
+    contagem = np.zeros((len(limites), len(STATUS)), dtype=np.int64)
+    if not limites:
+        return contagem
+    # NaN não passa em nenhuma comparação: fica em ANALISAR, como no classificar()
+    validos = ~(np.isnan(valor_km) | np.isnan(valor_hora))
+    vk, vh = valor_km[validos], valor_hora[validos]
+    good_km, bad_km, good_hour, bad_hour = (c.ravel() for c in colunas_limites(limites))
+    eixo_km = np.unique(np.concatenate((good_km, bad_km)))
+    eixo_hora = np.unique(np.concatenate((good_hour, bad_hour)))
+    nk, nh = eixo_km.size + 1, eixo_hora.size + 1
+
+    # le: v <= eixo[j] <=> le <= j;  lt: v < eixo[j] <=> lt <= j
+    le_km, lt_km = np.searchsorted(eixo_km, vk, "left"), np.searchsorted(eixo_km, vk, "right")
+    le_hora, lt_hora = np.searchsorted(eixo_hora, vh, "left"), np.searchsorted(eixo_hora, vh, "right")
+    c_lele = contagem_acumulada(le_km, le_hora, nk, nh)
+    c_ltlt = contagem_acumulada(lt_km, lt_hora, nk, nh)
+    c_ltle = contagem_acumulada(lt_km, le_hora, nk, nh)
+    c_lelt = contagem_acumulada(le_km, lt_hora, nk, nh)
+
+    gk, bk = np.searchsorted(eixo_km, good_km), np.searchsorted(eixo_km, bad_km)
+    gh, bh = np.searchsorted(eixo_hora, good_hour), np.searchsorted(eixo_hora, bad_hour)
+    n = vk.size
+    # ÓTIMA: km >= good_km e hora >= good_hour
+    otima = n - c_ltlt[gk, nh - 1] - c_ltlt[nk - 1, gh] + c_ltlt[gk, gh]
+    # RECUSAR: km <= bad_km e hora <= bad_hour, menos quem já é ÓTIMA (só há
+    # interseção quando good <= bad nos dois eixos)
+    baixo = c_lele[bk, bh]
+    intersecao = c_lele[bk, bh] - c_ltle[gk, bh] - c_lelt[bk, gh] + c_ltlt[gk, gh]
+    intersecao = np.where((gk <= bk) & (gh <= bh), intersecao, 0)
+    contagem[:, COD_OTIMA] = otima
+    contagem[:, COD_RECUSAR] = baixo - intersecao
+    contagem[:, COD_ANALISAR] = valor_km.size - otima - (baixo - intersecao)
+    return contagem
+
+def grade_limites(good_km, bad_km, good_hour, bad_hour):
+    """Todas as combinações dos valores dados; descarta as que têm bad acima do good."""
+    return [Limites(gk, bk, gh, bh) for gk, bk, gh, bh in itertools.product(good_km, bad_km, good_hour, bad_hour)
+            if bk <= gk and bh <= gh]
+
+def faixa(texto):
+    """"1.5:3:0.25" -> [1.5, 1.75, ..., 3.0]; "2" -> [2.0]; "1,2,3" -> [1.0, 2.0, 3.0]."""
+    if ":" not in texto:
+        return [float(v) for v in texto.split(",")]
+    inicio, fim, passo = (float(v) for v in texto.split(":"))
+    return [round(v, 10) for v in np.arange(inicio, fim + passo / 2, passo)]
+
+def carregar_corridas(caminho):
+    """(precos, dists, tempos) de um JSONL com "ride" (saída do python -m analisador_ocr) ou price/dist/time."""
+    precos, dists, tempos = [], [], []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            registro = json.loads(linha) if linha.strip() else None
+            if not registro:
+                continue
+            ride = registro.get("ride", registro)
+            precos.append(ride["price"])
+            dists.append(ride["dist"])
+            tempos.append(ride["time"])
+    return np.array(precos), np.array(dists), np.array(tempos)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr.lote",
+                                     description="Classifica o histórico de corridas sob uma grade de limites.")
+    parser.add_argument("corridas", help="JSONL com as corridas (resultados do analisador ou {price, dist, time}).")
+    parser.add_argument("--good-km", type=faixa, default=[Limites.good_km], help="Valor, lista (a,b) ou faixa ini:fim:passo.")
+    parser.add_argument("--bad-km", type=faixa, default=[Limites.bad_km])
+    parser.add_argument("--good-hour", type=faixa, default=[Limites.good_hour])
+    parser.add_argument("--bad-hour", type=faixa, default=[Limites.bad_hour])
+    parser.add_argument("--top", type=int, default=10, help="Quantas combinações mostrar.")
+    parser.add_argument("--ordenar", choices=["otima", "analisar", "recusar"], default="otima",
+                        help="Mostra primeiro as combinações com mais corridas neste status.")
+    args = parser.parse_args()
+
+    try:
+        exigir_numpy()
+    except RuntimeError as e:
+        parser.error(str(e))
+    precos, dists, tempos = carregar_corridas(args.corridas)
+    limites = grade_limites(args.good_km, args.bad_km, args.good_hour, args.bad_hour)
+    if not limites:
+        parser.error("nenhuma combinação válida (bad precisa ser <= good).")
+
+    inicio = time.perf_counter()
+    valor_km, valor_hora = valores_em_lote(precos, dists, tempos)
+    contagem = contar_lote(valor_km, valor_hora, limites)
+    segundos = time.perf_counter() - inicio
+
+    coluna = {"otima": COD_OTIMA, "analisar": COD_ANALISAR, "recusar": COD_RECUSAR}[args.ordenar]
+    ordem = np.argsort(-contagem[:, coluna], kind="stable")[:args.top]
+    total = max(1, precos.size)
+    for i in ordem:
+        l = limites[i]
+        partes = " | ".join(f"{STATUS[c]}: {contagem[i, c]} ({100 * contagem[i, c] / total:.1f}%)" for c in range(len(STATUS)))
+        print(f"km {l.good_km:g}/{l.bad_km:g}  hora {l.good_hour:g}/{l.bad_hour:g}  ->  {partes}")
+    print(f"{precos.size} corridas x {len(limites)} combinações em {segundos * 1000:.1f} ms", file=sys.stderr)
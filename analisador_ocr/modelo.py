@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+
+# ==============================================================================
+# MODELO
+# ==============================================================================
+# Espelha o que o OcrService.kt guarda e mostra: RideData (a mesma data class
+# usada no anti-duplicidade) e a classificação do card com os limites das
+# configurações (goodKm, badKm, goodHour, badHour).
+
+OTIMA = "ÓTIMA"
+RECUSAR = "RECUSAR"
+ANALISAR = "ANALISAR"
+
+@dataclass(frozen=True)
+class RideData:
+    price: float
+    dist: float
+    time: float
+
+@dataclass(frozen=True)
+class Limites:
+    """Mesmos padrões do loadConfigs() (prefs OCR_PREFS)."""
+    good_km: float = 2.0
+    bad_km: float = 1.5
+    good_hour: float = 60.0
+    bad_hour: float = 40.0
+
+@dataclass(frozen=True)
+class Resultado:
+    """O que o card mostraria: a leitura, os valores por km/hora e a classificação."""
+    ride: RideData
+    valor_km: float
+    valor_hora: float
+    status: str
+    app: str
+
+def valores_por_unidade(ride):
+    """(R$/km, R$/hora) com as mesmas proteções do app: 0 km vira 0.1 e 0 min vira 1."""
+    safe_dist = 0.1 if ride.dist == 0.0 else ride.dist
+    safe_time = 1.0 if ride.time == 0.0 else ride.time
+    return ride.price / safe_dist, (ride.price / safe_time) * 60.0
+
+def classificar(valor_km, valor_hora, limites):
+    if valor_km >= limites.good_km and valor_hora >= limites.good_hour:
+        return OTIMA
+    if valor_km <= limites.bad_km and valor_hora <= limites.bad_hour:
+        return RECUSAR
+    return ANALISAR
+
+def montar_resultado(ride, app, limites):
+    valor_km, valor_hora = valores_por_unidade(ride)
+    return Resultado(ride, valor_km, valor_hora, classificar(valor_km, valor_hora, limites), app)
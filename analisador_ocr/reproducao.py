@@ -0,0 +1,238 @@
+import re
+import sys
+import gzip
+import json
+import argparse
+from collections import Counter
+
+from .sanitizacao import sanitizar_erros_ocr
+from .variantes import VARIANTES, VARIANTES_COM_FILTRO, obter_variante, formatar_casas
+from .filtros import carregar_filtro
+from .colunar import EXTENSAO as EXTENSAO_COLUNAR, ler_colunar, gravar_colunar
+
+# ==============================================================================
+# REPRODUÇÃO DOS LOGS DO OCR
+# ==============================================================================
+# O NOVO_ANALYZE (update_ocr_logs.py) grava cada leitura no motorista_pro_logs.txt
+# (Downloads), uma mensagem por saveLog no formato "[dd/MM HH:mm:ss] msg":
+#
+#   [12/03 18:40:01]
+#   === NOVA LEITURA (UBER) ===
+#   [12/03 18:40:01] LIDO: 'R$ 25,90' -> LIMPO: 'r$ 25.90' (h=92)
+#   [12/03 18:40:01]   -> CANDIDATO PREÇO: R$ 25.9 (Fonte: 92)
+#   [12/03 18:40:01] CONCLUSÃO: DADOS COMPLETOS | R$ 25.9 | 9,8 km | 22 min
+#
+# Linhas sem o carimbo de hora continuam a mensagem anterior (o "\n" antes do
+# NOVA LEITURA e textos de OCR com quebra de linha). Daqui sai um corpus com um
+# registro por leitura, no formato de entrada do `python -m analisador_ocr`:
+#
+#   {"blocos": [{"text", "h", "y"}], "pacote", "altura_tela", "esperado", "duplicidade", "horario", "origem"}
+#
+# "esperado" é o veredito do log ({"price", "dist", "time", "completo"} ou null).
+# O log não tem o y nem os blocos sem dígitos (que não geram preço, distância
+# ou tempo): os blocos logados já passaram do corte do topo, então vão com y=0
+# e altura_tela=0 (nenhum corte). Tudo é lido em fluxo, linha a linha.
+#
+# O "%.1f"/"%.0f" da CONCLUSÃO usa o locale do celular: aceita "9,8" e "9.8".
+
+CARIMBO = re.compile(r"\[(\d{2}/\d{2} \d{2}:\d{2}:\d{2})\] ?")
+NOVA_LEITURA = re.compile(r"=== NOVA LEITURA \((.*)\) ===")
+LIDO = re.compile(r"LIDO: '(.*)' -> LIMPO: '(.*)' \(h=(-?\d+)\)", re.DOTALL)
+SEPARADOR_LIDO = "' -> LIMPO: '"
+CONCLUSAO = re.compile(r"CONCLUSÃO: DADOS (COMPLETOS|PARCIAIS) \| R\$ (\S+) \| (\S+) km \| (\S+) min")
+DUPLICIDADE = "AÇÃO: Ignorado (Duplicidade)"
+ERRO_FATAL = "ERRO FATAL NA ANÁLISE"
+
+# O log só guarda o app detectado; qualquer pacote que o detectar_app reconheça serve
+PACOTES = {"UBER": "com.ubercab.driver", "99": "com.taxis99"}
+
+def abrir_binario(caminho):
+    if caminho == "-":
+        return sys.stdin.buffer
+    return gzip.open(caminho, 'rb') if caminho.endswith(".gz") else open(caminho, 'rb')
+
+def abrir_texto(caminho, modo):
+    if caminho == "-":
+        return sys.stdin if "r" in modo else sys.stdout
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, modo + "t", encoding='utf-8')
+    return open(caminho, modo, encoding='utf-8')
+
+def numero_local(texto):
+    return float(texto.replace(",", "."))
+
+def mensagens_do_log(caminho):
+    """Gera (horario, msg, linha) para cada saveLog, juntando as linhas de continuação."""
+    horario = mensagem = None
+    inicio = 0
+    with abrir_binario(caminho) as f:
+        # Binário para só quebrar em "\n" (o texto do OCR pode ter "\r")
+        for numero, bruta in enumerate(f, 1):
+            linha = bruta.decode('utf-8', errors='replace').rstrip("\n")
+            m = CARIMBO.match(linha)
+            if m:
+                if mensagem is not None:
+                    yield horario, mensagem, inicio
+                horario, mensagem, inicio = m.group(1), linha[m.end():], numero
+            elif mensagem is not None:
+                mensagem += "\n" + linha
+    if mensagem is not None:
+        yield horario, mensagem, inicio
+
+def separar_lido(mensagem):
+    """(bruto, h) de uma linha LIDO. Se o próprio texto tiver o separador, fica
+    com a divisão em que o sanitizeOcrErrors do bruto bate com o limpo logado."""
+    m = LIDO.fullmatch(mensagem)
+    if not m:
+        return None
+    corpo = mensagem[len("LIDO: '"):m.end(2)]
+    h = int(m.group(3))
+    posicoes = [i for i in range(len(corpo)) if corpo.startswith(SEPARADOR_LIDO, i)]
+    for i in posicoes:
+        if sanitizar_erros_ocr(corpo[:i]) == corpo[i + len(SEPARADOR_LIDO):]:
+            return corpo[:i], h
+    return corpo[:posicoes[0]], h
+
+def nova_leitura(horario, app, origem):
+    return {"blocos": [], "pacote": PACOTES.get(app, app), "altura_tela": 0, "esperado": None,
+            "duplicidade": False, "erro": False, "horario": horario, "origem": origem}
+
+def leituras_do_log(caminho, estatisticas=None):
+    """Gera um registro de corpus por "=== NOVA LEITURA ===" do log."""
+    estatisticas = estatisticas if estatisticas is not None else Counter()
+    atual = None
+    for horario, mensagem, linha in mensagens_do_log(caminho):
+        estatisticas["mensagens"] += 1
+        texto = mensagem.strip("\n")
+        m = NOVA_LEITURA.fullmatch(texto)
+        if m:
+            if atual is not None:
+                yield atual
+            atual = nova_leitura(horario, m.group(1), f"{caminho}:{linha}")
+            estatisticas["leituras"] += 1
+            continue
+        if atual is None:
+            continue  # LIFECYCLE, SUCESSO do NOVA_LOGICA etc. ficam de fora
+        if mensagem.startswith("LIDO: "):
+            lido = separar_lido(mensagem)
+            if lido is None:
+                estatisticas["linhas invalidas"] += 1
+                continue
+            atual["blocos"].append({"text": lido[0], "h": lido[1], "y": 0})
+        elif mensagem.startswith("CONCLUSÃO: "):
+            c = CONCLUSAO.fullmatch(mensagem)
+            if c is None:
+                estatisticas["linhas invalidas"] += 1
+                continue
+            atual["esperado"] = {"price": numero_local(c.group(2)), "dist": numero_local(c.group(3)),
+                                 "time": numero_local(c.group(4)), "completo": c.group(1) == "COMPLETOS"}
+        elif mensagem == DUPLICIDADE:
+            atual["duplicidade"] = True
+        elif mensagem.startswith(ERRO_FATAL):
+            atual["erro"] = True
+    if atual is not None:
+        yield atual
+
+def ler_corpus(caminho):
+    """Registros de um corpus JSONL (.gz aceito), .ocrc ou, se for log, extraídos na hora."""
+    if caminho.endswith(EXTENSAO_COLUNAR):
+        yield from ler_colunar(caminho)
+        return
+    nome = caminho[:-3] if caminho.endswith(".gz") else caminho
+    if not nome.endswith((".jsonl", ".json")):
+        yield from leituras_do_log(caminho)
+        return
+    with abrir_texto(caminho, 'r') as f:
+        for linha in f:
+            if linha.strip():
+                yield json.loads(linha)
+
+def card_esperado(registro):
+    """O que o log diz que o card mostrou: (preço, "dist", "tempo") ou None."""
+    e = registro.get("esperado")
+    if not e or not e["completo"] or registro.get("erro"):
+        return None
+    return e["price"], formatar_casas(e["dist"], 1), formatar_casas(e["time"], 0)
+
+def card_obtido(registro, funcao):
+    try:
+        ride, _ = funcao(registro["blocos"], registro.get("pacote", ""), registro.get("altura_tela", 0))
+    except (KeyError, TypeError, ValueError):
+        return None
+    if ride is None:
+        return None
+    return ride.price, formatar_casas(ride.dist, 1), formatar_casas(ride.time, 0)
+
+def reproduzir(registros, variante="novo_analyze", filtro=None):
+    """Gera (registro, esperado, obtido) para cada leitura, comparando na precisão do log."""
+    funcao = obter_variante(variante, filtro)
+    for registro in registros:
+        yield registro, card_esperado(registro), card_obtido(registro, funcao)
+
+def descrever(card):
+    return "sem card" if card is None else f"R$ {card[0]} | {card[1]} km | {card[2]} min"
+
+def comando_extrair(args):
+    estatisticas = Counter()
+    registros = (r for caminho in args.logs for r in leituras_do_log(caminho, estatisticas))
+    if args.saida.endswith(EXTENSAO_COLUNAR):
+        gravar_colunar(registros, args.saida)
+    else:
+        with abrir_texto(args.saida, 'w') as saida:
+            for registro in registros:
+                saida.write(json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n")
+    print(" | ".join(f"{k}: {v}" for k, v in estatisticas.items()), file=sys.stderr)
+
+def comando_reproduzir(args, filtro=None):
+    contagem = Counter()
+    diferencas = abrir_texto(args.diferencas, 'w') if args.diferencas else None
+    try:
+        for caminho in args.corpus:
+            for registro, esperado, obtido in reproduzir(ler_corpus(caminho), args.variante, filtro):
+                contagem["leituras"] += 1
+                if esperado == obtido:
+                    contagem["iguais"] += 1
+                    continue
+                contagem["diferentes"] += 1
+                if contagem["diferentes"] <= args.mostrar:
+                    print(f"{registro.get('origem', '?')} [{registro.get('horario', '')}] "
+                          f"log: {descrever(esperado)}  ->  {args.variante}: {descrever(obtido)}")
+                if diferencas:
+                    diferencas.write(json.dumps({"origem": registro.get("origem"), "esperado": esperado,
+                                                 "obtido": obtido, "blocos": registro["blocos"]},
+                                                ensure_ascii=False) + "\n")
+    finally:
+        if diferencas:
+            diferencas.close()
+    total = contagem["leituras"] or 1
+    print(f"{contagem['leituras']} leituras | iguais: {contagem['iguais']} ({100 * contagem['iguais'] / total:.1f}%) | "
+          f"diferentes: {contagem['diferentes']}", file=sys.stderr)
+    return 1 if contagem["diferentes"] else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m analisador_ocr.reproducao",
+                                     description="Transforma logs do saveLog em corpus de quadros e reproduz as leituras.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_extrair = sub.add_parser("extrair", help="Gera o corpus JSONL a partir dos logs.")
+    p_extrair.add_argument("logs", nargs="+", help="motorista_pro_logs.txt (aceita .gz).")
+    p_extrair.add_argument("--saida", default="-", help="Corpus JSONL (.gz comprime, .ocrc grava o formato colunar; padrão: stdout).")
+
+    p_reproduzir = sub.add_parser("reproduzir", help="Roda uma variante sobre o corpus e mostra onde o veredito muda.")
+    p_reproduzir.add_argument("corpus", nargs="+", help="Corpus JSONL(.gz), .ocrc ou os próprios logs.")
+    p_reproduzir.add_argument("--variante", choices=sorted(VARIANTES), default="novo_analyze")
+    p_reproduzir.add_argument("--mostrar", type=int, default=20, help="Quantas diferenças listar.")
+    p_reproduzir.add_argument("--diferencas", help="Grava todas as diferenças em JSONL.")
+    p_reproduzir.add_argument("--vocabulario", help="JSON {\"regra\": [\"termo\", ...]} dos filtros (só nova_logica).")
+
+    args = parser.parse_args()
+    if args.comando == "extrair":
+        comando_extrair(args)
+    else:
+        if args.vocabulario and args.variante not in VARIANTES_COM_FILTRO:
+            parser.error(f"--vocabulario só vale para: {', '.join(VARIANTES_COM_FILTRO)}")
+        try:
+            filtro = carregar_filtro(args.vocabulario)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        sys.exit(comando_reproduzir(args, filtro))
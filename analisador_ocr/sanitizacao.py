@@ -0,0 +1,43 @@
+import re
+
+# ==============================================================================
+# sanitizeOcrErrors
+# ==============================================================================
+# Mesma sequência de trocas do OcrService.kt. As regex usam re.ASCII porque no
+# Java \d, \s e \b só consideram ASCII por padrão.
+
+MINUTO_ESCRITO = re.compile(r"m[1i]nut[o0]5?")
+MIN_ABREVIADO = re.compile(r"m[1i]n")
+TROCAS_NUMERICAS = str.maketrans({"o": "0", "l": "1", "i": "1", "s": "5", "b": "8"})
+
+# String.trim() do Kotlin remove tudo <= ' ' (não só espaços Unicode como o strip())
+CARACTERES_TRIM = "".join(chr(c) for c in range(33))
+
+def trim_kotlin(texto):
+    return texto.strip(CARACTERES_TRIM)
+
+def sanitizar_erros_ocr(entrada):
+    texto = entrada.lower().replace("\n", " ").replace(",", ".")
+    texto = MINUTO_ESCRITO.sub("min", texto)
+    texto = MIN_ABREVIADO.sub("min", texto)
+    if "km" in texto or "min" in texto or "m " in texto or "h" in texto:
+        # As cinco trocas em sequência do Kotlin não se afetam (nenhuma gera letra), então um translate basta
+        texto = texto.translate(TROCAS_NUMERICAS)
+    return texto
+
+# Versão do OcrService.kt.bak: troca letras só coladas em dígitos, com lookarounds
+# (cada Regex.replace avalia os lookarounds no texto de entrada, como o re.sub)
+TROCAS_BAK = [
+    (re.compile(r"(?<!\d)i{2}(?!\w)", re.ASCII), "11"),
+    (re.compile(r"(?<=\d)i", re.ASCII), "1"),
+    (re.compile(r"i(?=\d)", re.ASCII), "1"),
+    (re.compile(r"(?<=\d)o", re.ASCII), "0"),
+    (re.compile(r"(?<=\d)s", re.ASCII), "5"),
+    (re.compile(r"(?<=\d)b", re.ASCII), "8"),
+]
+
+def sanitizar_erros_ocr_bak(entrada):
+    texto = entrada.lower().replace("\n", " ").replace(",", ".")
+    for padrao, troca in TROCAS_BAK:
+        texto = padrao.sub(troca, texto)
+    return texto
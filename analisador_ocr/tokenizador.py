@@ -0,0 +1,135 @@
+import re
+
+# ==============================================================================
+# TOKENIZADOR NUMÉRICO DOS BLOCOS
+# ==============================================================================
+# O Kotlin roda, por bloco, cinco regex: preço, distância, a troca de horários
+# (12:30) e as de horas e minutos. Aqui uma única varredura acha as sequências
+# de dígitos do texto e cada uma é classificada com testes ancorados na própria
+# posição (só olham os poucos caracteres vizinhos), então o custo cresce com o
+# tamanho do texto e não com texto x quantidade de padrões.
+#
+# Por que é equivalente: todo casamento das regex originais começa no início de
+# uma sequência de dígitos (ou num "(" / "r$" logo antes dela); começar no meio
+# da sequência dá o mesmo resultado que no início, porque o [0-9]+ guloso só pode
+# recuar para deixar outro dígito na frente, o que nenhum padrão aceita. Basta
+# então percorrer as sequências em ordem, pulando as que caem dentro do último
+# casamento do mesmo padrão (a semântica do finditer).
+#
+# A troca de horários muda as posições do texto: blocos com ":" (raros) têm os
+# tempos extraídos do texto já trocado, com uma segunda varredura.
+# extrair_referencia() mantém as regex originais, para conferência.
+
+# Padrões originais do analyzeSmartData (re.ASCII: \d, \s e \b do Java são ASCII)
+PRECO = re.compile(r"(?:r\$|rs)\s*([0-9]+(?:\.[0-9]{2})?)", re.ASCII)
+DISTANCIA = re.compile(r"\(?([0-9]+(?:\.[0-9]+)?)\s*(km|m)\)?", re.ASCII)
+HORARIO = re.compile(r"\d{1,2}:\d{2}", re.ASCII)
+HORAS = re.compile(r"(\d+)\s*(?:h|hr|hrs|hora|horas)\b", re.ASCII)
+MINUTOS = re.compile(r"(\d+)\s*(?:min|minutos|m1n|m1ns|mins)(?!in|etro|l|e|a|o)", re.ASCII)
+
+# Varredura única e testes ancorados no início de cada sequência de dígitos
+DIGITOS = re.compile(r"[0-9]+")
+VALOR_PRECO = re.compile(r"[0-9]+(?:\.[0-9]{2})?")
+SUFIXO_DISTANCIA = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(km|m)\)?", re.ASCII)
+SUFIXO_HORAS = re.compile(r"([0-9]+)\s*(?:h|hr|hrs|hora|horas)\b", re.ASCII)
+SUFIXO_MINUTOS = re.compile(r"([0-9]+)\s*(?:min|minutos|m1n|m1ns|mins)(?!in|etro|l|e|a|o)", re.ASCII)
+ESPACOS_ASCII = " \t\n\x0b\x0c\r"
+# Depois dos dígitos (e decimais), só estes caracteres podem começar uma unidade
+INICIO_UNIDADE = frozenset("kmh")
+
+class Tokens:
+    """Valores numéricos de um bloco, na ordem em que o Kotlin os consome.
+
+    preco: (valor, texto) do primeiro "r$ 12.34"/"rs 12" ou None
+    distancias: [(km, texto_numero, unidade)] (metros já convertidos)
+    horas / minutos: [valor]
+    """
+    __slots__ = ("preco", "distancias", "horas", "minutos")
+
+    def __init__(self, preco=None, distancias=None, horas=None, minutos=None):
+        self.preco = preco
+        self.distancias = distancias or []
+        self.horas = horas or []
+        self.minutos = minutos or []
+
+    def __eq__(self, outro):
+        return all(getattr(self, a) == getattr(outro, a) for a in self.__slots__)
+
+    def __repr__(self):
+        return f"Tokens({self.preco}, {self.distancias}, {self.horas}, {self.minutos})"
+
+def tem_prefixo_preco(texto, inicio):
+    """True se antes de `inicio` vem "r$" ou "rs" seguido só de espaços."""
+    j = inicio
+    while j > 0 and texto[j - 1] in ESPACOS_ASCII:
+        j -= 1
+    return j >= 2 and texto[j - 2] == "r" and texto[j - 1] in "$s"
+
+def pode_ter_unidade(texto, fim):
+    """Corte rápido: depois dos dígitos/decimais e espaços vem k, m ou h?"""
+    n = len(texto)
+    while fim < n and (texto[fim] in ESPACOS_ASCII or texto[fim] == "." or "0" <= texto[fim] <= "9"):
+        fim += 1
+    return fim < n and texto[fim] in INICIO_UNIDADE
+
+def extrair_tempos(texto, inicios, horas, minutos):
+    fim_horas = fim_minutos = 0
+    for inicio in inicios:
+        if inicio >= fim_horas:
+            m = SUFIXO_HORAS.match(texto, inicio)
+            if m:
+                horas.append(float(m.group(1)))
+                fim_horas = m.end()
+        if inicio >= fim_minutos:
+            m = SUFIXO_MINUTOS.match(texto, inicio)
+            if m:
+                minutos.append(float(m.group(1)))
+                fim_minutos = m.end()
+
+def extrair_tokens(limpo):
+    """Tokens de um texto já sanitizado, numa varredura (duas se houver ":")."""
+    tokens = Tokens()
+    candidatos = []  # Inícios de sequências que podem ser distância/tempo
+    fim_distancia = 0
+    procurar_preco = "r$" in limpo or "rs" in limpo
+    for d in DIGITOS.finditer(limpo):
+        inicio = d.start()
+        if procurar_preco and tem_prefixo_preco(limpo, inicio):
+            procurar_preco = False
+            valor = VALOR_PRECO.match(limpo, inicio).group()
+            tokens.preco = (float(valor), valor)
+        if not pode_ter_unidade(limpo, d.end()):
+            continue
+        candidatos.append(inicio)
+        if inicio >= fim_distancia:
+            m = SUFIXO_DISTANCIA.match(limpo, inicio)
+            if m:
+                valor = float(m.group(1))
+                if m.group(2) == "m":
+                    valor /= 1000.0
+                tokens.distancias.append((valor, m.group(1), m.group(2)))
+                fim_distancia = m.end()
+
+    if ":" in limpo:
+        texto_tempo = HORARIO.sub(" ", limpo)
+        candidatos = [d.start() for d in DIGITOS.finditer(texto_tempo) if pode_ter_unidade(texto_tempo, d.end())]
+    else:
+        texto_tempo = limpo
+    extrair_tempos(texto_tempo, candidatos, tokens.horas, tokens.minutos)
+    return tokens
+
+def extrair_referencia(limpo):
+    """Mesmos tokens com as regex originais, uma passada por padrão (como no Kotlin)."""
+    tokens = Tokens()
+    m = PRECO.search(limpo)
+    if m:
+        tokens.preco = (float(m.group(1)), m.group(1))
+    for m in DISTANCIA.finditer(limpo):
+        valor = float(m.group(1))
+        if m.group(2) == "m":
+            valor /= 1000.0
+        tokens.distancias.append((valor, m.group(1), m.group(2)))
+    texto_tempo = HORARIO.sub(" ", limpo)
+    tokens.horas = [float(m.group(1)) for m in HORAS.finditer(texto_tempo)]
+    tokens.minutos = [float(m.group(1)) for m in MINUTOS.finditer(texto_tempo)]
+    return tokens
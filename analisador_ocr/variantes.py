@@ -0,0 +1,446 @@
+import re
+from functools import partial
+from decimal import Decimal, ROUND_HALF_UP
+
+from .modelo import RideData
+from .sanitizacao import sanitizar_erros_ocr, sanitizar_erros_ocr_bak, trim_kotlin
+from .tokenizador import extrair_tokens
+
+# ==============================================================================
+# VARIANTES DO analyzeSmartData
+# ==============================================================================
+# Cada variante reproduz, bloco a bloco, uma versão do analyzeSmartData:
+#
+#   nova_logica   NOVA_LOGICA do fix_ocr_logic.py (a que está no OcrService.kt):
+#                 filtros anti-espelho, teto de preço e busca/viagem separadas
+#   novo_analyze  NOVO_ANALYZE do update_ocr_logs.py: soma tudo e loga cada passo
+#   bak           OcrService.kt.bak: distâncias só entre parênteses, valores
+#                 repetidos na tela contam uma vez (o arquivo não compila por um
+#                 "return text }" duplicado; aqui vale a lógica pretendida)
+#   bak2          OcrService.kt.bak2 (= .bak_text_fix, os arquivos são iguais):
+#                 lia o texto inteiro do print (ML Kit), não blocos
+#
+# Assinatura comum: variante(blocos, pacote, altura_tela, registrar=None) ->
+# (RideData ou None, app). `blocos` é a lista de dicts {"text", "h", "y"} do
+# WindowMonitorService; `registrar(msg)` recebe as mesmas linhas do saveLog.
+# Cada uma é uma classe de estado (ESTADOS: EstadoNovaLogica, EstadoBak...)
+# alimentada bloco a bloco; a função da variante só passa os blocos em ordem.
+# RideData só sai quando o app mostraria o card (preço e distância ou tempo);
+# o anti-duplicidade fica no AnalisadorOcr, que guarda o estado entre quadros.
+
+# Corte do topo (barra de status, notificações): blocos com y abaixo desta
+# fração da altura_tela não entram. O bak2 cortava só 5%; o CacheQuadros lê
+# o mesmo valor para montar a impressão digital do quadro.
+CORTE_TOPO = 0.10
+CORTE_TOPO_BAK2 = 0.05
+
+# Preço, distância e tempos de cada bloco saem do tokenizador (uma varredura só);
+# o fallback do número isolado só roda em fontes grandes sem preço ainda
+PRECO_ISOLADO = re.compile(r"^([0-9]+(?:\.[0-9]{2}))$", re.ASCII)
+
+def detectar_app(pacote):
+    return "99" if "taxis99" in pacote or "didi" in pacote or "99" in pacote else "UBER"
+
+def inteiro_json(valor):
+    """JSONObject.getInt: aceita número ou texto numérico e trunca."""
+    return int(float(valor)) if isinstance(valor, str) else int(valor)
+
+def kotlin_double(valor):
+    """Double.toString do Kotlin/Java: "25.0", "0.005", "1.0E7"."""
+    if valor == 0.0 or 1e-3 <= abs(valor) < 1e7:
+        return repr(float(valor))
+    _, digitos, expoente = Decimal(repr(abs(valor))).normalize().as_tuple()
+    e10 = len(digitos) - 1 + expoente
+    mantissa = f"{digitos[0]}." + ("".join(map(str, digitos[1:])) or "0")
+    return f"{'-' if valor < 0 else ''}{mantissa}E{e10}"
+
+def formatar_casas(valor, casas):
+    """"%.Nf".format(valor): o Formatter do Java arredonda o valor binário exato com HALF_UP."""
+    return str(Decimal(valor).quantize(Decimal(1).scaleb(-casas), rounding=ROUND_HALF_UP))
+
+FILTRO_PADRAO = None
+
+def filtro_padrao():
+    """FILTRO_NOVA_LOGICA do filtros.py, importado só no primeiro uso: o filtros.py tem
+    CLI próprio (python -m) e não pode ser carregado junto com o pacote."""
+    global FILTRO_PADRAO
+    if FILTRO_PADRAO is None:
+        from .filtros import FILTRO_NOVA_LOGICA
+        FILTRO_PADRAO = FILTRO_NOVA_LOGICA
+    return FILTRO_PADRAO
+
+class EstadoNovaLogica:
+    """Estado do analyzeSmartData (NOVA_LOGICA) bloco a bloco: adicionar() cada
+    bloco na ordem e concluir() no fim; parcial() é a leitura até aqui.
+    `filtro` troca o vocabulário dos filtros (um FiltroBlocos)."""
+    __slots__ = ("app", "limite_topo", "filtro", "melhor_preco", "maior_fonte",
+                 "pickup_dist", "trip_dist", "pickup_time", "trip_time")
+
+    def __init__(self, pacote, altura_tela, registrar=None, filtro=None):
+        self.filtro = filtro or filtro_padrao()
+        self.app = detectar_app(pacote)
+        self.limite_topo = altura_tela * CORTE_TOPO
+        self.melhor_preco = 0.0
+        self.maior_fonte = 0
+        self.pickup_dist = self.trip_dist = 0.0
+        self.pickup_time = self.trip_time = 0.0
+
+    def adicionar(self, bloco):
+        texto_bruto = str(bloco["text"])
+        h = inteiro_json(bloco["h"])
+        y = inteiro_json(bloco["y"])
+        if y < self.limite_topo:
+            return
+        limpo = sanitizar_erros_ocr(texto_bruto)
+        # Filtros de segurança (anti-espelho) e de palavras irrelevantes (filtros.py)
+        if self.filtro.descarta(limpo):
+            return
+
+        tokens = extrair_tokens(limpo)
+
+        # A. Preço: a maior fonte vence; empate de fonte fica com o maior valor
+        if tokens.preco:
+            v = tokens.preco[0]
+            if 4.5 < v < 2000.0:
+                if h > self.maior_fonte:
+                    self.maior_fonte, self.melhor_preco = h, v
+                elif h == self.maior_fonte and v > self.melhor_preco:
+                    self.melhor_preco = v
+        # Fallback: número isolado grande
+        if self.melhor_preco == 0.0 and h > 75:
+            m = PRECO_ISOLADO.search(trim_kotlin(limpo))
+            if m:
+                v = float(m.group(1))
+                if 5.0 < v < 600.0:
+                    self.melhor_preco, self.maior_fonte = v, h
+
+        # B. Distância: primeira = busca, segunda = viagem, demais só se diferentes
+        for valor, _, _ in tokens.distancias:
+            if 0.0 < valor < 800.0:
+                if self.pickup_dist == 0.0:
+                    self.pickup_dist = valor
+                elif self.trip_dist == 0.0:
+                    self.trip_dist = valor
+                elif valor != self.pickup_dist and valor != self.trip_dist:
+                    self.trip_dist += valor
+
+        # C. Tempo (sem horários do relógio tipo 12:30)
+        for horas in tokens.horas:
+            if 0 < horas < 24:
+                if self.pickup_time == 0.0:
+                    self.pickup_time = horas * 60
+                else:
+                    self.trip_time += horas * 60
+        for minutos in tokens.minutos:
+            if 0 < minutos < 600:
+                if self.trip_time == 0.0 and self.pickup_time > 0:
+                    self.trip_time += minutos
+                elif self.pickup_time == 0.0:
+                    self.pickup_time = minutos
+                else:
+                    self.trip_time += minutos
+
+    def parcial(self):
+        total_dist = self.pickup_dist + self.trip_dist
+        total_time = self.pickup_time + self.trip_time
+        if self.melhor_preco > 0.0 and (total_dist > 0.0 or total_time > 0.0):
+            return RideData(self.melhor_preco, total_dist, total_time)
+        return None
+
+    def concluir(self):
+        return self.parcial(), self.app
+
+class EstadoNovoAnalyze:
+    """Mesma interface do EstadoNovaLogica para o NOVO_ANALYZE (com os logs)."""
+    __slots__ = ("app", "limite_topo", "registrar", "melhor_preco", "maior_fonte", "total_dist", "total_time")
+
+    def __init__(self, pacote, altura_tela, registrar=None):
+        self.registrar = registrar or (lambda msg: None)
+        self.app = detectar_app(pacote)
+        self.limite_topo = altura_tela * CORTE_TOPO
+        self.melhor_preco = 0.0
+        self.maior_fonte = 0
+        self.total_dist = 0.0
+        self.total_time = 0.0
+        self.registrar(f"\n=== NOVA LEITURA ({self.app}) ===")
+
+    def adicionar(self, bloco):
+        registrar = self.registrar
+        texto_bruto = str(bloco["text"])
+        h = inteiro_json(bloco["h"])
+        y = inteiro_json(bloco["y"])
+        if y < self.limite_topo:
+            return
+        limpo = sanitizar_erros_ocr(texto_bruto)
+        if "ganhe r$" in limpo or "meta" in limpo:
+            return
+        if any(c.isdigit() for c in limpo):
+            registrar(f"LIDO: '{texto_bruto}' -> LIMPO: '{limpo}' (h={h})")
+
+        tokens = extrair_tokens(limpo)
+
+        # A. Preço (sem teto)
+        if tokens.preco:
+            v = tokens.preco[0]
+            registrar(f"  -> CANDIDATO PREÇO: R$ {kotlin_double(v)} (Fonte: {h})")
+            if v > 4.5:
+                if h > self.maior_fonte:
+                    self.maior_fonte, self.melhor_preco = h, v
+                elif h == self.maior_fonte and v > self.melhor_preco:
+                    self.melhor_preco = v
+        if self.melhor_preco == 0.0 and h > 80:
+            m = PRECO_ISOLADO.search(trim_kotlin(limpo))
+            if m:
+                v = float(m.group(1))
+                if 5.0 < v < 500.0:
+                    self.melhor_preco, self.maior_fonte = v, h
+                    registrar(f"  -> CANDIDATO PREÇO (ISOLADO): R$ {kotlin_double(v)}")
+
+        # B. Distância: soma todas
+        for valor, numero, unidade in tokens.distancias:
+            if 0.1 < valor < 300.0:
+                self.total_dist += valor
+                registrar(f"  -> DISTÂNCIA DETECTADA: {kotlin_double(valor)} km (Original: {numero} {unidade})")
+
+        # C. Tempo: soma todos
+        for horas in tokens.horas:
+            if 0 < horas < 24:
+                self.total_time += horas * 60
+                registrar(f"  -> TEMPO (HORAS): {kotlin_double(horas)} h")
+        for minutos in tokens.minutos:
+            if 0 < minutos < 600:
+                self.total_time += minutos
+                registrar(f"  -> TEMPO (MIN): {kotlin_double(minutos)} min")
+
+    def parcial(self):
+        if self.melhor_preco > 0.0 and (self.total_dist > 0.0 or self.total_time > 0.0):
+            return RideData(self.melhor_preco, self.total_dist, self.total_time)
+        return None
+
+    def concluir(self):
+        if self.melhor_preco > 0.0:
+            completo = self.total_dist > 0.0 or self.total_time > 0.0
+            status = "DADOS COMPLETOS" if completo else "DADOS PARCIAIS"
+            self.registrar(f"CONCLUSÃO: {status} | R$ {kotlin_double(self.melhor_preco)} | "
+                           f"{formatar_casas(self.total_dist, 1)} km | {formatar_casas(self.total_time, 0)} min")
+        return self.parcial(), self.app
+
+def ler_blocos(estado, blocos):
+    for bloco in blocos:
+        estado.adicionar(bloco)
+    return estado.concluir()
+
+def nova_logica(blocos, pacote, altura_tela, registrar=None, filtro=None):
+    return ler_blocos(EstadoNovaLogica(pacote, altura_tela, registrar, filtro), blocos)
+
+def novo_analyze(blocos, pacote, altura_tela, registrar=None):
+    return ler_blocos(EstadoNovoAnalyze(pacote, altura_tela, registrar), blocos)
+
+# --- OcrService.kt.bak ---
+
+DISTANCIA_BAK = re.compile(r"\(\s*([0-9]+(?:\.[0-9]+)?)\s*(km|m)\s*\)", re.ASCII)
+PARENTESES = re.compile(r"\(.*?\)")
+HORARIO_BAK = re.compile(r"\d{1,2}:\d{2}", re.ASCII)
+HORAS_BAK = re.compile(r"(\d+)\s*h", re.ASCII)
+MINUTOS_BAK = re.compile(r"(\d+)\s*(?:minutos|minuto|min)\b", re.ASCII)
+PRECO_BAK = re.compile(r"(?:r\$|rs)\s*([0-9]+(?:\.[0-9]{2})?)", re.ASCII)
+
+def soma_kotlin(valores):
+    """Iterable<Double>.sum(): soma em sequência (o sum() do Python 3.12+ compensa o arredondamento)."""
+    total = 0.0
+    for v in valores:
+        total += v
+    return total
+
+class EstadoBak:
+    """Estado do OcrService.kt.bak bloco a bloco (mesma interface do EstadoNovaLogica)."""
+    __slots__ = ("app", "limite_topo", "melhor_preco", "maior_fonte", "distancias", "tempos")
+
+    def __init__(self, pacote, altura_tela, registrar=None):
+        self.app = detectar_app(pacote)
+        self.limite_topo = altura_tela * CORTE_TOPO
+        self.melhor_preco = 0.0
+        self.maior_fonte = 0
+        self.distancias = []  # Valores únicos da tela (anti-multiplicação)
+        self.tempos = []
+
+    def adicionar(self, bloco):
+        texto_bruto = str(bloco["text"])
+        h = inteiro_json(bloco["h"])
+        y = inteiro_json(bloco["y"])
+        if y < self.limite_topo:
+            return
+        limpo = sanitizar_erros_ocr_bak(texto_bruto)
+
+        m = PRECO_BAK.search(limpo)
+        if m:
+            v = float(m.group(1))
+            if v > 4.5:
+                if h > self.maior_fonte:
+                    self.maior_fonte, self.melhor_preco = h, v
+                elif h == self.maior_fonte and v > self.melhor_preco:
+                    self.melhor_preco = v
+        if self.melhor_preco == 0.0 and h > 80:
+            m = PRECO_ISOLADO.search(trim_kotlin(limpo))
+            if m:
+                v = float(m.group(1))
+                if 5.0 < v < 500.0:
+                    self.melhor_preco, self.maior_fonte = v, h
+
+        distancias = self.distancias
+        for m in DISTANCIA_BAK.finditer(limpo):
+            valor = float(m.group(1))
+            if m.group(2) == "m":
+                valor /= 1000.0
+            if valor > 0.0 and valor not in distancias:
+                distancias.append(valor)
+
+        tempos = self.tempos
+        texto_tempo = PARENTESES.sub(" ", HORARIO_BAK.sub(" ", limpo))
+        for m in HORAS_BAK.finditer(texto_tempo):
+            horas = float(m.group(1))
+            if 0 < horas < 24 and horas * 60 not in tempos:
+                tempos.append(horas * 60)
+        for m in MINUTOS_BAK.finditer(texto_tempo):
+            minutos = float(m.group(1))
+            if 0 < minutos < 600 and minutos not in tempos:
+                tempos.append(minutos)
+
+    def parcial(self):
+        total_dist = soma_kotlin(self.distancias)
+        total_time = soma_kotlin(self.tempos)
+        if self.melhor_preco > 0.0 and (total_dist > 0.0 or total_time > 0.0):
+            return RideData(self.melhor_preco, total_dist, total_time)
+        return None
+
+    def concluir(self):
+        return self.parcial(), self.app
+
+def bak(blocos, pacote, altura_tela, registrar=None):
+    return ler_blocos(EstadoBak(pacote, altura_tela, registrar), blocos)
+
+# --- OcrService.kt.bak2 / .bak_text_fix ---
+# O analyzeText recebia o text.text do ML Kit sobre um print com os 5% de cima
+# pintados de preto. Aqui o texto é montado juntando os blocos (como o ML Kit
+# junta, com "\n") e descartando os que começam nesse topo. O app vem do texto.
+
+PRECO_POR_KM_BAK2 = re.compile(r"r\$\s*[0-9.,]+\s*/\s*km", re.ASCII)
+NAO_TEXTO_BAK2 = re.compile(r"[^0-9a-zA-Z$,. ]")
+PRECO_BAK2 = re.compile(r"(?:r\$|rs|\$)\s*([0-9]+(?:[.,][0-9]{0,2})?)", re.ASCII)
+DISTANCIA_BAK2 = re.compile(r"([0-9]+(?:[.,][0-9]+)?)\s*(km|m)(?!in)", re.ASCII)
+HORAS_BAK2 = re.compile(r"([0-9]+)\s*(?:h|hr|hrs|hora)", re.ASCII)
+MINUTOS_BAK2 = re.compile(r"([0-9]+)\s*(?:min|m)(?!in)", re.ASCII)
+TERMOS_UBER_BAK2 = ("uberx", "comfort", "flash", "prioridade", "uber pet", "uber black")
+TERMOS_99_BAK2 = ("99", "dinheiro", "pagamento no app", "negocia")
+
+def int_kotlin(texto):
+    """String.toIntOrNull() ?: 0 para sequências de dígitos (fora do Int vira 0)."""
+    valor = int(texto)
+    return valor if valor < 2 ** 31 else 0
+
+def multiplicar_int(a, b):
+    """Multiplicação de Int do Kotlin (32 bits, com estouro)."""
+    return (a * b + 2 ** 31) % 2 ** 32 - 2 ** 31
+
+def ler_texto_bak2(linhas):
+    """(RideData ou None, app) do analyzeText sobre as linhas já sem o topo."""
+    texto = PRECO_POR_KM_BAK2.sub("", "\n".join(linhas).lower()).replace("mais de 30 min", "")
+    texto = NAO_TEXTO_BAK2.sub(" ", texto)
+
+    if any(t in texto for t in TERMOS_UBER_BAK2):
+        app = "UBER"
+    elif any(t in texto for t in TERMOS_99_BAK2):
+        app = "99"
+    else:
+        return None, None
+
+    precos = [v for v in (float(m.group(1).replace(",", ".")) for m in PRECO_BAK2.finditer(texto)) if 4.5 < v < 2000.0]
+    dists = []
+    for m in DISTANCIA_BAK2.finditer(texto):
+        valor = float(m.group(1).replace(",", "."))
+        if m.group(2) == "m":
+            valor /= 1000.0
+        if 0.05 < valor < 400.0:
+            dists.append(valor)
+    tempos = []
+    for m in HORAS_BAK2.finditer(texto):
+        horas = int_kotlin(m.group(1))
+        if horas > 0:
+            tempos.append(float(multiplicar_int(horas, 60)))
+    for m in MINUTOS_BAK2.finditer(HORAS_BAK2.sub(" ", texto)):
+        minutos = float(m.group(1))
+        if minutos > 0:
+            tempos.append(minutos)
+
+    if not precos or len(dists) < 2 or len(tempos) < 2:
+        return None, app
+    precos.sort(reverse=True)
+    dists.sort(reverse=True)
+    tempos.sort(reverse=True)
+    preco = precos[0]
+    dist = dists[0] + dists[1]
+    tempo = tempos[0] + tempos[1] + tempos[2] if len(tempos) >= 3 else tempos[0] + tempos[1]
+    if preco > 0 and dist > 0 and tempo > 0:
+        return RideData(preco, dist, tempo), app
+    return None, app
+
+class EstadoBak2:
+    """O bak2 lia o texto da tela inteira (as regex atravessam as quebras de linha e o
+    app vem do texto): o estado guarda as linhas visíveis e parcial() relê o texto
+    acumulado até aqui."""
+    __slots__ = ("limite_topo", "linhas", "app")
+
+    def __init__(self, pacote, altura_tela, registrar=None):
+        self.limite_topo = altura_tela * CORTE_TOPO_BAK2
+        self.linhas = []
+        self.app = None
+
+    def adicionar(self, bloco):
+        if inteiro_json(bloco["y"]) >= self.limite_topo:
+            self.linhas.append(str(bloco["text"]))
+
+    def parcial(self):
+        ride, self.app = ler_texto_bak2(self.linhas)
+        return ride
+
+    def concluir(self):
+        return ler_texto_bak2(self.linhas)
+
+def bak2(blocos, pacote, altura_tela, registrar=None):
+    return ler_blocos(EstadoBak2(pacote, altura_tela, registrar), blocos)
+
+VARIANTES = {
+    "nova_logica": nova_logica,
+    "novo_analyze": novo_analyze,
+    "bak": bak,
+    "bak2": bak2,
+    "bak_text_fix": bak2,
+}
+
+CORTES_TOPO = {
+    "nova_logica": CORTE_TOPO,
+    "novo_analyze": CORTE_TOPO,
+    "bak": CORTE_TOPO,
+    "bak2": CORTE_TOPO_BAK2,
+    "bak_text_fix": CORTE_TOPO_BAK2,
+}
+
+# Variantes que aceitam outro vocabulário de filtros (parâmetro `filtro`, um FiltroBlocos)
+VARIANTES_COM_FILTRO = ("nova_logica",)
+
+def obter_variante(nome, filtro=None):
+    """A função da variante; com `filtro`, já presa a esse vocabulário."""
+    if filtro is None:
+        return VARIANTES[nome]
+    if nome not in VARIANTES_COM_FILTRO:
+        raise ValueError(f"variante sem filtros configuráveis: {nome} (opções: {', '.join(VARIANTES_COM_FILTRO)})")
+    return partial(VARIANTES[nome], filtro=filtro)
+
+# Estado de cada variante para a leitura bloco a bloco (analisador_ocr.incremental)
+ESTADOS = {
+    "nova_logica": EstadoNovaLogica,
+    "novo_analyze": EstadoNovoAnalyze,
+    "bak": EstadoBak,
+    "bak2": EstadoBak2,
+    "bak_text_fix": EstadoBak2,
+}
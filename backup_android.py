@@ -1,10 +1,45 @@
 import os
 import shutil
+import hashlib
+import json
+import argparse
+import io
+import sys
+import zlib
+import codecs
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from regras_ignorar import RegrasIgnorar
+from instrumentacao_backup import Instrumentacao, novos_tempos
+
+try:
+    import zstandard
+except ImportError:  # Opcional: só é necessário para --formato zst
+    zstandard = None
 
 # ================= CONFIGURAÇÕES =================
 DIRETORIO_RAIZ = "."
 PASTA_DESTINO = "Backup_Android"
 TAMANHO_MAX = 200 * 1024  # 200 KB
+TAMANHO_PEDACO_LEITURA = 64 * 1024  # Bytes lidos por vez ao copiar um arquivo
+
+# Modo incremental: manifesto com (mtime, tamanho, hash) de cada arquivo de origem
+NOME_MANIFESTO = ".manifesto_backup.json"
+VERSAO_MANIFESTO = 1
+TAMANHO_LEITURA_HASH = 1024 * 1024
+
+# Grupos (pastas) processados em paralelo; 1 = execução serial
+TRABALHADORES = 4
+
+# Formato das partes: "txt" (texto puro) ou compactado ("gz"/"zst") com índice lateral.
+# Nos formatos compactados cada arquivo vira um frame independente, então o índice
+# (parte, offset, tamanho) permite extrair um arquivo sem ler o resto da parte.
+FORMATOS = {"txt": ".txt", "gz": ".txt.gz", "zst": ".txt.zst"}
+NOME_INDICE = "indice_backup.json"
+NIVEL_GZIP = 6
+NIVEL_ZSTD = 10
 
 # Extensões focadas em desenvolvimento Android
 EXTENSOES_PERMITIDAS = {
@@ -23,14 +58,15 @@ PASTAS_IGNORADAS = {
     'build', '.gradle', '.idea', '.git', 
     'venv', '__pycache__', 'node_modules',
     'Backup', 'BackupOtimizado', 'BackupFinal', 
-    'Backup_Estruturado', 'Backup_Android'
+    'Backup_Estruturado', 'Backup_Android', 'Restaurado_Android', 'Snapshots_Android'
 }
 
 # Arquivos Binários ou Desnecessários para IGNORAR
 ARQUIVOS_IGNORADOS = {
     'motorista.jks', 'release.keystore', 'debug.keystore',
     'gradlew', 'gradlew.bat', 'local.properties',
-    'backup_android.py', 'fazer_backup.py'
+    'backup_android.py', 'fazer_backup.py',
+    'benchmark_backup.json'
 }
 
 def limpar_nome_pasta(caminho_pasta):
@@ -49,99 +85,622 @@ def limpar_nome_pasta(caminho_pasta):
         
     return limpo
 
-def deve_processar(nome_arquivo):
-    if nome_arquivo in ARQUIVOS_IGNORADOS: return False
-    
-    # Arquivos sem extensão exatos permitidos (ex: Proguard, mas geralmente tem ext)
-    if nome_arquivo in EXTENSOES_PERMITIDAS: return True
-    
-    _, ext = os.path.splitext(nome_arquivo)
-    
-    # Ignora imagens (png, jpg, webp) explicitamente se não estiverem na lista permitida
-    if ext.lower() in ['.png', '.jpg', '.jpeg', '.webp', '.ico']:
-        return False
-        
-    return ext.lower() in EXTENSOES_PERMITIDAS
-
-def formatar_cabecalho(caminho_arquivo):
+def formatar_cabecalho(caminho_arquivo, continuacao=False):
+    # Arquivos maiores que uma parte (modo --empacotar) continuam em blocos "CONTINUAÇÃO:"
     linha = "=" * 80
-    return f"\n{linha}\nARQUIVO: {caminho_arquivo}\n{linha}\n"
+    rotulo = "CONTINUAÇÃO" if continuacao else "ARQUIVO"
+    return f"\n{linha}\n{rotulo}: {caminho_arquivo}\n{linha}\n"
 
-def realizar_backup():
-    # Prepara a pasta de destino
-    if os.path.exists(PASTA_DESTINO):
-        shutil.rmtree(PASTA_DESTINO)
-    os.makedirs(PASTA_DESTINO)
-    
-    print(f"--- INICIANDO BACKUP ANDROID (Max {TAMANHO_MAX/1024:.0f}KB) ---")
-    
-    total_arquivos_gerados = 0
-    total_arquivos_lidos = 0
-    
+def regras_padrao(excluir=(), incluir=(), usar_gitignore=False):
+    """Regras compiladas a partir das listas fixas acima, mais padrões extras opcionais."""
+    return RegrasIgnorar(EXTENSOES_PERMITIDAS, PASTAS_IGNORADAS, ARQUIVOS_IGNORADOS,
+                         excluir=excluir, incluir=incluir, usar_gitignore=usar_gitignore,
+                         raiz=DIRETORIO_RAIZ)
+
+def coletar_grupos(regras=None, instrumentacao=None):
+    """Percorre o projeto e devolve [(nome_grupo, [arquivos ordenados])] na ordem do os.walk."""
+    regras = regras or regras_padrao()
+    grupos = []
+    inicio = perf_counter()
+    filtro = 0.0
     for raiz, dirs, arquivos in os.walk(DIRETORIO_RAIZ):
-        # Remove pastas ignoradas da árvore de navegação
-        dirs[:] = [d for d in dirs if d not in PASTAS_IGNORADAS]
+        inicio_filtro = perf_counter()
+        pasta_rel = os.path.relpath(raiz, DIRETORIO_RAIZ)
+        regras.entrar_pasta(pasta_rel)
+        
+        # Remove pastas ignoradas da árvore de navegação antes de descer nelas
+        dirs[:] = [d for d in dirs if not regras.ignorar_pasta(pasta_rel, d)]
         
         # Filtra arquivos válidos nesta pasta
-        arquivos_validos = []
-        for arq in arquivos:
-            if deve_processar(arq):
-                arquivos_validos.append(os.path.join(raiz, arq))
+        arquivos_validos = [os.path.join(raiz, arq) for arq in arquivos if regras.processar_arquivo(pasta_rel, arq)]
         
         arquivos_validos.sort()
+        filtro += perf_counter() - inicio_filtro
         
         if not arquivos_validos:
             continue
 
-        # Configura o nome do arquivo de backup baseado na pasta
-        nome_grupo = limpar_nome_pasta(raiz)
-        parte = 1
-        tamanho_atual = 0
-        
-        nome_arquivo_txt = f"android_{nome_grupo}_parte{parte:02d}.txt"
-        caminho_txt = os.path.join(PASTA_DESTINO, nome_arquivo_txt)
-        f_saida = open(caminho_txt, 'w', encoding='utf-8')
-        
-        print(f"📱 Pasta: {nome_grupo}...")
+        grupos.append((limpar_nome_pasta(raiz), arquivos_validos))
+    if instrumentacao:
+        instrumentacao.somar_fases(varredura=perf_counter() - inicio - filtro, filtro=filtro)
+    return grupos
+
+def agrupar_por_nome(grupos):
+    """Junta pastas que limpar_nome_pasta mapeia para o mesmo prefixo, preservando a ordem do walk."""
+    por_nome = {}
+    for nome_grupo, arquivos_validos in grupos:
+        por_nome.setdefault(nome_grupo, []).append(arquivos_validos)
+    return list(por_nome.items())
+
+def executar_grupos(funcao, itens, trabalhadores):
+    """Aplica funcao a cada grupo num pool de threads, devolvendo os resultados na ordem original."""
+    if trabalhadores <= 1:
+        for item in itens:
+            yield funcao(item)
+        return
+    with ThreadPoolExecutor(max_workers=trabalhadores) as pool:
+        yield from pool.map(funcao, itens)
+
+def novo_compressor(formato):
+    """Compressor de um frame (um por arquivo) ou None para texto puro."""
+    if formato == "gz":
+        return zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 31)
+    if formato == "zst":
+        return zstandard.ZstdCompressor(level=NIVEL_ZSTD).compressobj()
+    return None
+
+def descomprimir_frame(formato, dados):
+    if formato == "gz":
+        return zlib.decompress(dados, 31)
+    if formato == "zst":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(dados)
+    return dados
 
-        for caminho_origem in arquivos_validos:
-            caminho_rel = os.path.relpath(caminho_origem, DIRETORIO_RAIZ)
+def nome_parte(nome_grupo, parte, formato="txt"):
+    return f"android_{nome_grupo}_parte{parte:02d}{FORMATOS[formato]}"
+
+def ler_codificado(caminho_origem, tempos):
+    """Gera o conteúdo do arquivo em pedaços de bytes UTF-8, medindo leitura/decodificação/codificação.
+
+    Decodifica exatamente como open(..., encoding='utf-8', errors='ignore') em modo
+    texto (quebras de linha universais), mas com leitura binária separada, para que
+    o tempo de disco e o de decodificação apareçam em fases distintas.
+    """
+    decodificador = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(errors='ignore'), translate=True)
+    with open(caminho_origem, 'rb') as f_origem:
+        while True:
+            inicio = perf_counter()
+            bruto = f_origem.read(TAMANHO_PEDACO_LEITURA)
+            lido = perf_counter()
+            texto = decodificador.decode(bruto, final=not bruto)
+            decodificado = perf_counter()
+            dados = texto.encode('utf-8')
+            tempos["leitura"] += lido - inicio
+            tempos["decodificacao"] += decodificado - lido
+            tempos["codificacao"] += perf_counter() - decodificado
+            tempos["bytes_lidos"] += len(bruto)
+            if dados:
+                yield dados
+            if not bruto:
+                return
+
+def gravador(f_saida, compressor, tempos):
+    """Função gravar(dados, final=False) que comprime (se houver compressor) e grava na parte."""
+    def gravar(dados, final=False):
+        inicio = perf_counter()
+        if compressor is not None:
+            dados = compressor.compress(dados)
+            if final:
+                dados += compressor.flush()
+            agora = perf_counter()
+            tempos["compressao"] += agora - inicio
+            inicio = agora
+        f_saida.write(dados)
+        tempos["escrita"] += perf_counter() - inicio
+    return gravar
+
+def escrever_bloco(f_saida, cabecalho, caminho_origem, compressor=None, tempos=None):
+    """Escreve cabeçalho + conteúdo + "\n" em f_saida, em pedaços.
+
+    Cada pedaço é codificado uma única vez, direto para a saída binária.
+    Retorna (bytes de texto do bloco, bytes gravados na parte); os dois só diferem
+    quando há compressor.
+    """
+    tempos = novos_tempos() if tempos is None else tempos
+    gravar = gravador(f_saida, compressor, tempos)
+    gravar(cabecalho)
+    escritos = len(cabecalho)
+    for dados in ler_codificado(caminho_origem, tempos):
+        gravar(dados)
+        escritos += len(dados)
+    gravar(b"\n", final=True)
+    return escritos + 1, f_saida.tell()
+
+def gerar_partes_grupo(nome_grupo, arquivos_validos, mensagens=None, formato="txt", instrumentacao=None):
+    """Gera as partes android_<grupo>_parteNN de um grupo. Retorna (partes, arquivos_lidos, indice).
+
+    Com `mensagens`, o progresso é acumulado na lista em vez de impresso, para que
+    execuções paralelas mantenham a saída na ordem da execução serial. O limite
+    TAMANHO_MAX vale sempre para o texto, então as partes compactadas têm o mesmo
+    conteúdo das .txt. `indice` só é preenchido nos formatos compactados.
+    """
+    saida = print if mensagens is None else mensagens.append
+    parte = 1
+    tamanho_atual = 0
+    posicao = 0  # Bytes já gravados na parte (igual a tamanho_atual em txt)
+    partes = []
+    indice = {}
+    lidos = 0
+    
+    nome_arquivo_txt = nome_parte(nome_grupo, parte, formato)
+    caminho_txt = os.path.join(PASTA_DESTINO, nome_arquivo_txt)
+    f_saida = open(caminho_txt, 'wb')
+    
+    saida(f"📱 Pasta: {nome_grupo}...")
+
+    for caminho_origem in arquivos_validos:
+        caminho_rel = os.path.relpath(caminho_origem, DIRETORIO_RAIZ)
+        cabecalho = formatar_cabecalho(caminho_rel).encode('utf-8')
+        tempos = novos_tempos()
+        
+        try:
+            # O tamanho só é conhecido depois de decodificar: escreve na parte atual
+            # e, se estourar o limite de 200KB, desfaz e regrava na parte seguinte.
+            tamanho_bloco, fim = escrever_bloco(f_saida, cabecalho, caminho_origem, novo_compressor(formato), tempos)
             
-            try:
-                with open(caminho_origem, 'r', encoding='utf-8', errors='ignore') as f_origem:
-                    conteudo = f_origem.read()
-                
-                bloco = formatar_cabecalho(caminho_rel) + conteudo + "\n"
-                tamanho_bloco = len(bloco.encode('utf-8'))
-                
-                # Verifica limite de 200KB
-                if tamanho_atual + tamanho_bloco > TAMANHO_MAX:
-                    f_saida.close()
-                    print(f"   -> {nome_arquivo_txt} salvo.")
-                    
-                    parte += 1
-                    tamanho_atual = 0
-                    nome_arquivo_txt = f"android_{nome_grupo}_parte{parte:02d}.txt"
-                    caminho_txt = os.path.join(PASTA_DESTINO, nome_arquivo_txt)
-                    f_saida = open(caminho_txt, 'w', encoding='utf-8')
+            if tamanho_atual + tamanho_bloco > TAMANHO_MAX:
+                f_saida.seek(posicao)
+                f_saida.truncate()
+                f_saida.close()
+                partes.append(nome_arquivo_txt)
+                saida(f"   -> {nome_arquivo_txt} salvo.")
                 
-                f_saida.write(bloco)
-                tamanho_atual += tamanho_bloco
-                total_arquivos_lidos += 1
-                
-            except Exception as e:
-                print(f"   [ERRO] {caminho_rel}: {e}")
+                parte += 1
+                tamanho_atual = 0
+                posicao = 0
+                nome_arquivo_txt = nome_parte(nome_grupo, parte, formato)
+                caminho_txt = os.path.join(PASTA_DESTINO, nome_arquivo_txt)
+                f_saida = open(caminho_txt, 'wb')
+                tamanho_bloco, fim = escrever_bloco(f_saida, cabecalho, caminho_origem, novo_compressor(formato), tempos)
+            
+            if instrumentacao:
+                instrumentacao.registrar_arquivo(nome_grupo, caminho_rel, tempos, fim - posicao)
+            if formato != "txt":
+                indice[caminho_rel] = {"parte": nome_arquivo_txt, "offset": posicao,
+                                       "tamanho": fim - posicao, "tamanho_texto": tamanho_bloco}
+            tamanho_atual += tamanho_bloco
+            posicao = fim
+            lidos += 1
+            
+        except Exception as e:
+            # Descarta o que tiver sido escrito parcialmente deste arquivo
+            f_saida.seek(posicao)
+            f_saida.truncate()
+            saida(f"   [ERRO] {caminho_rel}: {e}")
+
+    f_saida.close()
+    partes.append(nome_arquivo_txt)
+    saida(f"   -> {nome_arquivo_txt} salvo.")
+    return partes, lidos, indice
+
+# ================= MODO EMPACOTADO =================
+# Em vez de encher as partes na ordem alfabética, mede cada arquivo e distribui
+# por first-fit decreasing: menos partes, mais cheias, sempre dentro de
+# TAMANHO_MAX. Arquivos maiores que uma parte são divididos em blocos
+# "CONTINUAÇÃO:" em partes consecutivas, e a sobra da última é aproveitada.
+
+def medir_texto(caminho_origem, tempos):
+    """Bytes que o conteúdo ocupará na parte (mesma decodificação do escrever_bloco)."""
+    return sum(len(dados) for dados in ler_codificado(caminho_origem, tempos))
+
+def ponto_de_corte(dados, limite):
+    """Maior corte <= limite, de preferência após um "\n" e nunca no meio de um caractere UTF-8."""
+    quebra = dados.rfind(b"\n", 0, limite)
+    if quebra >= 0:
+        return quebra + 1
+    corte = limite
+    while corte > 0 and (dados[corte] & 0xC0) == 0x80:
+        corte -= 1
+    return corte or limite
 
+def escrever_arquivo_dividido(nome_grupo, caminho_origem, caminho_rel, caixas, formato, tempos):
+    """Grava um arquivo grande em partes novas e consecutivas. Retorna a entrada de índice.
+
+    Cada parte recebe uma caixa [nome, livre, blocos]; a última fica com o espaço
+    que sobrou para o first-fit usar depois.
+    """
+    pedacos = []
+    estado = {"f": None, "gravar": None, "texto": 0, "cheio": False}
+
+    def fechar_pedaco():
+        f_saida = estado["f"]
+        estado["gravar"](b"\n", final=True)
+        pedacos.append({"parte": caixas[-1][0], "offset": 0, "tamanho": f_saida.tell(),
+                        "tamanho_texto": estado["texto"] + 1})
+        caixas[-1][1] = TAMANHO_MAX - estado["texto"] - 1
         f_saida.close()
-        print(f"   -> {nome_arquivo_txt} salvo.")
-        total_arquivos_gerados += parte
 
-    print(f"\n--- CONCLUÍDO ---")
+    def abrir_pedaco():
+        nome = nome_parte(nome_grupo, len(caixas) + 1, formato)
+        caixas.append([nome, 0, []])
+        estado["f"] = open(os.path.join(PASTA_DESTINO, nome), 'wb')
+        estado["gravar"] = gravador(estado["f"], novo_compressor(formato), tempos)
+        cabecalho = formatar_cabecalho(caminho_rel, continuacao=bool(pedacos)).encode('utf-8')
+        estado["gravar"](cabecalho)
+        estado["texto"] = len(cabecalho)
+        estado["cheio"] = False
+
+    abrir_pedaco()
+    for dados in ler_codificado(caminho_origem, tempos):
+        while dados:
+            restante = TAMANHO_MAX - estado["texto"] - 1  # Reserva o "\n" final do bloco
+            if restante <= 0 or estado["cheio"]:
+                fechar_pedaco()
+                abrir_pedaco()
+                continue
+            n = len(dados) if len(dados) <= restante else ponto_de_corte(dados, restante)
+            estado["gravar"](dados[:n])
+            estado["texto"] += n
+            dados = dados[n:]
+            if dados:
+                # Cortou (numa quebra de linha, se possível): o resto vai para a próxima parte
+                estado["cheio"] = True
+    fechar_pedaco()
+
+    entrada = dict(pedacos[0])
+    if len(pedacos) > 1:
+        entrada["continuacoes"] = pedacos[1:]
+    return entrada
+
+def gerar_partes_empacotadas(nome_grupo, arquivos_validos, mensagens=None, formato="txt", instrumentacao=None):
+    """Versão first-fit decreasing de gerar_partes_grupo (mesmo retorno)."""
+    saida = print if mensagens is None else mensagens.append
+    saida(f"📱 Pasta: {nome_grupo}...")
+    
+    itens = []
+    grandes = []
+    for caminho_origem in arquivos_validos:
+        caminho_rel = os.path.relpath(caminho_origem, DIRETORIO_RAIZ)
+        cabecalho = formatar_cabecalho(caminho_rel).encode('utf-8')
+        tempos = novos_tempos()
+        try:
+            tamanho_bloco = len(cabecalho) + medir_texto(caminho_origem, tempos) + 1
+        except Exception as e:
+            saida(f"   [ERRO] {caminho_rel}: {e}")
+            continue
+        destino = grandes if tamanho_bloco > TAMANHO_MAX else itens
+        destino.append((tamanho_bloco, caminho_origem, caminho_rel, cabecalho, tempos))
+    
+    caixas = []  # [nome_da_parte, bytes livres, blocos a gravar]
+    indice = {}
+    lidos = 0
+    
+    # 1. Arquivos grandes primeiro: cada um ocupa partes próprias em sequência
+    for _, caminho_origem, caminho_rel, _, tempos in grandes:
+        quantidade = len(caixas)
+        try:
+            entrada = escrever_arquivo_dividido(nome_grupo, caminho_origem, caminho_rel, caixas, formato, tempos)
+            indice[caminho_rel] = entrada
+            lidos += 1
+            if instrumentacao:
+                bytes_saida = sum(p["tamanho"] for p in [entrada] + entrada.get("continuacoes", []))
+                instrumentacao.registrar_arquivo(nome_grupo, caminho_rel, tempos, bytes_saida)
+        except Exception as e:
+            remover_partes([caixa[0] for caixa in caixas[quantidade:]])
+            del caixas[quantidade:]
+            saida(f"   [ERRO] {caminho_rel}: {e}")
+    
+    # 2. First-fit decreasing dos demais (empates ficam na ordem alfabética)
+    itens.sort(key=lambda item: -item[0])
+    for item in itens:
+        for caixa in caixas:
+            if caixa[1] >= item[0]:
+                break
+        else:
+            caixa = [nome_parte(nome_grupo, len(caixas) + 1, formato), TAMANHO_MAX, []]
+            caixas.append(caixa)
+        caixa[1] -= item[0]
+        caixa[2].append(item)
+    
+    if not caixas:
+        caixas.append([nome_parte(nome_grupo, 1, formato), TAMANHO_MAX, []])
+    
+    # 3. Grava: partes de arquivos grandes recebem os blocos no final ('ab')
+    for nome, _, blocos in caixas:
+        caminho_txt = os.path.join(PASTA_DESTINO, nome)
+        with open(caminho_txt, 'ab') as f_saida:
+            for _, caminho_origem, caminho_rel, cabecalho, tempos in sorted(blocos, key=lambda b: b[2]):
+                posicao = f_saida.tell()
+                try:
+                    tamanho_bloco, fim = escrever_bloco(f_saida, cabecalho, caminho_origem, novo_compressor(formato), tempos)
+                except Exception as e:
+                    f_saida.seek(posicao)
+                    f_saida.truncate()
+                    saida(f"   [ERRO] {caminho_rel}: {e}")
+                    continue
+                if instrumentacao:
+                    instrumentacao.registrar_arquivo(nome_grupo, caminho_rel, tempos, fim - posicao)
+                if formato != "txt":
+                    indice[caminho_rel] = {"parte": nome, "offset": posicao,
+                                           "tamanho": fim - posicao, "tamanho_texto": tamanho_bloco}
+                lidos += 1
+        saida(f"   -> {nome} salvo.")
+    
+    if formato == "txt":
+        indice = {}
+    return [caixa[0] for caixa in caixas], lidos, indice
+
+# ================= ÍNDICE (FORMATOS COMPACTADOS) =================
+
+def caminho_indice():
+    return os.path.join(PASTA_DESTINO, NOME_INDICE)
+
+def salvar_indice(formato, indice):
+    temporario = caminho_indice() + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({"versao": 1, "formato": formato, "arquivos": indice}, f, indent=1, sort_keys=True)
+    os.replace(temporario, caminho_indice())
+
+def carregar_indice(pasta=None):
+    with open(os.path.join(pasta or PASTA_DESTINO, NOME_INDICE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def extrair_do_indice(caminho_rel, indice, pasta=None):
+    """Devolve o conteúdo (str) de um arquivo lendo só os seus frames nas partes indicadas."""
+    entrada = indice["arquivos"][caminho_rel]
+    conteudo = []
+    for n, pedaco in enumerate([entrada] + entrada.get("continuacoes", [])):
+        with open(os.path.join(pasta or PASTA_DESTINO, pedaco["parte"]), 'rb') as f:
+            f.seek(pedaco["offset"])
+            dados = f.read(pedaco["tamanho"])
+        bloco = descomprimir_frame(indice["formato"], dados)
+        cabecalho = formatar_cabecalho(caminho_rel, continuacao=n > 0).encode('utf-8')
+        conteudo.append(bloco[len(cabecalho):-1])
+    return b"".join(conteudo).decode('utf-8')
+
+# ================= MODO INCREMENTAL =================
+# O manifesto guarda, por grupo, as partes geradas e (mtime, tamanho, hash) de
+# cada arquivo de origem. Grupos sem mudança não são reescritos.
+
+def hash_arquivo(caminho):
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_LEITURA_HASH), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+def caminho_manifesto():
+    return os.path.join(PASTA_DESTINO, NOME_MANIFESTO)
+
+def carregar_manifesto(formato="txt", empacotar=False):
+    try:
+        with open(caminho_manifesto(), 'r', encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (manifesto.get("versao") != VERSAO_MANIFESTO or manifesto.get("tamanho_max") != TAMANHO_MAX
+            or manifesto.get("formato", "txt") != formato or manifesto.get("empacotar", False) != empacotar):
+        # Formato ou limite de parte diferente: nenhuma parte antiga é reaproveitável
+        return None
+    return manifesto
+
+def salvar_manifesto(grupos_manifesto, formato="txt", empacotar=False):
+    manifesto = {"versao": VERSAO_MANIFESTO, "tamanho_max": TAMANHO_MAX, "formato": formato,
+                 "empacotar": empacotar, "grupos": grupos_manifesto}
+    temporario = caminho_manifesto() + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=1, sort_keys=True)
+    os.replace(temporario, caminho_manifesto())
+
+def assinatura_arquivos(arquivos_validos, anteriores, instrumentacao=None):
+    """Monta {caminho_rel: {mtime, tamanho, hash}}, só relendo arquivos com mtime/tamanho novos."""
+    inicio = perf_counter()
+    assinaturas = {}
+    for caminho_origem in arquivos_validos:
+        caminho_rel = os.path.relpath(caminho_origem, DIRETORIO_RAIZ)
+        try:
+            st = os.stat(caminho_origem)
+        except OSError:
+            assinaturas[caminho_rel] = None
+            continue
+        antigo = anteriores.get(caminho_rel)
+        if antigo and antigo["mtime"] == st.st_mtime_ns and antigo["tamanho"] == st.st_size:
+            hash_atual = antigo["hash"]
+        else:
+            try:
+                hash_atual = hash_arquivo(caminho_origem)
+            except OSError:
+                hash_atual = None
+        assinaturas[caminho_rel] = {"mtime": st.st_mtime_ns, "tamanho": st.st_size, "hash": hash_atual}
+    if instrumentacao:
+        instrumentacao.somar_fases(assinatura=perf_counter() - inicio)
+    return assinaturas
+
+def grupo_alterado(assinaturas, anterior):
+    if anterior is None:
+        return True
+    antigos = anterior["arquivos"]
+    if list(assinaturas) != list(antigos):
+        return True
+    for caminho_rel, atual in assinaturas.items():
+        # Arquivo ilegível (None) força a regeração para reproduzir o [ERRO] do modo completo
+        if atual is None or atual["hash"] is None or atual["hash"] != antigos[caminho_rel]["hash"]:
+            return True
+    return any(not os.path.exists(os.path.join(PASTA_DESTINO, p)) for p in anterior["partes"])
+
+def remover_partes(partes):
+    for nome in partes:
+        caminho = os.path.join(PASTA_DESTINO, nome)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+def gerar_partes_listas(nome_grupo, listas, mensagens, formato, empacotar, instrumentacao=None):
+    gerar = gerar_partes_empacotadas if empacotar else gerar_partes_grupo
+    inicio = perf_counter()
+    partes = []
+    indice = {}
+    lidos = 0
+    for arquivos_validos in listas:
+        partes_lista, lidos_lista, indice_lista = gerar(nome_grupo, arquivos_validos, mensagens, formato, instrumentacao)
+        partes += partes_lista
+        indice.update(indice_lista)
+        lidos += lidos_lista
+    if instrumentacao:
+        instrumentacao.registrar_grupo(nome_grupo, len(partes), perf_counter() - inicio)
+    return partes, lidos, indice
+
+def backup_grupo_completo(formato, empacotar, instrumentacao, item):
+    nome_grupo, listas = item
+    mensagens = []
+    partes, lidos, indice = gerar_partes_listas(nome_grupo, listas, mensagens, formato, empacotar, instrumentacao)
+    return partes, lidos, indice, mensagens
+
+def backup_grupo_incremental(grupos_anteriores, formato, empacotar, instrumentacao, item):
+    """Retorna (entrada_manifesto, reconstruido, arquivos_lidos, mensagens) de um grupo."""
+    nome_grupo, listas = item
+    anterior = grupos_anteriores.get(nome_grupo)
+    arquivos = [arq for arquivos_validos in listas for arq in arquivos_validos]
+    assinaturas = assinatura_arquivos(arquivos, anterior["arquivos"] if anterior else {}, instrumentacao)
+    
+    if not grupo_alterado(assinaturas, anterior):
+        # Só o mtime pode ter mudado (ex: touch); as partes continuam idênticas
+        return dict(anterior, arquivos=assinaturas), False, 0, []
+    
+    if anterior:
+        remover_partes(anterior["partes"])
+    mensagens = []
+    partes, lidos, indice = gerar_partes_listas(nome_grupo, listas, mensagens, formato, empacotar, instrumentacao)
+    return {"partes": partes, "arquivos": assinaturas, "indice": indice}, True, lidos, mensagens
+
+def realizar_backup_incremental(trabalhadores=TRABALHADORES, formato="txt", regras=None, empacotar=False,
+                                instrumentacao=None):
+    manifesto = carregar_manifesto(formato, empacotar)
+    if manifesto is None:
+        # Sem manifesto válido não dá para saber quais partes são confiáveis
+        if os.path.exists(PASTA_DESTINO):
+            shutil.rmtree(PASTA_DESTINO)
+        grupos_anteriores = {}
+    else:
+        grupos_anteriores = manifesto["grupos"]
+    os.makedirs(PASTA_DESTINO, exist_ok=True)
+    
+    print(f"--- INICIANDO BACKUP ANDROID INCREMENTAL (Max {TAMANHO_MAX/1024:.0f}KB) ---")
+    
+    novos_grupos = {}
+    total_reconstruidos = 0
+    total_mantidos = 0
+    total_arquivos_lidos = 0
+    
+    # Sem total de arquivos no progresso: só se sabe quais grupos mudaram depois das assinaturas
+    itens = agrupar_por_nome(coletar_grupos(regras, instrumentacao))
+    tarefa = partial(backup_grupo_incremental, grupos_anteriores, formato, empacotar, instrumentacao)
+    for (nome_grupo, _), resultado in zip(itens, executar_grupos(tarefa, itens, trabalhadores)):
+        entrada, reconstruido, lidos, mensagens = resultado
+        for msg in mensagens:
+            print(msg)
+        novos_grupos[nome_grupo] = entrada
+        if reconstruido:
+            total_reconstruidos += 1
+        else:
+            total_mantidos += 1
+        total_arquivos_lidos += lidos
+    
+    # Pastas que deixaram de existir (ou ficaram vazias) perdem suas partes
+    for nome_grupo, anterior in grupos_anteriores.items():
+        if nome_grupo not in novos_grupos:
+            remover_partes(anterior["partes"])
+            print(f"🗑️  Grupo removido: {nome_grupo}")
+    
+    salvar_manifesto(novos_grupos, formato, empacotar)
+    if formato != "txt":
+        indice = {}
+        for entrada in novos_grupos.values():
+            indice.update(entrada.get("indice", {}))
+        salvar_indice(formato, indice)
+    if instrumentacao:
+        instrumentacao.finalizar()
+
+    print(f"\n--- CONCLUÍDO (INCREMENTAL) ---")
     print(f"Pasta de Destino: '{PASTA_DESTINO}'")
+    print(f"Grupos reconstruídos: {total_reconstruidos} | Grupos inalterados: {total_mantidos}")
     print(f"Arquivos de Código processados: {total_arquivos_lidos}")
-    print(f"Arquivos .txt gerados: {total_arquivos_gerados}")
 
-if __name__ == "__main__":
-    realizar_backup()
+def realizar_backup(trabalhadores=TRABALHADORES, formato="txt", regras=None, empacotar=False, instrumentacao=None):
+    # Prepara a pasta de destino
+    if os.path.exists(PASTA_DESTINO):
+        shutil.rmtree(PASTA_DESTINO)
+    os.makedirs(PASTA_DESTINO)
+    
+    print(f"--- INICIANDO BACKUP ANDROID (Max {TAMANHO_MAX/1024:.0f}KB) ---")
+    
+    total_arquivos_gerados = 0
+    total_arquivos_lidos = 0
+    
+    indice = {}
+    grupos = coletar_grupos(regras, instrumentacao)
+    if instrumentacao:
+        instrumentacao.total_arquivos = sum(len(arquivos) for _, arquivos in grupos)
+    itens = agrupar_por_nome(grupos)
+    tarefa = partial(backup_grupo_completo, formato, empacotar, instrumentacao)
+    for partes, lidos, indice_grupo, mensagens in executar_grupos(tarefa, itens, trabalhadores):
+        for msg in mensagens:
+            print(msg)
+        indice.update(indice_grupo)
+        total_arquivos_gerados += len(partes)
+        total_arquivos_lidos += lidos
+    
+    if formato != "txt":
+        salvar_indice(formato, indice)
+    if instrumentacao:
+        instrumentacao.finalizar()
+
+    print(f"\n--- CONCLUÍDO ---")
+    print(f"Pasta de Destino: '{PASTA_DESTINO}'")
+    print(f"Arquivos de Código processados: {total_arquivos_lidos}")
+    print(f"Arquivos {FORMATOS[formato]} gerados: {total_arquivos_gerados}")
 
+def imprimir_progresso(feitos, total, caminho_rel):
+    """Linha única no stderr, reescrita a cada arquivo (não se mistura com o log do stdout)."""
+    sys.stderr.write(f"\r   [{feitos}/{total if total is not None else '?'}] {caminho_rel[-60:]:<60}")
+    sys.stderr.flush()
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o backup em texto do projeto Android.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reconstrói só os grupos cujos arquivos mudaram (usa o manifesto em Backup_Android).")
+    parser.add_argument("--trabalhadores", type=int, default=TRABALHADORES,
+                        help=f"Pastas processadas em paralelo (padrão: {TRABALHADORES}; 1 = serial).")
+    parser.add_argument("--formato", choices=sorted(FORMATOS), default="txt",
+                        help="txt (padrão) ou partes compactadas gz/zst com índice lateral.")
+    parser.add_argument("--gitignore", action="store_true",
+                        help="Também respeita os .gitignore do projeto (e de subpastas).")
+    parser.add_argument("--excluir", action="append", default=[], metavar="PADRAO",
+                        help="Padrão no formato do .gitignore a excluir (pode repetir). Ex: 'app/src/test/'")
+    parser.add_argument("--incluir", action="append", default=[], metavar="PADRAO",
+                        help="Se usado, só entram arquivos que casem com algum destes padrões.")
+    parser.add_argument("--empacotar", action="store_true",
+                        help="Distribui os arquivos por first-fit decreasing (menos partes) e divide os maiores que TAMANHO_MAX.")
+    parser.add_argument("--relatorio", metavar="ARQUIVO.json",
+                        help="Grava tempos por fase/grupo, bytes e os arquivos mais lentos em JSON.")
+    parser.add_argument("--progresso", action="store_true",
+                        help="Mostra o andamento arquivo a arquivo no stderr.")
+    args = parser.parse_args()
+    regras = regras_padrao(args.excluir, args.incluir, args.gitignore)
+    
+    if args.formato == "zst" and zstandard is None:
+        parser.error("--formato zst requer o pacote 'zstandard' (pip install zstandard).")
+    
+    instrumentacao = None
+    if args.relatorio or args.progresso:
+        instrumentacao = Instrumentacao(imprimir_progresso if args.progresso else None)
+    
+    if args.incremental:
+        realizar_backup_incremental(args.trabalhadores, args.formato, regras, args.empacotar, instrumentacao)
+    else:
+        realizar_backup(args.trabalhadores, args.formato, regras, args.empacotar, instrumentacao)
+    
+    if args.progresso:
+        sys.stderr.write("\n")
+    if args.relatorio:
+        instrumentacao.salvar(args.relatorio)
+        print(f"Relatório de desempenho: '{args.relatorio}'")
@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: sem pico de RSS
+    resource = None
+
+import backup_android
+
+# ================= CONFIGURAÇÕES =================
+# Escalas prontas para a árvore sintética (podem ser ajustadas pela linha de comando)
+ESCALAS = {
+    "pequena": {"modulos": 2, "pacotes": 3, "arquivos_por_pacote": 15, "tamanho_medio_kb": 4,
+                "profundidade_res": 3, "binarios": 10, "arquivos_build": 50},
+    "media": {"modulos": 6, "pacotes": 8, "arquivos_por_pacote": 40, "tamanho_medio_kb": 6,
+              "profundidade_res": 4, "binarios": 60, "arquivos_build": 400},
+    "grande": {"modulos": 16, "pacotes": 12, "arquivos_por_pacote": 60, "tamanho_medio_kb": 8,
+               "profundidade_res": 6, "binarios": 200, "arquivos_build": 2000},
+}
+
+# Cada cenário é um conjunto de argumentos para realizar_backup();
+# "repetir" roda o backup duas vezes e mede só a segunda (incremental sem mudanças)
+CENARIOS = {
+    "serial": {"trabalhadores": 1},
+    "paralelo": {"trabalhadores": backup_android.TRABALHADORES},
+    "gz": {"trabalhadores": backup_android.TRABALHADORES, "formato": "gz"},
+    "empacotado": {"trabalhadores": backup_android.TRABALHADORES, "empacotar": True},
+    "incremental_sem_mudancas": {"trabalhadores": backup_android.TRABALHADORES, "incremental": True, "repetir": True},
+}
+
+# ================= ÁRVORE SINTÉTICA =================
+
+def texto_kotlin(rng, pacote, classe, tamanho):
+    linhas = [f"package {pacote}\n", "import android.os.Bundle\n", f"class {classe} {{\n"]
+    n = 0
+    while sum(map(len, linhas)) < tamanho:
+        n += 1
+        linhas.append(f"    fun metodo{n}(valor: Int): Int {{\n"
+                      f"        val texto = \"{classe}-{n}-ção\"\n"
+                      f"        return valor * {rng.randint(1, 999)} + texto.length\n    }}\n")
+    linhas.append("}\n")
+    return "".join(linhas)
+
+def texto_xml(rng, tamanho):
+    linhas = ['<?xml version="1.0" encoding="utf-8"?>\n', "<resources>\n"]
+    n = 0
+    while sum(map(len, linhas)) < tamanho:
+        n += 1
+        linhas.append(f'    <string name="texto_{n}">Valor {rng.randint(0, 10**6)}</string>\n')
+    linhas.append("</resources>\n")
+    return "".join(linhas)
+
+def gravar(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    modo = 'wb' if isinstance(conteudo, bytes) else 'w'
+    with open(caminho, modo, **({} if modo == 'wb' else {"encoding": "utf-8"})) as f:
+        f.write(conteudo)
+
+def gerar_arvore_sintetica(destino, modulos, pacotes, arquivos_por_pacote, tamanho_medio_kb,
+                           profundidade_res, binarios, arquivos_build, semente=42):
+    """Cria um projeto Android falso em `destino`. Retorna quantos arquivos entram no backup."""
+    rng = random.Random(semente)
+    tamanho_medio = tamanho_medio_kb * 1024
+    validos = 0
+
+    gravar(os.path.join(destino, "settings.gradle.kts"),
+           "".join(f'include(":modulo{m}")\n' for m in range(modulos)))
+    gravar(os.path.join(destino, "gradle.properties"), "org.gradle.jvmargs=-Xmx2048m\n")
+    validos += 2
+    # Caches da raiz que o walker nunca deve visitar
+    for i in range(arquivos_build // 4):
+        gravar(os.path.join(destino, ".gradle", "caches", f"c{i // 50}", f"cache{i}.json"), "{}\n" * 100)
+
+    for m in range(modulos):
+        modulo = os.path.join(destino, f"modulo{m}")
+        gravar(os.path.join(modulo, "build.gradle.kts"), 'android {\n    versionCode = 1\n    versionName = "1.0"\n}\n')
+        gravar(os.path.join(modulo, "src", "main", "AndroidManifest.xml"), texto_xml(rng, 2048))
+        validos += 2
+
+        for p in range(pacotes):
+            nome_pacote = f"com.exemplo.modulo{m}.pacote{p}"
+            pasta = os.path.join(modulo, "src", "main", "java", *nome_pacote.split("."))
+            for a in range(arquivos_por_pacote):
+                tamanho = max(200, int(rng.expovariate(1 / tamanho_medio)))
+                classe = f"Classe{a}"
+                gravar(os.path.join(pasta, f"{classe}.kt"), texto_kotlin(rng, nome_pacote, classe, tamanho))
+                validos += 1
+
+        # res/ profundo: values, layout e uma hierarquia aninhada de raw/
+        gravar(os.path.join(modulo, "src", "main", "res", "values", "strings.xml"), texto_xml(rng, tamanho_medio))
+        validos += 1
+        for l in range(pacotes):
+            gravar(os.path.join(modulo, "src", "main", "res", "layout", f"tela_{l}.xml"), texto_xml(rng, tamanho_medio // 2))
+            validos += 1
+        pasta_raw = os.path.join(modulo, "src", "main", "res", "raw")
+        for nivel in range(profundidade_res):
+            pasta_raw = os.path.join(pasta_raw, f"nivel{nivel}")
+            gravar(os.path.join(pasta_raw, f"dados{nivel}.json"), '{"k": 1}\n' * (tamanho_medio // 10))
+            validos += 1
+
+        # Binários que devem ser pulados
+        for b in range(binarios // modulos):
+            gravar(os.path.join(modulo, "src", "main", "res", "drawable", f"img_{b}.png"), rng.randbytes(4096))
+        gravar(os.path.join(modulo, "release.keystore"), rng.randbytes(2048))
+
+        # build/ gerado: muitos arquivos com extensões válidas, todos ignorados
+        for i in range(arquivos_build // modulos):
+            gravar(os.path.join(modulo, "build", "intermediates", f"lote{i // 100}", f"Gerado{i}.kt"),
+                   texto_kotlin(rng, "gerado", f"Gerado{i}", 1024))
+    return validos
+
+# ================= MEDIÇÃO (PROCESSO FILHO) =================
+
+def contadores_io():
+    """Chamadas read/write do processo (Linux /proc/self/io), ou None se indisponível."""
+    try:
+        with open("/proc/self/io", 'r') as f:
+            dados = dict(linha.split(": ") for linha in f.read().splitlines())
+        return {"syscr": int(dados["syscr"]), "syscw": int(dados["syscw"])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def pico_rss_kb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico  # macOS informa em bytes
+
+def medir_cenario(arvore, nome):
+    """Roda um cenário dentro de `arvore` e devolve as métricas. Executado em processo próprio
+    para que o pico de RSS e os contadores de syscalls sejam só deste cenário."""
+    opcoes = dict(CENARIOS[nome])
+    incremental = opcoes.pop("incremental", False)
+    repetir = opcoes.pop("repetir", False)
+    os.chdir(arvore)
+
+    # Conta aberturas de arquivo e listagens de pasta feitas pelo Python
+    eventos = {"open": 0, "os.scandir": 0, "os.listdir": 0}
+    def auditoria(evento, _):
+        if evento in eventos:
+            eventos[evento] += 1
+
+    funcao = backup_android.realizar_backup_incremental if incremental else backup_android.realizar_backup
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        if repetir:
+            funcao(**opcoes)
+        io_antes = contadores_io()
+        sys.addaudithook(auditoria)
+        inicio = time.perf_counter()
+        funcao(**opcoes)
+        duracao = time.perf_counter() - inicio
+    io_depois = contadores_io()
+    # Auditoria não pode ser removida; desliga a contagem daqui em diante
+    contagem = dict(eventos)
+    eventos.clear()
+
+    arquivos = [a for _, lista in backup_android.coletar_grupos() for a in lista]
+    bytes_entrada = sum(os.path.getsize(a) for a in arquivos)
+    bytes_saida = sum(e.stat().st_size for e in os.scandir(backup_android.PASTA_DESTINO)
+                      if e.name.startswith("android_"))
+    return {
+        "cenario": nome,
+        "segundos": round(duracao, 4),
+        "arquivos": len(arquivos),
+        "arquivos_por_s": round(len(arquivos) / duracao, 1) if duracao else None,
+        "mb_por_s": round(bytes_entrada / 1e6 / duracao, 2) if duracao else None,
+        "bytes_entrada": bytes_entrada,
+        "bytes_saida": bytes_saida,
+        "pico_rss_kb": pico_rss_kb(),
+        "syscalls": ({k: io_depois[k] - io_antes[k] for k in io_depois} if io_antes and io_depois else None),
+        "aberturas": contagem["open"],
+        "listagens": contagem["os.scandir"] + contagem["os.listdir"],
+    }
+
+# ================= ORQUESTRAÇÃO =================
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def executar_benchmark(parametros, cenarios, repeticoes=1):
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="bench_backup_") as temporaria:
+        arvore = os.path.join(temporaria, "projeto")
+        inicio = time.perf_counter()
+        validos = gerar_arvore_sintetica(arvore, **parametros)
+        print(f"Árvore sintética: {validos} arquivos válidos em {time.perf_counter() - inicio:.1f}s")
+
+        for nome in cenarios:
+            for rodada in range(repeticoes):
+                shutil.rmtree(os.path.join(arvore, backup_android.PASTA_DESTINO), ignore_errors=True)
+                filho = subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", nome, "--arvore", arvore],
+                                       capture_output=True, text=True, check=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)))
+                metricas = json.loads(filho.stdout)
+                metricas["rodada"] = rodada + 1
+                resultados.append(metricas)
+                print(f"  {nome:<26} {metricas['segundos']:8.3f}s  {metricas['arquivos_por_s']:>9} arq/s  "
+                      f"{metricas['mb_por_s']:>7} MB/s  RSS {metricas['pico_rss_kb']} KB")
+    return resultados
+
+def comparar(anterior, atual):
+    """Imprime a variação de tempo por cenário entre dois relatórios JSON."""
+    def tempos(relatorio):
+        melhores = {}
+        for r in relatorio["resultados"]:
+            melhores[r["cenario"]] = min(melhores.get(r["cenario"], float("inf")), r["segundos"])
+        return melhores
+    antes, depois = tempos(anterior), tempos(atual)
+    print(f"\nComparação {anterior.get('commit')} -> {atual.get('commit')} (melhor rodada):")
+    for cenario in depois:
+        if cenario in antes and antes[cenario]:
+            variacao = (depois[cenario] - antes[cenario]) / antes[cenario] * 100
+            print(f"  {cenario:<26} {antes[cenario]:8.3f}s -> {depois[cenario]:8.3f}s  ({variacao:+.1f}%)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do backup_android.py numa árvore Android sintética.")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="media")
+    for chave in ESCALAS["media"]:
+        parser.add_argument(f"--{chave.replace('_', '-')}", dest=chave, type=int, help="Sobrescreve a escala.")
+    parser.add_argument("--cenario", action="append", choices=sorted(CENARIOS),
+                        help="Cenário a medir (pode repetir; padrão: todos).")
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--saida", default="benchmark_backup.json", help="Relatório JSON.")
+    parser.add_argument("--comparar-com", metavar="JSON", help="Relatório anterior para comparação.")
+    parser.add_argument("--medir", help=argparse.SUPPRESS)
+    parser.add_argument("--arvore", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        # Processo filho: mede um cenário e devolve as métricas em JSON no stdout
+        print(json.dumps(medir_cenario(args.arvore, args.medir)))
+        sys.exit(0)
+
+    parametros = dict(ESCALAS[args.escala])
+    parametros.update({k: v for k, v in vars(args).items() if k in parametros and v is not None})
+    cenarios = args.cenario or list(CENARIOS)
+
+    print(f"--- BENCHMARK DO BACKUP (escala {args.escala}) ---")
+    resultados = executar_benchmark(parametros, cenarios, args.repeticoes)
+    relatorio = {"commit": commit_atual(), "data": datetime.now().isoformat(timespec="seconds"),
+                 "python": sys.version.split()[0], "parametros": parametros, "resultados": resultados}
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, indent=1)
+    print(f"Relatório salvo em '{args.saida}'")
+
+    if args.comparar_com:
+        with open(args.comparar_com, 'r', encoding='utf-8') as f:
+            comparar(json.load(f), relatorio)
@@ -1,14 +1,18 @@
 import os
-import shutil
-import subprocess
 import re
+import sys
+import difflib
+import argparse
 from datetime import datetime
 
+from pipeline_git import publicar
+from rotacao_backup import RepositorioBackup
+
 # ==============================================================================
 # CONFIGURAÇÕES
 # ==============================================================================
 PROJETO = "MotoristaPro-Android"
-ARQUIVO_ALVO = "app/build.gradle.kts"
+ARQUIVO_ALVO = "app/build.gradle.kts"  # Usado só quando não há settings.gradle(.kts)
 # Este arquivo oculto servirá de "memória" para o script saber se já rodou antes
 ARQUIVO_RASTREADOR = ".version_tracker" 
 PASTA_BACKUP = "backup_automatico"
@@ -20,55 +24,150 @@ PASTA_BACKUP = "backup_automatico"
 def log(msg, cor="36"): # 36 = Cyan
     print(f"\033[{cor}m[{PROJETO}] {msg}\033[0m")
 
-def criar_backup(arquivo):
-    if not os.path.exists(PASTA_BACKUP):
-        os.makedirs(PASTA_BACKUP)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    nome_orig = os.path.basename(arquivo)
-    destino = os.path.join(PASTA_BACKUP, f"{nome_orig}_{timestamp}.bak")
-    
-    if os.path.exists(arquivo):
-        shutil.copy2(arquivo, destino)
-        log(f"Backup salvo em: {destino}")
+def criar_backup(arquivo, versao=None):
+    # Repositório com deduplicação e retenção (ver rotacao_backup.py)
+    entrada = RepositorioBackup(PASTA_BACKUP).adicionar(arquivo, versao)
+    log(f"Backup salvo: {entrada['id']} (restaurar: python rotacao_backup.py restaurar {versao or entrada['id']})")
+
+def git_automacao(mensagem, arquivos):
+    log("Executando Git Push...", "33") # Amarelo
+    # Só os build.gradle alterados e o .version_tracker (para persistir o estado)
+    publicar(list(arquivos) + [ARQUIVO_RASTREADOR], mensagem)
 
-def git_automacao(mensagem):
+# ==============================================================================
+# LEITURA DOS MÓDULOS E DAS VERSÕES
+# ==============================================================================
+# Os módulos vêm do settings.gradle(.kts); em cada build.gradle(.kts) uma única
+# passada do TOKENS encontra todos os versionCode/versionName (defaultConfig e
+# productFlavors), pulando comentários e strings que só mencionem os nomes.
+
+ARQUIVOS_SETTINGS = ("settings.gradle.kts", "settings.gradle")
+ARQUIVOS_BUILD = ("build.gradle.kts", "build.gradle")
+
+PADRAO_INCLUDE = re.compile(r'\binclude\s*\(?((?:\s*,?\s*["\'][^"\']+["\'])+)\s*\)?')
+PADRAO_MODULO = re.compile(r'["\']([^"\']+)["\']')
+PADRAO_PROJECT_DIR = re.compile(r'project\(\s*["\']([^"\']+)["\']\s*\)\.projectDir\s*=\s*(?:file\(\s*)?["\']([^"\']+)["\']')
+TOKENS = re.compile(
+    r'(?P<comentario>//[^\n]*|/\*.*?\*/)'
+    r'|(?P<code>\bversionCode\b\s*=?\s*)(?P<code_valor>\d+)'
+    r'|(?P<name>\bversionName\b\s*=?\s*")(?P<name_valor>[^"\n]*)"'
+    r'|"(?:\\.|[^"\\\n])*"',
+    re.S)
+
+def sem_comentarios(texto):
+    return re.sub(r'//[^\n]*|/\*.*?\*/', '', texto, flags=re.S)
+
+def descobrir_modulos(raiz="."):
+    """Lista (módulo, build.gradle) na ordem do settings; sem settings, só o app."""
+    settings = next((os.path.join(raiz, n) for n in ARQUIVOS_SETTINGS if os.path.exists(os.path.join(raiz, n))), None)
+    if settings is None:
+        return [(":app", ARQUIVO_ALVO)]
+    with open(settings, 'r', encoding='utf-8') as f:
+        conteudo = sem_comentarios(f.read())
+    pastas = {modulo: pasta for modulo, pasta in PADRAO_PROJECT_DIR.findall(conteudo)}
+    modulos = []
+    for m in PADRAO_INCLUDE.finditer(conteudo):
+        for modulo in PADRAO_MODULO.findall(m.group(1)):
+            modulo = modulo if modulo.startswith(":") else ":" + modulo
+            if modulo in (mod for mod, _ in modulos):
+                continue
+            pasta = pastas.get(modulo, modulo.strip(":").replace(":", "/"))
+            build = next((os.path.join(pasta, n) for n in ARQUIVOS_BUILD
+                          if os.path.exists(os.path.join(raiz, pasta, n))), None)
+            if build:
+                modulos.append((modulo, build))
+    return modulos
+
+def ler_versoes(conteudo):
+    """Uma passada pelo arquivo: listas de (inicio, fim, valor) de versionCode e versionName."""
+    codes, names = [], []
+    for m in TOKENS.finditer(conteudo):
+        if m.group("code"):
+            codes.append((m.start("code_valor"), m.end("code_valor"), int(m.group("code_valor"))))
+        elif m.group("name"):
+            names.append((m.start("name_valor"), m.end("name_valor"), m.group("name_valor")))
+    return codes, names
+
+def incrementar_nome(name_atual):
+    """1.0 -> 1.1; nomes sem número final ganham ".1"."""
+    try:
+        # Tenta incrementar o último número após o ponto
+        partes = name_atual.split('.')
+        ultimo = int(partes[-1])
+        partes[-1] = str(ultimo + 1)
+        return ".".join(partes)
+    except ValueError:
+        return f"{name_atual}.1"
+
+def trocas_versao(codes, names, novo_code=None, novo_name=None):
+    """(inicio, fim, novo texto) de cada valor. Sem novo_code/novo_name, cada versionCode e
+    versionName (defaultConfig e cada flavor) sobe a partir do próprio valor."""
+    trocas = [(ini, fim, str(novo_code if novo_code is not None else v + 1)) for ini, fim, v in codes]
+    trocas += [(ini, fim, novo_name if novo_name is not None else incrementar_nome(v)) for ini, fim, v in names]
+    return trocas
+
+def aplicar_versoes(conteudo, trocas):
+    """Remonta o texto trocando só os trechos dos valores."""
+    pedacos = []
+    anterior = 0
+    for ini, fim, valor in sorted(trocas):
+        pedacos.append(conteudo[anterior:ini])
+        pedacos.append(valor)
+        anterior = fim
+    pedacos.append(conteudo[anterior:])
+    return "".join(pedacos)
+
+def gravar_todos(plano):
+    """Grava todos os arquivos ou nenhum ({arquivo: (original, novo)}): .tmp primeiro,
+    depois renomeia; em falha desfaz os já trocados (como o gravar_transacao do motor_patches)."""
+    temporarios = []
     try:
-        log("Executando Git Push...", "33") # Amarelo
-        # Adiciona tudo, inclusive o .version_tracker para persistir o estado
-        subprocess.run(["git", "add", "."], check=True)
-        subprocess.run(["git", "commit", "-m", mensagem], check=True)
-        subprocess.run(["git", "push"], check=True)
-        log("Git Push realizado com sucesso!", "32") # Verde
-    except Exception as e:
-        log(f"Erro no Git: {e}", "31") # Vermelho
+        for arquivo, (_, novo) in plano.items():
+            temporario = arquivo + ".tmp"
+            with open(temporario, 'w', encoding='utf-8', newline='') as f:
+                f.write(novo)
+            temporarios.append((temporario, arquivo))
+        trocados = []
+        try:
+            for temporario, arquivo in temporarios:
+                os.replace(temporario, arquivo)
+                trocados.append(arquivo)
+        except OSError:
+            for arquivo in trocados:
+                with open(arquivo, 'w', encoding='utf-8', newline='') as f:
+                    f.write(plano[arquivo][0])
+            raise
+    finally:
+        for temporario, _ in temporarios:
+            if os.path.exists(temporario):
+                os.remove(temporario)
 
 # ==============================================================================
 # LÓGICA PRINCIPAL
 # ==============================================================================
 
-def atualizar_versao():
-    if not os.path.exists(ARQUIVO_ALVO):
-        log(f"Arquivo não encontrado: {ARQUIVO_ALVO}", "31")
-        return
-
-    # 1. Realizar Backup antes de mexer
-    criar_backup(ARQUIVO_ALVO)
-
-    # 2. Ler o arquivo gradle
-    with open(ARQUIVO_ALVO, 'r', encoding='utf-8') as f:
-        conteudo = f.read()
-
-    # Regex para encontrar os valores
-    padrao_code = r'(versionCode\s*=\s*)(\d+)'
-    padrao_name = r'(versionName\s*=\s*")([^"]+)(")'
-
-    # 3. Verificar se é a PRIMEIRA VEZ
+def atualizar_versao(simular=False, versao_unica=False):
+    """Sobe a versão de todos os módulos de uma vez. Retorna (mensagem de commit, arquivos alterados).
+
+    Cada módulo (e cada flavor) sobe a partir da própria versão; com versao_unica=True
+    todos saem com a mesma. Com simular=True só mostra o diff e retorna (None, []).
+    """
+    modulos = descobrir_modulos()
+    arquivos = {}
+    for modulo, build in modulos:
+        # newline='' preserva CRLF; o diff e a gravação mexem só nos números
+        with open(build, 'r', encoding='utf-8', newline='') as f:
+            conteudo = f.read()
+        codes, names = ler_versoes(conteudo)
+        if codes or names:
+            arquivos[build] = (modulo, conteudo, codes, names)
+
+    if not arquivos:
+        log(f"Nenhum versionCode/versionName encontrado nos módulos: {[m for m, _ in modulos]}", "31")
+        return None, []
+
+    # 1. Verificar se é a PRIMEIRA VEZ
     primeira_vez = not os.path.exists(ARQUIVO_RASTREADOR)
-    
-    novo_code = 0
-    novo_name = ""
-    msg_commit = ""
 
     if primeira_vez:
         log("--- PRIMEIRA EXECUÇÃO DETECTADA ---", "35") # Magenta
@@ -77,56 +176,78 @@ def atualizar_versao():
         novo_code = 1
         novo_name = "1.0"
         msg_commit = "Reset de Versao (Play Protect Fix) - v1.0"
-        
-        # Cria o arquivo rastreador para a próxima vez saber que não é a primeira
-        with open(ARQUIVO_RASTREADOR, 'w') as f:
-            f.write(f"Iniciado em: {datetime.now()}\n")
-            f.write("NÃO APAGUE ESTE ARQUIVO SE QUISER MANTER A CONTAGEM SEQUENCIAL.")
-            
-    else:
+    elif not versao_unica:
         log("--- EXECUÇÃO RECORRENTE ---", "35")
+        # Cada versionCode/versionName sobe a partir do próprio valor
+        novo_code = novo_name = None
+        novos = [(modulo, codes[0][2] + 1) for modulo, _, codes, _ in arquivos.values() if codes]
+        log(f"Subindo a versão de {len(arquivos)} módulo(s): {', '.join(f'{m} {c}' for m, c in novos)}")
+        if len(novos) == 1:
+            msg_commit = f"Bump version code: {novos[0][1]}"
+        elif novos:
+            msg_commit = "Bump version codes: " + ", ".join(f"{m} {c}" for m, c in novos)
+        else:
+            msg_commit = "Bump version name"
+    else:
+        log("--- EXECUÇÃO RECORRENTE (VERSÃO ÚNICA) ---", "35")
         
-        # Pega o código atual no arquivo
-        match_code = re.search(padrao_code, conteudo)
-        if match_code:
-            code_atual = int(match_code.group(2))
-            novo_code = code_atual + 1
+        # Todos os módulos saem com a mesma versão: o maior versionCode + 1 e o
+        # versionName do primeiro módulo (na ordem do settings) incrementado
+        todos_codes = [v for _, _, codes, _ in arquivos.values() for _, _, v in codes]
+        todos_names = [v for _, _, _, names in arquivos.values() for _, _, v in names]
+        if todos_codes:
+            novo_code = max(todos_codes) + 1
         else:
             log("Não foi possível ler o versionCode atual. Forçando 1.", "31")
             novo_code = 1
-
-        # Lógica para o nome da versão (ex: 1.0 -> 1.1)
-        match_name = re.search(padrao_name, conteudo)
-        if match_name:
-            name_atual = match_name.group(2)
-            try:
-                # Tenta incrementar o último número após o ponto
-                partes = name_atual.split('.')
-                ultimo = int(partes[-1])
-                partes[-1] = str(ultimo + 1)
-                novo_name = ".".join(partes)
-            except:
-                novo_name = f"{name_atual}.1"
-        else:
-            novo_name = "1.0"
+        novo_name = incrementar_nome(todos_names[0]) if todos_names else "1.0"
             
-        log(f"Subindo versão: {novo_code} ({novo_name})")
+        log(f"Subindo versão: {novo_code} ({novo_name}) em {len(arquivos)} módulo(s)")
         msg_commit = f"Bump version code: {novo_code}"
 
-    # 4. Aplicar alterações no texto
-    novo_conteudo = re.sub(padrao_code, fr'\g<1>{novo_code}', conteudo)
-    novo_conteudo = re.sub(padrao_name, fr'\g<1>{novo_name}\g<3>', novo_conteudo)
+    # 2. Montar o novo texto de cada módulo
+    plano = {}
+    for build, (modulo, conteudo, codes, names) in arquivos.items():
+        novo_conteudo = aplicar_versoes(conteudo, trocas_versao(codes, names, novo_code, novo_name))
+        if novo_conteudo != conteudo:
+            plano[build] = (conteudo, novo_conteudo)
+
+    if simular:
+        for build, (conteudo, novo_conteudo) in plano.items():
+            diff = difflib.unified_diff(conteudo.splitlines(True), novo_conteudo.splitlines(True),
+                                        f"a/{build}", f"b/{build}")
+            sys.stdout.writelines(diff)
+        log(f"Simulação: {len(plano)} arquivo(s) seriam alterados. Nada foi gravado.", "33")
+        return None, []
+
+    # 3. Realizar Backup antes de mexer (etiquetado com a versão que está saindo)
+    for build in plano:
+        _, _, codes, names = arquivos[build]
+        criar_backup(build, str(codes[0][2]) if codes else names[0][2])
+
+    # 4. Salvar todos os arquivos juntos
+    gravar_todos(plano)
 
-    # 5. Salvar arquivo
-    with open(ARQUIVO_ALVO, 'w', encoding='utf-8') as f:
-        f.write(novo_conteudo)
+    if primeira_vez:
+        # Cria o arquivo rastreador para a próxima vez saber que não é a primeira
+        with open(ARQUIVO_RASTREADOR, 'w') as f:
+            f.write(f"Iniciado em: {datetime.now()}\n")
+            f.write("NÃO APAGUE ESTE ARQUIVO SE QUISER MANTER A CONTAGEM SEQUENCIAL.")
         
-    return msg_commit
+    return msg_commit, list(plano)
 
 if __name__ == "__main__":
-    msg = atualizar_versao()
+    parser = argparse.ArgumentParser(description="Sobe versionCode/versionName de todos os módulos e faz o push.")
+    parser.add_argument("--simular", action="store_true",
+                        help="Só mostra o diff planejado; não grava, não cria backup nem faz commit.")
+    parser.add_argument("--versao-unica", action="store_true",
+                        help="Todos os módulos saem com a mesma versão (maior versionCode + 1 e o "
+                             "versionName do primeiro módulo incrementado).")
+    args = parser.parse_args()
+
+    msg, arquivos = atualizar_versao(args.simular, args.versao_unica)
     if msg:
-        git_automacao(msg)
+        git_automacao(msg, arquivos)
     
     log("Processo finalizado. O script foi mantido.", "32")
 
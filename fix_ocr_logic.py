@@ -1,4 +1,4 @@
-import os
+from motor_patches import executar, executar_script
 
 PROJETO = "MotoristaPro-Android"
 ARQUIVO_ALVO = "app/src/main/java/com/motoristapro/android/OcrService.kt"
@@ -168,37 +168,17 @@ NOVA_LOGICA = r"""
     }
 """
 
-def log(msg): print(f"\033[36m[{PROJETO}] {msg}\033[0m")
-
-def aplicar():
-    if not os.path.exists(ARQUIVO_ALVO):
-        log("Arquivo OcrService.kt não encontrado.")
-        return
-
-    with open(ARQUIVO_ALVO, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Substitui o método analyzeSmartData inteiro
-    import re
-    pattern = r'private fun analyzeSmartData.*?private fun showCard'
-    
-    match = re.search(pattern, content, re.DOTALL)
-    if match:
-        new_content = content.replace(match.group(0), NOVA_LOGICA.strip() + "\n\n    private fun showCard")
-        
-        with open(ARQUIVO_ALVO, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        
-        log("Lógica OCR atualizada: Filtro de Logs e Soma Inteligente aplicados.")
-        
-        # Git Push
-        os.system("git add .")
-        os.system('git commit -m "Fix: OCR lendo logs proprios e duplicando valores"')
-        os.system("git push")
-    else:
-        log("Erro ao localizar o bloco de código para substituição.")
-
-if __name__ == "__main__":
-    aplicar()
+# Substitui o método analyzeSmartData inteiro
+PATCHES = [
+    {"arquivo": ARQUIVO_ALVO,
+     "descricao": "Lógica OCR atualizada: Filtro de Logs e Soma Inteligente aplicados.",
+     "funcao": "analyzeSmartData",
+     "novo": NOVA_LOGICA.strip()},
+]
+MENSAGEM = "Fix: OCR lendo logs proprios e duplicando valores"
 
+def aplicar(simular=False):
+    return executar(PATCHES, [MENSAGEM], simular)
 
+if __name__ == "__main__":
+    executar_script(PATCHES, MENSAGEM)
@@ -0,0 +1,115 @@
+import json
+import heapq
+import threading
+import time
+from datetime import datetime
+
+# ==============================================================================
+# INSTRUMENTAÇÃO DO BACKUP
+# ==============================================================================
+# Acumula tempos por fase e por grupo, bytes lidos/gravados e os arquivos mais
+# lentos de uma execução do backup_android.py. Os grupos podem rodar em threads,
+# então cada arquivo é medido localmente e somado aqui uma única vez, sob trava.
+#
+# Fases:
+#   varredura     os.walk (listagem de pastas)
+#   filtro        regras de inclusão/exclusão
+#   assinatura    hash dos arquivos no modo incremental
+#   leitura       read() dos arquivos de origem (disco)
+#   decodificacao utf-8 com errors='ignore' + quebras de linha universais
+#   codificacao   str -> bytes utf-8
+#   compressao    gz/zst (só nos formatos compactados)
+#   escrita       write() nas partes
+#
+# Os tempos das fases são somados entre threads: com --trabalhadores > 1 a soma
+# pode passar do tempo total de parede.
+
+FASES = ("varredura", "filtro", "assinatura", "leitura", "decodificacao", "codificacao", "compressao", "escrita")
+
+def novos_tempos():
+    """Acumulador local de um arquivo (ou de uma etapa) para depois somar na Instrumentacao."""
+    tempos = dict.fromkeys(FASES, 0.0)
+    tempos["bytes_lidos"] = 0
+    return tempos
+
+class Instrumentacao:
+
+    def __init__(self, ao_progredir=None, quantidade_lentos=10):
+        """`ao_progredir(feitos, total, caminho_rel)` é chamado após cada arquivo, a partir
+        das threads de trabalho; `total` é None até o fim da varredura."""
+        self.ao_progredir = ao_progredir
+        self.quantidade_lentos = quantidade_lentos
+        self.trava = threading.Lock()
+        self.inicio = time.perf_counter()
+        self.data_inicio = datetime.now().isoformat(timespec="seconds")
+        self.fim = None
+        self.fases = dict.fromkeys(FASES, 0.0)
+        self.grupos = {}
+        self.lentos = []  # heap mínimo de (segundos, caminho, bytes)
+        self.total_arquivos = None
+        self.arquivos = 0
+        self.bytes_entrada = 0
+        self.bytes_saida = 0
+
+    def somar_fases(self, **tempos):
+        with self.trava:
+            for fase, segundos in tempos.items():
+                self.fases[fase] += segundos
+
+    def registrar_arquivo(self, grupo, caminho_rel, tempos, bytes_saida):
+        """Soma as medições de um arquivo já gravado."""
+        segundos = sum(tempos[fase] for fase in FASES)
+        with self.trava:
+            for fase in FASES:
+                self.fases[fase] += tempos[fase]
+            dados = self.dados_grupo(grupo)
+            dados["arquivos"] += 1
+            dados["bytes_entrada"] += tempos["bytes_lidos"]
+            dados["bytes_saida"] += bytes_saida
+            self.arquivos += 1
+            self.bytes_entrada += tempos["bytes_lidos"]
+            self.bytes_saida += bytes_saida
+            item = (segundos, caminho_rel, tempos["bytes_lidos"])
+            if len(self.lentos) < self.quantidade_lentos:
+                heapq.heappush(self.lentos, item)
+            else:
+                heapq.heappushpop(self.lentos, item)
+            feitos, total = self.arquivos, self.total_arquivos
+        if self.ao_progredir:
+            self.ao_progredir(feitos, total, caminho_rel)
+
+    def registrar_grupo(self, grupo, partes, segundos):
+        """Tempo de parede e partes geradas de um grupo inteiro."""
+        with self.trava:
+            dados = self.dados_grupo(grupo)
+            dados["partes"] += partes
+            dados["segundos"] += segundos
+
+    def dados_grupo(self, grupo):
+        # Chamar com a trava já adquirida
+        return self.grupos.setdefault(grupo, {"segundos": 0.0, "arquivos": 0, "bytes_entrada": 0,
+                                              "bytes_saida": 0, "partes": 0})
+
+    def finalizar(self):
+        self.fim = time.perf_counter()
+
+    def relatorio(self):
+        with self.trava:
+            total = (self.fim or time.perf_counter()) - self.inicio
+            return {
+                "inicio": self.data_inicio,
+                "segundos_total": round(total, 6),
+                "arquivos": self.arquivos,
+                "bytes_entrada": self.bytes_entrada,
+                "bytes_saida": self.bytes_saida,
+                "mb_por_s": round(self.bytes_entrada / 1e6 / total, 3) if total else None,
+                "fases": {fase: round(segundos, 6) for fase, segundos in self.fases.items()},
+                "grupos": [dict(nome=nome, **{k: round(v, 6) if isinstance(v, float) else v for k, v in dados.items()})
+                           for nome, dados in sorted(self.grupos.items(), key=lambda g: -g[1]["segundos"])],
+                "arquivos_mais_lentos": [{"caminho": c, "segundos": round(s, 6), "bytes": b}
+                                         for s, c, b in sorted(self.lentos, reverse=True)],
+            }
+
+    def salvar(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.relatorio(), f, indent=1, ensure_ascii=False)
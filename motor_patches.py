@@ -0,0 +1,210 @@
+import os
+import re
+import sys
+import difflib
+import argparse
+import importlib
+
+import scanner_kotlin
+from pipeline_git import enfileirar, publicar, arquivo_interno
+
+# ==============================================================================
+# MOTOR DE PATCHES
+# ==============================================================================
+# Aplica patches declarativos nos fontes do app como uma transação: cada arquivo
+# é lido uma vez, todos os patches são localizados no texto original e o novo
+# conteúdo é montado de uma vez só; no fim ou todos os arquivos são gravados
+# ou nenhum é.
+#
+# Um patch é um dict:
+#   {"arquivo": "app/src/.../OcrService.kt",
+#    "descricao": "Nova analyzeSmartData",
+#    # Um dos localizadores:
+#    "funcao": "analyzeSmartData",
+#    #   troca a declaração inteira da fun (modificadores até a "}" do corpo)
+#    "bloco": "if (!Settings.canDrawOverlays(this))",
+#    #   troca o bloco com esse cabeçalho, do "if" até a "}" correspondente
+#    "inicio": "private fun analyzeSmartData", "ate": "private fun showCard",
+#    #   troca de `inicio` (incluso) até `ate` (excluso)
+#    "regex": r"if \(!Settings\.canDrawOverlays\(this\)\) \{[\s\S]*?return\s+}",
+#    #   troca o primeiro trecho que casar (re.DOTALL)
+#    "novo": "texto que entra no lugar"}
+#
+# "funcao" e "bloco" usam o scanner_kotlin (chaves, strings e comentários), então
+# não dependem da ordem das funções no arquivo; o cabeçalho de "bloco" é comparado
+# com os espaços normalizados. Mais de um trecho encontrado é erro (ambíguo).
+#
+# Patch cujo "novo" já está no arquivo (e o localizador não acha mais nada) é
+# considerado já aplicado e pulado, então rodar o mesmo script duas vezes é seguro.
+
+PROJETO = "MotoristaPro-Android"
+# Índices do scanner_kotlin entre execuções, no diretório do Git
+ARQUIVO_CACHE_INDICES = "scanner_kotlin_cache.json"
+
+class ErroPatch(Exception):
+    pass
+
+def log(msg, cor="36"):
+    print(f"\033[{cor}m[{PROJETO}] {msg}\033[0m")
+
+_compilados = {}
+
+def compilar(patch):
+    """Regex do localizador, compilada uma vez por patch (patches iguais compartilham)."""
+    if "regex" in patch:
+        chave = ("regex", patch["regex"])
+        fonte = patch["regex"]
+    else:
+        chave = ("ate", patch["inicio"], patch["ate"])
+        fonte = re.escape(patch["inicio"]) + ".*?(?=" + re.escape(patch["ate"]) + ")"
+    if chave not in _compilados:
+        _compilados[chave] = re.compile(fonte, re.DOTALL)
+    return _compilados[chave]
+
+def localizar(texto, patch):
+    """(inicio, fim) do trecho a trocar, None se já aplicado; ErroPatch se não achar nada."""
+    if "funcao" in patch or "bloco" in patch:
+        if "funcao" in patch:
+            spans = scanner_kotlin.localizar_funcao(texto, patch["funcao"])
+        else:
+            spans = scanner_kotlin.localizar_bloco(texto, patch["bloco"])
+        if len(spans) > 1:
+            raise ErroPatch(f"{patch['arquivo']}: '{patch.get('descricao', '?')}' é ambíguo ({len(spans)} trechos)")
+        if spans:
+            return spans[0]
+    else:
+        m = compilar(patch).search(texto)
+        if m:
+            return m.span()
+    if patch["novo"] in texto:
+        return None
+    raise ErroPatch(f"{patch['arquivo']}: trecho de '{patch.get('descricao', '?')}' não encontrado")
+
+def montar(texto, patches):
+    """Aplica os patches de um arquivo sobre o texto original. Retorna (novo_texto, descrições aplicadas)."""
+    trocas = []
+    for patch in patches:
+        trecho = localizar(texto, patch)
+        if trecho is None or texto[trecho[0]:trecho[1]] == patch["novo"]:
+            continue
+        trocas.append((trecho[0], trecho[1], patch))
+    trocas.sort(key=lambda t: t[0])
+    for (_, fim_a, a), (ini_b, _, b) in zip(trocas, trocas[1:]):
+        if ini_b < fim_a:
+            raise ErroPatch(f"{a['arquivo']}: '{a.get('descricao', '?')}' e '{b.get('descricao', '?')}' "
+                            f"mexem no mesmo trecho")
+    pedacos = []
+    anterior = 0
+    for ini, fim, patch in trocas:
+        pedacos.append(texto[anterior:ini])
+        pedacos.append(patch["novo"])
+        anterior = fim
+    pedacos.append(texto[anterior:])
+    return "".join(pedacos), [patch.get("descricao", "?") for _, _, patch in trocas]
+
+def planejar(patches):
+    """Lê cada arquivo uma vez e calcula o resultado. Retorna {arquivo: (original, novo, descrições)}."""
+    por_arquivo = {}
+    for patch in patches:
+        por_arquivo.setdefault(patch["arquivo"], []).append(patch)
+    plano = {}
+    cache = None
+    mudou = False
+    for arquivo, patches_arquivo in por_arquivo.items():
+        if not os.path.exists(arquivo):
+            raise ErroPatch(f"arquivo não encontrado: {arquivo}")
+        # newline='' preserva CRLF do fonte
+        with open(arquivo, 'r', encoding='utf-8', newline='') as f:
+            original = f.read()
+        if any("funcao" in p or "bloco" in p for p in patches_arquivo):
+            if cache is None:
+                cache = scanner_kotlin.carregar_cache(arquivo_interno(ARQUIVO_CACHE_INDICES))
+            _, reescaneado = scanner_kotlin.indexar_arquivo(arquivo, original, cache)
+            mudou = mudou or reescaneado
+        novo, aplicados = montar(original, patches_arquivo)
+        if novo != original:
+            plano[arquivo] = (original, novo, aplicados)
+    if mudou:
+        try:
+            scanner_kotlin.salvar_cache(arquivo_interno(ARQUIVO_CACHE_INDICES), cache)
+        except OSError:
+            pass  # cache é só otimização
+    return plano
+
+def gravar_transacao(plano):
+    """Grava todos os arquivos ou nenhum: .tmp primeiro, depois renomeia; em falha desfaz os já trocados."""
+    temporarios = []
+    try:
+        for arquivo, (_, novo, _) in plano.items():
+            temporario = arquivo + ".tmp"
+            with open(temporario, 'w', encoding='utf-8', newline='') as f:
+                f.write(novo)
+            temporarios.append((temporario, arquivo))
+        trocados = []
+        try:
+            for temporario, arquivo in temporarios:
+                os.replace(temporario, arquivo)
+                trocados.append(arquivo)
+        except OSError:
+            for arquivo in trocados:
+                with open(arquivo, 'w', encoding='utf-8', newline='') as f:
+                    f.write(plano[arquivo][0])
+            raise
+    finally:
+        for temporario, _ in temporarios:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+def mostrar_diff(plano):
+    for arquivo, (original, novo, _) in plano.items():
+        diff = difflib.unified_diff(original.splitlines(True), novo.splitlines(True), f"a/{arquivo}", f"b/{arquivo}")
+        sys.stdout.writelines(diff)
+
+def aplicar_patches(patches, simular=False):
+    """Aplica (ou só mostra, com simular=True) todos os patches. Retorna os arquivos alterados."""
+    plano = planejar(patches)
+    if not plano:
+        log("Nada a fazer: todos os patches já estão aplicados.", "32")
+        return []
+    if simular:
+        mostrar_diff(plano)
+        log(f"Simulação: {len(plano)} arquivo(s) seriam alterados. Nada foi gravado.", "33")
+        return []
+    gravar_transacao(plano)
+    for arquivo, (_, _, aplicados) in plano.items():
+        for descricao in aplicados:
+            log(f"{os.path.basename(arquivo)}: {descricao}")
+    return list(plano)
+
+def executar(patches, mensagens, simular=False):
+    """Aplica a transação e publica no git com as mensagens dos scripts envolvidos."""
+    try:
+        alterados = aplicar_patches(patches, simular)
+    except ErroPatch as e:
+        log(f"Nenhum arquivo alterado: {e}", "31")
+        return False
+    if alterados:
+        for mensagem in mensagens[:-1]:
+            enfileirar(alterados, mensagem)
+        publicar(alterados, mensagens[-1])
+    return True
+
+def executar_script(patches, mensagem):
+    """Entrada padrão dos scripts de patch (aceita --simular na linha de comando)."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--simular", action="store_true", help="Só mostra o diff; não grava nem commita.")
+    args = parser.parse_args()
+    return executar(patches, [mensagem], args.simular)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aplica os PATCHES de vários scripts numa única transação.")
+    parser.add_argument("scripts", nargs="+", help="Módulos com PATCHES e MENSAGEM (ex: fix_ocr_logic update_permissions_text).")
+    parser.add_argument("--simular", action="store_true", help="Só mostra o diff; não grava nem commita.")
+    args = parser.parse_args()
+
+    patches, mensagens = [], []
+    for nome in args.scripts:
+        modulo = importlib.import_module(nome[:-3] if nome.endswith(".py") else nome)
+        patches += modulo.PATCHES
+        mensagens.append(modulo.MENSAGEM)
+    sys.exit(0 if executar(patches, mensagens, args.simular) else 1)
@@ -0,0 +1,236 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from datetime import datetime
+
+# ==============================================================================
+# PIPELINE GIT DOS SCRIPTS DE AUTOMAÇÃO
+# ==============================================================================
+# Commit + push compartilhado pelo controle_versao.py e pelos scripts de patch.
+#
+#   - Só entram no commit os arquivos que o script realmente alterou (nada de
+#     "git add .", que varre o projeto inteiro e leva junto o que não devia).
+#   - Com GIT_ACUMULAR=1 (ou --acumular nos scripts) as alterações só vão para a
+#     fila em ARQUIVO_FILA; vários scripts em sequência viram um único commit
+#     quando a fila é descarregada (python pipeline_git.py).
+#   - O push roda num processo separado, em segundo plano, com novas tentativas
+#     e espera exponencial; o script que chamou termina na hora.
+#
+# Uso encadeado:
+#   GIT_ACUMULAR=1 python fix_ocr_logic.py
+#   GIT_ACUMULAR=1 python update_permissions_text.py
+#   python pipeline_git.py            -> 1 commit + 1 push
+#
+# A fila, a trava e o log do push ficam dentro do .git (git rev-parse
+# --git-dir), fora da árvore de trabalho: nunca aparecem no status nem entram
+# num commit.
+
+PROJETO = "MotoristaPro-Android"
+ARQUIVO_FILA = ".git_fila.json"
+ARQUIVO_TRAVA_PUSH = ".git_push.lock"
+ARQUIVO_LOG_PUSH = ".git_push.log"
+ARQUIVO_QUARENTENA = ".git_fila_quarentena.json"  # Entradas da fila que o "git add" recusou
+VARIAVEL_ACUMULAR = "GIT_ACUMULAR"
+
+TENTATIVAS_PUSH = 5
+ESPERA_INICIAL = 2  # Segundos; dobra a cada falha (2, 4, 8, 16...)
+
+def log(msg, cor="36"):
+    print(f"\033[{cor}m[{PROJETO}] {msg}\033[0m")
+
+def git(*args, **kwargs):
+    return subprocess.run(["git", *args], **kwargs)
+
+PASTA_GIT = None
+
+def arquivo_interno(nome):
+    """Caminho de um arquivo do pipeline dentro do diretório do Git."""
+    global PASTA_GIT
+    if PASTA_GIT is None:
+        r = git("rev-parse", "--git-dir", capture_output=True, text=True)
+        PASTA_GIT = os.path.abspath(r.stdout.strip() if r.returncode == 0 else ".")
+    return os.path.join(PASTA_GIT, nome)
+
+# ==============================================================================
+# FILA DE ALTERAÇÕES
+# ==============================================================================
+
+def carregar_fila():
+    try:
+        with open(arquivo_interno(ARQUIVO_FILA), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"arquivos": [], "mensagens": []}
+
+def salvar_fila(fila):
+    caminho = arquivo_interno(ARQUIVO_FILA)
+    temporario = caminho + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(fila, f, indent=1, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+def enfileirar(arquivos, mensagem):
+    fila = carregar_fila()
+    for arquivo in arquivos:
+        arquivo = os.path.normpath(arquivo)
+        if arquivo not in fila["arquivos"]:
+            fila["arquivos"].append(arquivo)
+    if mensagem not in fila["mensagens"]:
+        fila["mensagens"].append(mensagem)
+    salvar_fila(fila)
+    return fila
+
+def quarentenar(arquivos, mensagens):
+    caminho = arquivo_interno(ARQUIVO_QUARENTENA)
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            quarentena = json.load(f)
+    except (OSError, ValueError):
+        quarentena = []
+    quarentena.append({"quando": f"{datetime.now():%Y-%m-%d %H:%M:%S}", "arquivos": arquivos, "mensagens": mensagens})
+    temporario = caminho + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(quarentena, f, indent=1, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+def mensagem_combinada(mensagens):
+    """Uma mensagem vira o assunto; várias viram assunto resumido + lista no corpo."""
+    if len(mensagens) == 1:
+        return mensagens[0]
+    return f"Automacao: {len(mensagens)} alteracoes\n\n" + "\n".join(f"- {m}" for m in mensagens)
+
+def descarregar_fila(push=True):
+    """Commita tudo o que está na fila num único commit e dispara o push. Retorna True se commitou."""
+    fila = carregar_fila()
+    if not fila["arquivos"]:
+        log("Nada na fila para commitar.")
+        return False
+    # "-A --" com a lista explícita: registra também arquivos removidos pelos scripts
+    if git("add", "-A", "--", *fila["arquivos"]).returncode != 0:
+        # Um caminho ruim (fora do repositório, apagado sem nunca ter sido versionado...)
+        # travaria todas as descargas seguintes: vai para a quarentena e o resto segue
+        ruins = [a for a in fila["arquivos"] if git("add", "-A", "--", a).returncode != 0]
+        quarentenar(ruins, fila["mensagens"])
+        log(f"'git add' recusou {len(ruins)} arquivo(s); movidos para {arquivo_interno(ARQUIVO_QUARENTENA)}: "
+            f"{', '.join(ruins)}", "31")
+        fila["arquivos"] = [a for a in fila["arquivos"] if a not in ruins]
+        if not fila["arquivos"]:
+            os.remove(arquivo_interno(ARQUIVO_FILA))
+            return False
+    if git("diff", "--cached", "--quiet").returncode == 0:
+        log("Arquivos da fila sem mudanças em relação ao último commit.", "33")
+    else:
+        git("commit", "-m", mensagem_combinada(fila["mensagens"]), check=True)
+        log(f"Commit criado com {len(fila['arquivos'])} arquivo(s).", "32")
+    os.remove(arquivo_interno(ARQUIVO_FILA))
+    if push:
+        push_em_segundo_plano()
+    return True
+
+def publicar(arquivos, mensagem, acumular=None):
+    """Ponto de entrada dos scripts: registra os arquivos alterados e, fora do modo
+    acumulado, já commita e dispara o push em segundo plano."""
+    if acumular is None:
+        acumular = os.environ.get(VARIAVEL_ACUMULAR) == "1"
+    try:
+        fila = enfileirar(arquivos, mensagem)
+        if acumular:
+            log(f"Alteração na fila ({len(fila['mensagens'])} pendente(s)). "
+                f"Rode 'python pipeline_git.py' para commitar tudo.", "33")
+            return
+        descarregar_fila()
+    except Exception as e:
+        log(f"Erro no Git: {e}", "31") # Vermelho
+
+# ==============================================================================
+# PUSH EM SEGUNDO PLANO
+# ==============================================================================
+
+def push_em_segundo_plano():
+    """Dispara o push num processo desacoplado, que sobrevive ao fim do script."""
+    log_push = arquivo_interno(ARQUIVO_LOG_PUSH)
+    with open(log_push, 'a', encoding='utf-8') as saida:
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "--enviar"],
+                         stdout=saida, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                         start_new_session=True)
+    log(f"Push disparado em segundo plano (log em {log_push}).", "33")
+
+def commits_pendentes():
+    """Commits locais ainda não enviados; None se o branch não tem upstream."""
+    r = git("rev-list", "--count", "@{u}..HEAD", capture_output=True, text=True)
+    return int(r.stdout) if r.returncode == 0 else None
+
+def processo_vivo(arquivo_trava):
+    try:
+        with open(arquivo_trava, 'r') as f:
+            pid = int(f.read())
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return False
+    return True
+
+def enviar(tentativas=TENTATIVAS_PUSH, espera=ESPERA_INICIAL):
+    """Push com novas tentativas. Só um enviador por vez: um segundo disparo sai logo,
+    e o que já está rodando repete o push enquanto houver commits não enviados."""
+    arquivo_trava = arquivo_interno(ARQUIVO_TRAVA_PUSH)
+    try:
+        trava = os.open(arquivo_trava, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        if processo_vivo(arquivo_trava):
+            print(f"[{datetime.now():%d/%m %H:%M:%S}] Push já em andamento; ele levará os commits novos.")
+            return True
+        # Trava esquecida por um enviador que morreu no meio: assume o lugar dele
+        os.remove(arquivo_trava)
+        return enviar(tentativas, espera)
+    try:
+        os.write(trava, str(os.getpid()).encode())
+        os.close(trava)
+        enviado = insistir_push(tentativas, espera)
+    finally:
+        os.remove(arquivo_trava)
+    # Um commit feito entre a última checagem e a remoção da trava viu a trava viva e
+    # saiu contando com este enviador: confere de novo já sem a trava
+    if enviado and commits_pendentes():
+        return enviar(tentativas, espera)
+    return enviado
+
+def insistir_push(tentativas, espera):
+    falhas = 0
+    while True:
+        if git("push").returncode == 0:
+            falhas = 0
+            if not commits_pendentes():
+                print(f"[{datetime.now():%d/%m %H:%M:%S}] Push concluído.")
+                return True
+            continue  # Entrou commit novo durante o push
+        falhas += 1
+        if falhas >= tentativas:
+            print(f"[{datetime.now():%d/%m %H:%M:%S}] Push falhou {falhas} vezes; desistindo.")
+            return False
+        atraso = espera * 2 ** (falhas - 1)
+        print(f"[{datetime.now():%d/%m %H:%M:%S}] Push falhou; nova tentativa em {atraso}s.")
+        time.sleep(atraso)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Commita a fila de alterações dos scripts e faz o push.")
+    parser.add_argument("--sem-push", action="store_true", help="Só commita; o push fica para depois.")
+    parser.add_argument("--status", action="store_true", help="Mostra a fila sem commitar.")
+    parser.add_argument("--enviar", action="store_true", help=argparse.SUPPRESS)  # Processo de push em segundo plano
+    args = parser.parse_args()
+
+    if args.enviar:
+        sys.exit(0 if enviar() else 1)
+    if args.status:
+        fila = carregar_fila()
+        for mensagem in fila["mensagens"]:
+            print(f"  * {mensagem}")
+        for arquivo in fila["arquivos"]:
+            print(f"    {arquivo}")
+        log(f"{len(fila['mensagens'])} alteração(ões), {len(fila['arquivos'])} arquivo(s) na fila.")
+        if os.path.exists(arquivo_interno(ARQUIVO_QUARENTENA)):
+            log(f"Há entradas recusadas pelo 'git add' em {arquivo_interno(ARQUIVO_QUARENTENA)}.", "33")
+    else:
+        descarregar_fila(push=not args.sem_push)
@@ -0,0 +1,168 @@
+import os
+import re
+
+# ==============================================================================
+# MOTOR DE REGRAS DE INCLUSÃO/EXCLUSÃO
+# ==============================================================================
+# Compila uma única vez as regras do backup (extensões, pastas e arquivos fixos)
+# mais padrões no formato do .gitignore. As pastas são avaliadas antes de o
+# os.walk descer nelas, então nada que seria descartado chega a ser listado.
+#
+# Semântica do .gitignore suportada:
+#   - linhas vazias e comentários (#) são ignorados; "\#" e "\!" escapam
+#   - "!padrao" reinclui; vale a última regra que casar
+#   - "padrao/" casa só com pastas
+#   - padrão com "/" no início ou no meio é relativo à pasta do .gitignore;
+#     sem "/" casa com o nome em qualquer nível
+#   - "*", "?", "[abc]", "**/", "/**" e "/**/"
+#   - .gitignore de subpastas valem para a própria subpasta, com prioridade maior
+
+EXTENSOES_IMAGEM = {'.png', '.jpg', '.jpeg', '.webp', '.ico'}
+
+def traduzir_padrao(padrao):
+    """Converte um padrão glob do .gitignore (já sem "!" e "/" final) em regex."""
+    ancorado = "/" in padrao
+    padrao = padrao.lstrip("/")
+    partes = []
+    i = 0
+    while i < len(padrao):
+        c = padrao[i]
+        if padrao.startswith("**/", i):
+            partes.append("(?:.*/)?")
+            i += 3
+            continue
+        if padrao.startswith("**", i):
+            partes.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            partes.append("[^/]*")
+        elif c == "?":
+            partes.append("[^/]")
+        elif c == "[":
+            fim = padrao.find("]", i + 2)
+            if fim == -1:
+                partes.append(re.escape(c))
+            else:
+                classe = padrao[i + 1:fim].replace("\\", "\\\\")
+                if classe[0] in "!^":
+                    classe = "^" + classe[1:]
+                partes.append(f"[{classe}]")
+                i = fim
+        elif c == "\\" and i + 1 < len(padrao):
+            i += 1
+            partes.append(re.escape(padrao[i]))
+        else:
+            partes.append(re.escape(c))
+        i += 1
+    corpo = "".join(partes)
+    return corpo if ancorado else "(?:.*/)?" + corpo
+
+def compilar_linhas(linhas):
+    """Compila linhas de .gitignore em grupos [(negado, regex_pastas, regex_arquivos)].
+
+    Regras consecutivas com o mesmo sinal viram uma única alternação; a avaliação
+    percorre os grupos de trás para frente e o primeiro que casa decide.
+    """
+    grupos = []
+    for linha in linhas:
+        linha = linha.rstrip("\n").rstrip()
+        if not linha or linha.startswith("#"):
+            continue
+        negado = linha.startswith("!")
+        if negado:
+            linha = linha[1:]
+        elif linha.startswith("\\#") or linha.startswith("\\!"):
+            linha = linha[1:]
+        somente_pasta = linha.endswith("/")
+        linha = linha.rstrip("/")
+        if not linha:
+            continue
+        regex = traduzir_padrao(linha)
+        if not grupos or grupos[-1][0] != negado:
+            grupos.append((negado, [], []))
+        grupos[-1][1].append(regex)
+        if not somente_pasta:
+            grupos[-1][2].append(regex)
+
+    def unir(regexes):
+        return re.compile("^(?:" + "|".join(regexes) + ")$") if regexes else None
+
+    return [(negado, unir(pastas), unir(arquivos)) for negado, pastas, arquivos in grupos]
+
+def avaliar_grupos(grupos, caminho_rel, eh_pasta):
+    """True = ignorado, False = reincluído, None = nenhuma regra casou."""
+    for negado, regex_pastas, regex_arquivos in reversed(grupos):
+        regex = regex_pastas if eh_pasta else regex_arquivos
+        if regex is not None and regex.match(caminho_rel):
+            return not negado
+    return None
+
+class RegrasIgnorar:
+    """Decide quais pastas podar e quais arquivos entram no backup."""
+
+    def __init__(self, extensoes, pastas_ignoradas, arquivos_ignorados,
+                 excluir=(), incluir=(), usar_gitignore=False, raiz="."):
+        self.extensoes = frozenset(extensoes)
+        self.extensoes_aceitas = frozenset(e.lower() for e in extensoes) - EXTENSOES_IMAGEM
+        self.pastas_ignoradas = frozenset(pastas_ignoradas)
+        self.arquivos_ignorados = frozenset(arquivos_ignorados)
+        self.usar_gitignore = usar_gitignore
+        self.raiz = raiz
+        # Padrões extras (linha de comando) valem a partir da raiz e vencem qualquer .gitignore
+        self.excluir = compilar_linhas(excluir)
+        self.incluir = compilar_linhas(incluir)
+        # Pilha de (prefixo "pasta/" relativo à raiz, grupos) dos .gitignore já lidos
+        self.gitignores = []
+
+    def entrar_pasta(self, caminho_rel):
+        """Chamado ao visitar cada pasta (caminho relativo à raiz, "." na raiz)."""
+        if not self.usar_gitignore:
+            return
+        prefixo = "" if caminho_rel == "." else caminho_rel.replace(os.sep, "/") + "/"
+        arquivo = os.path.join(self.raiz, caminho_rel, ".gitignore")
+        try:
+            with open(arquivo, 'r', encoding='utf-8', errors='ignore') as f:
+                grupos = compilar_linhas(f)
+        except OSError:
+            return
+        if grupos:
+            self.gitignores.append((prefixo, grupos))
+            # Mais profundo primeiro: o .gitignore mais próximo tem prioridade
+            self.gitignores.sort(key=lambda item: -len(item[0]))
+
+    def ignorado_por_padroes(self, caminho_rel, eh_pasta):
+        decisao = avaliar_grupos(self.excluir, caminho_rel, eh_pasta)
+        if decisao is not None:
+            return decisao
+        for prefixo, grupos in self.gitignores:
+            if caminho_rel.startswith(prefixo):
+                decisao = avaliar_grupos(grupos, caminho_rel[len(prefixo):], eh_pasta)
+                if decisao is not None:
+                    return decisao
+        return False
+
+    def ignorar_pasta(self, pasta_rel, nome):
+        if nome in self.pastas_ignoradas:
+            return True
+        if not (self.excluir or self.gitignores):
+            return False
+        return self.ignorado_por_padroes(juntar(pasta_rel, nome), True)
+
+    def processar_arquivo(self, pasta_rel, nome):
+        if nome in self.arquivos_ignorados:
+            return False
+        # Arquivos sem extensão exatos permitidos; imagens nunca entram, mesmo se listadas
+        if nome not in self.extensoes:
+            _, ext = os.path.splitext(nome)
+            if ext.lower() not in self.extensoes_aceitas:
+                return False
+        if not (self.excluir or self.incluir or self.gitignores):
+            return True
+        caminho_rel = juntar(pasta_rel, nome)
+        if self.incluir and not avaliar_grupos(self.incluir, caminho_rel, False):
+            return False
+        return not self.ignorado_por_padroes(caminho_rel, False)
+
+def juntar(pasta_rel, nome):
+    return nome if pasta_rel == "." else pasta_rel.replace(os.sep, "/") + "/" + nome
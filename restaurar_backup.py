@@ -0,0 +1,233 @@
+import os
+import io
+import re
+import sys
+import gzip
+import fnmatch
+import hashlib
+import argparse
+from collections import deque
+
+import backup_android
+
+# ================= CONFIGURAÇÕES =================
+PASTA_ORIGEM = backup_android.PASTA_DESTINO
+PASTA_RESTAURADA = "Restaurado_Android"
+TAMANHO_PEDACO = 64 * 1024  # Bytes lidos por vez das partes (linhas longas viram vários pedaços)
+
+SEPARADOR = ("=" * 80 + "\n").encode('utf-8')
+PREFIXO_ARQUIVO = b"ARQUIVO: "
+PREFIXO_CONTINUACAO = "CONTINUAÇÃO: ".encode('utf-8')  # Arquivo dividido entre partes (--empacotar)
+PADRAO_PARTE = re.compile(r"^android_(.+)_parte(\d+)(\.txt(?:\.gz|\.zst)?)$")
+
+# ================= LEITURA DAS PARTES =================
+
+def listar_partes(origem=PASTA_ORIGEM):
+    """Partes do backup ordenadas por grupo e número (parte100 vem depois de parte99)."""
+    partes = []
+    for nome in os.listdir(origem):
+        m = PADRAO_PARTE.match(nome)
+        if m:
+            partes.append((m.group(1), int(m.group(2)), os.path.join(origem, nome)))
+    partes.sort()
+    return [caminho for _, _, caminho in partes]
+
+def abrir_parte(caminho):
+    """Abre a parte como fluxo binário, descompactando gz/zst sob demanda."""
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, 'rb')
+    if caminho.endswith(".zst"):
+        if backup_android.zstandard is None:
+            raise RuntimeError("partes .zst exigem o pacote 'zstandard' (pip install zstandard)")
+        bruto = open(caminho, 'rb')
+        leitor = backup_android.zstandard.ZstdDecompressor().stream_reader(bruto, read_across_frames=True, closefd=True)
+        return io.BufferedReader(leitor)
+    return open(caminho, 'rb')
+
+def tipo_cabecalho(janela):
+    """"inicio"/"continuacao" se a janela de 4 linhas é um cabeçalho do formatar_cabecalho, senão None."""
+    # Bloco: "\n" + "="*80 + "\nARQUIVO: <caminho>\n" + "="*80 + "\n"
+    if not (janela[0] == b"\n" and janela[1] == SEPARADOR and janela[3] == SEPARADOR
+            and janela[2].endswith(b"\n")):
+        return None
+    if janela[2].startswith(PREFIXO_ARQUIVO):
+        return "inicio"
+    if janela[2].startswith(PREFIXO_CONTINUACAO):
+        return "continuacao"
+    return None
+
+def eventos_parte(caminho_parte):
+    """Percorre uma parte em fluxo gerando ("inicio", caminho), ("dados", bytes) e ("fim", caminho).
+
+    Blocos "CONTINUAÇÃO:" geram ("continuacao", caminho) no lugar de "inicio": os
+    dados seguintes devem ser anexados ao mesmo arquivo. Cada bloco termina com
+    o "\\n" acrescentado pelo backup; esse último byte é retido e descartado ao
+    fim do arquivo, devolvendo o conteúdo original.
+    """
+    atual = None
+    retido = b""
+    janela = deque()
+    with abrir_parte(caminho_parte) as f:
+        while True:
+            linha = f.readline(TAMANHO_PEDACO)
+            if linha:
+                janela.append(linha)
+                if len(janela) < 4:
+                    continue
+                tipo = tipo_cabecalho(janela)
+                if tipo:
+                    if atual is not None:
+                        yield ("fim", atual)
+                    prefixo = PREFIXO_ARQUIVO if tipo == "inicio" else PREFIXO_CONTINUACAO
+                    atual = janela[2][len(prefixo):-1].decode('utf-8')
+                    retido = b""
+                    janela.clear()
+                    yield (tipo, atual)
+                    continue
+                pedaco = janela.popleft()
+            elif janela:
+                pedaco = janela.popleft()
+            else:
+                break
+
+            if atual is not None:
+                dados = retido + pedaco[:-1]
+                retido = pedaco[-1:]
+                if dados:
+                    yield ("dados", dados)
+    if atual is not None:
+        yield ("fim", atual)
+
+def selecionado(caminho_rel, padroes):
+    if not padroes:
+        return True
+    caminho = caminho_rel.replace(os.sep, "/")
+    return any(fnmatch.fnmatchcase(caminho, p) for p in padroes)
+
+def destino_seguro(destino, caminho_rel):
+    """Evita que um cabeçalho adulterado (../, caminho absoluto) escreva fora do destino."""
+    normalizado = os.path.normpath(caminho_rel)
+    if os.path.isabs(normalizado) or normalizado.split(os.sep)[0] == "..":
+        raise ValueError(f"caminho inválido no backup: {caminho_rel}")
+    return os.path.join(destino, normalizado)
+
+# ================= RESTAURAÇÃO =================
+
+def restaurar(origem=PASTA_ORIGEM, destino=PASTA_RESTAURADA, padroes=None):
+    """Reconstrói os arquivos do backup em `destino`. Retorna a quantidade restaurada."""
+    indice_path = os.path.join(origem, backup_android.NOME_INDICE)
+    if padroes and os.path.exists(indice_path):
+        # Formatos compactados: o índice leva direto ao frame de cada arquivo
+        return restaurar_pelo_indice(origem, destino, padroes)
+
+    restaurados = set()
+    f_destino = None
+    for parte in listar_partes(origem):
+        for tipo, valor in eventos_parte(parte):
+            if tipo in ("inicio", "continuacao"):
+                if selecionado(valor, padroes):
+                    caminho = destino_seguro(destino, valor)
+                    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+                    f_destino = open(caminho, 'wb' if tipo == "inicio" else 'ab')
+            elif tipo == "dados":
+                if f_destino:
+                    f_destino.write(valor)
+            elif f_destino:
+                f_destino.close()
+                f_destino = None
+                if valor not in restaurados:
+                    restaurados.add(valor)
+                    print(f"   <- {valor}")
+    return len(restaurados)
+
+def restaurar_pelo_indice(origem, destino, padroes):
+    indice = backup_android.carregar_indice(origem)
+    total = 0
+    for caminho_rel in sorted(indice["arquivos"]):
+        if not selecionado(caminho_rel, padroes):
+            continue
+        caminho = destino_seguro(destino, caminho_rel)
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with open(caminho, 'wb') as f:
+            f.write(backup_android.extrair_do_indice(caminho_rel, indice, origem).encode('utf-8'))
+        total += 1
+        print(f"   <- {caminho_rel}")
+    return total
+
+# ================= VERIFICAÇÃO =================
+
+def hash_normalizado(caminho):
+    """Hash do arquivo como o backup o grava (utf-8 com errors='ignore', quebras de linha universais)."""
+    h = hashlib.sha256()
+    with open(caminho, 'r', encoding='utf-8', errors='ignore') as f:
+        for pedaco in iter(lambda: f.read(backup_android.TAMANHO_PEDACO_LEITURA), ''):
+            h.update(pedaco.encode('utf-8'))
+    return h.hexdigest()
+
+def verificar(origem=PASTA_ORIGEM, padroes=None, regras=None):
+    """Compara o conteúdo do backup com o checkout atual sem gravar nada. Retorna True se bater.
+    `regras` deve ser o RegrasIgnorar com que o backup foi feito (padrão: as regras fixas)."""
+    esperados = {}
+    for _, arquivos_validos in backup_android.coletar_grupos(regras):
+        for caminho_origem in arquivos_validos:
+            caminho_rel = os.path.relpath(caminho_origem, backup_android.DIRETORIO_RAIZ)
+            if selecionado(caminho_rel, padroes):
+                esperados[caminho_rel] = caminho_origem
+
+    # Um hash por arquivo: blocos de continuação seguem alimentando o mesmo hash
+    hashes = {}
+    h = None
+    for parte in listar_partes(origem):
+        for tipo, valor in eventos_parte(parte):
+            if tipo == "inicio":
+                h = hashes[os.path.normpath(valor)] = hashlib.sha256() if selecionado(valor, padroes) else None
+            elif tipo == "continuacao":
+                h = hashes.get(os.path.normpath(valor))
+            elif tipo == "dados":
+                if h:
+                    h.update(valor)
+            else:
+                h = None
+
+    vistos = {c for c, h in hashes.items() if h is not None}
+    divergentes = [c for c in sorted(vistos)
+                   if c in esperados and hash_normalizado(esperados[c]) != hashes[c].hexdigest()]
+
+    fora_do_backup = sorted(set(esperados) - vistos)
+    fora_do_projeto = sorted(vistos - set(esperados))
+    for caminho_rel in divergentes:
+        print(f"   [DIFERENTE] {caminho_rel}")
+    for caminho_rel in fora_do_backup:
+        print(f"   [FALTA NO BACKUP] {caminho_rel}")
+    for caminho_rel in fora_do_projeto:
+        print(f"   [SÓ NO BACKUP] {caminho_rel}")
+    print(f"Arquivos conferidos: {len(vistos)} | Diferentes: {len(divergentes)} | "
+          f"Faltando no backup: {len(fora_do_backup)} | Só no backup: {len(fora_do_projeto)}")
+    return not (divergentes or fora_do_backup or fora_do_projeto)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Restaura (ou confere) o projeto a partir do Backup_Android.")
+    parser.add_argument("--origem", default=PASTA_ORIGEM, help=f"Pasta com as partes (padrão: {PASTA_ORIGEM}).")
+    parser.add_argument("--destino", default=PASTA_RESTAURADA, help=f"Pasta de saída (padrão: {PASTA_RESTAURADA}).")
+    parser.add_argument("--incluir", action="append", metavar="GLOB",
+                        help="Restaura só os caminhos que casam com o glob (pode repetir). Ex: 'app/src/**/*.kt'")
+    parser.add_argument("--verificar", action="store_true",
+                        help="Não grava nada: compara o backup com o checkout atual.")
+    # Com --verificar, as mesmas regras usadas no backup_android.py (senão sobram falsas diferenças)
+    parser.add_argument("--gitignore", action="store_true",
+                        help="(--verificar) O backup foi feito com --gitignore.")
+    parser.add_argument("--excluir", action="append", default=[], metavar="PADRAO",
+                        help="(--verificar) Padrão passado ao --excluir do backup (pode repetir).")
+    parser.add_argument("--incluir-backup", action="append", default=[], metavar="PADRAO",
+                        help="(--verificar) Padrão passado ao --incluir do backup (pode repetir).")
+    args = parser.parse_args()
+
+    if args.verificar:
+        print(f"--- VERIFICANDO '{args.origem}' CONTRA O PROJETO ---")
+        regras = backup_android.regras_padrao(args.excluir, args.incluir_backup, args.gitignore)
+        sys.exit(0 if verificar(args.origem, args.incluir, regras) else 1)
+
+    print(f"--- RESTAURANDO '{args.origem}' EM '{args.destino}' ---")
+    total = restaurar(args.origem, args.destino, args.incluir)
+    print(f"\n--- CONCLUÍDO ---")
+    print(f"Arquivos restaurados: {total}")
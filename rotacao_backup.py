@@ -0,0 +1,253 @@
+import os
+import re
+import json
+import hashlib
+import argparse
+from datetime import datetime
+
+# ==============================================================================
+# ROTAÇÃO DO backup_automatico
+# ==============================================================================
+# Guarda as cópias feitas pelo controle_versao.py antes de cada bump sem deixar
+# a pasta crescer para sempre:
+#
+#   backup_automatico/
+#       objetos/ab/<sha256>   conteúdo (cópias idênticas ocupam um objeto só)
+#       indice.json           uma entrada por backup: arquivo, data, versão, hash
+#
+# Depois de cada backup a política de retenção poda o índice (por arquivo) e os
+# objetos que ninguém mais referencia são apagados:
+#   - ultimos:    os N backups mais recentes
+#   - diarios:    o mais recente de cada um dos últimos D dias com backup
+#   - semanais:   o mais recente de cada uma das últimas S semanas com backup
+#   - tamanho_max: teto em bytes dos objetos; acima dele os backups mais antigos
+#                  saem, mesmo os protegidos acima (o mais recente de cada arquivo fica)
+
+PASTA_BACKUP = "backup_automatico"
+NOME_INDICE = "indice.json"
+POLITICA_PADRAO = {"ultimos": 20, "diarios": 7, "semanais": 8, "tamanho_max": 50 * 1024 * 1024}
+
+# Cópias soltas do formato antigo: <nome>_<AAAAMMDD_HHMMSS>.bak (todas do app)
+PADRAO_LEGADO = re.compile(r"^(.+)_(\d{8}_\d{6})\.bak$")
+LEGADOS_PADRAO = {"build.gradle.kts": "app/build.gradle.kts"}
+
+class RepositorioBackup:
+
+    def __init__(self, pasta=PASTA_BACKUP, politica=None, legados=None):
+        """`legados` mapeia o nome das cópias antigas (só o basename) para o caminho de origem."""
+        self.pasta = pasta
+        self.politica = dict(POLITICA_PADRAO, **(politica or {}))
+        self.legados = LEGADOS_PADRAO if legados is None else legados
+        self.entradas = self.carregar()
+        if self.importar_legados():
+            self.salvar()
+
+    # ----- Índice -----
+
+    def caminho_indice(self):
+        return os.path.join(self.pasta, NOME_INDICE)
+
+    def caminho_objeto(self, hash_conteudo):
+        return os.path.join(self.pasta, "objetos", hash_conteudo[:2], hash_conteudo)
+
+    def carregar(self):
+        try:
+            with open(self.caminho_indice(), 'r', encoding='utf-8') as f:
+                return json.load(f)["entradas"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def salvar(self):
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = self.caminho_indice() + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({"entradas": self.entradas}, f, indent=1, ensure_ascii=False)
+        os.replace(temporario, self.caminho_indice())
+
+    # ----- Gravação -----
+
+    def gravar_objeto(self, dados):
+        hash_conteudo = hashlib.sha256(dados).hexdigest()
+        destino = self.caminho_objeto(hash_conteudo)
+        if not os.path.exists(destino):
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            temporario = destino + ".tmp"
+            with open(temporario, 'wb') as f:
+                f.write(dados)
+            os.replace(temporario, destino)
+        return hash_conteudo
+
+    def adicionar(self, arquivo, versao=None, criado_em=None, dados=None):
+        """Guarda uma cópia de `arquivo` (ou de `dados`) e aplica a retenção. Retorna a entrada."""
+        if dados is None:
+            with open(arquivo, 'rb') as f:
+                dados = f.read()
+        criado_em = criado_em or datetime.now()
+        hash_conteudo = self.gravar_objeto(dados)
+        entrada = {"id": self.novo_id(f"{criado_em:%Y%m%d_%H%M%S}_{hash_conteudo[:8]}"),
+                   "arquivo": os.path.normpath(arquivo).replace(os.sep, "/"),
+                   "criado_em": criado_em.isoformat(timespec="seconds"),
+                   "versao": versao, "hash": hash_conteudo, "tamanho": len(dados)}
+        self.entradas.append(entrada)
+        self.entradas.sort(key=lambda e: e["criado_em"])
+        self.podar()
+        self.salvar()
+        return entrada
+
+    def novo_id(self, base):
+        # Dois módulos com o mesmo conteúdo no mesmo segundo geram a mesma base
+        ids = {e["id"] for e in self.entradas}
+        id_entrada, n = base, 1
+        while id_entrada in ids:
+            n += 1
+            id_entrada = f"{base}_{n}"
+        return id_entrada
+
+    def importar_legados(self):
+        """Move para o repositório as cópias <nome>_<data>.bak deixadas pelo formato antigo."""
+        if not os.path.isdir(self.pasta):
+            return False
+        importados = False
+        for nome in sorted(os.listdir(self.pasta)):
+            m = PADRAO_LEGADO.match(nome)
+            if not m:
+                continue
+            caminho = os.path.join(self.pasta, nome)
+            with open(caminho, 'rb') as f:
+                dados = f.read()
+            criado_em = datetime.strptime(m.group(2), "%Y%m%d_%H%M%S")
+            hash_conteudo = self.gravar_objeto(dados)
+            self.entradas.append({"id": self.novo_id(f"{m.group(2)}_{hash_conteudo[:8]}"),
+                                  "arquivo": self.legados.get(m.group(1), m.group(1)),
+                                  "criado_em": criado_em.isoformat(timespec="seconds"),
+                                  "versao": None, "hash": hash_conteudo, "tamanho": len(dados)})
+            os.remove(caminho)
+            importados = True
+        if importados:
+            self.entradas.sort(key=lambda e: e["criado_em"])
+            self.podar()
+        return importados
+
+    # ----- Retenção -----
+
+    def protegidas(self, entradas):
+        """Ids mantidos pelas regras ultimos/diarios/semanais (entradas de um arquivo, mais novas primeiro)."""
+        manter = {e["id"] for e in entradas[:self.politica["ultimos"]]}
+        dias, semanas = set(), set()
+        for e in entradas:
+            data = datetime.fromisoformat(e["criado_em"])
+            dia = data.date()
+            semana = data.isocalendar()[:2]
+            if dia not in dias and len(dias) < self.politica["diarios"]:
+                dias.add(dia)
+                manter.add(e["id"])
+            if semana not in semanas and len(semanas) < self.politica["semanais"]:
+                semanas.add(semana)
+                manter.add(e["id"])
+        return manter
+
+    def podar(self):
+        por_arquivo = {}
+        for e in reversed(self.entradas):
+            por_arquivo.setdefault(e["arquivo"], []).append(e)
+        manter = set()
+        mais_recentes = set()
+        for entradas in por_arquivo.values():
+            manter |= self.protegidas(entradas)
+            mais_recentes.add(entradas[0]["id"])
+        self.entradas = [e for e in self.entradas if e["id"] in manter]
+
+        # Teto de tamanho: conta cada objeto uma vez (deduplicado)
+        tamanhos = {e["hash"]: e["tamanho"] for e in self.entradas}
+        total = sum(tamanhos.values())
+        for e in list(self.entradas):
+            if total <= self.politica["tamanho_max"]:
+                break
+            if e["id"] in mais_recentes:
+                continue
+            self.entradas.remove(e)
+            if all(outra["hash"] != e["hash"] for outra in self.entradas):
+                total -= tamanhos[e["hash"]]
+        self.coletar_objetos()
+
+    def coletar_objetos(self):
+        """Apaga os objetos que nenhuma entrada do índice referencia mais."""
+        usados = {e["hash"] for e in self.entradas}
+        raiz = os.path.join(self.pasta, "objetos")
+        if not os.path.isdir(raiz):
+            return
+        for sub in os.listdir(raiz):
+            pasta = os.path.join(raiz, sub)
+            for nome in os.listdir(pasta):
+                if nome not in usados:
+                    os.remove(os.path.join(pasta, nome))
+
+    # ----- Consulta -----
+
+    def procurar(self, chave, arquivo=None):
+        """Entrada mais recente para `chave`: "ultimo", versão exata, id exato ou prefixo
+        único de id/hash. A versão vem antes porque ids ("2026...") e hashes (hex) também
+        começam com dígitos. Prefixo que bate com conteúdos diferentes dá KeyError."""
+        if arquivo:
+            arquivo = os.path.normpath(arquivo).replace(os.sep, "/")
+        candidatas = [e for e in reversed(self.entradas) if not arquivo or e["arquivo"] == arquivo]
+        if chave == "ultimo":
+            return candidatas[0] if candidatas else None
+        for e in candidatas:
+            if e["versao"] is not None and str(e["versao"]) == chave:
+                return e
+        for e in candidatas:
+            if e["id"] == chave:
+                return e
+        prefixo = [e for e in candidatas if e["id"].startswith(chave) or e["hash"].startswith(chave)]
+        # Cópias do mesmo conteúdo do mesmo arquivo são a mesma restauração
+        if len({(e["arquivo"], e["hash"]) for e in prefixo}) > 1:
+            opcoes = ", ".join(f"{e['id']} (v{e['versao'] or '?'}, {e['arquivo']})" for e in prefixo[:5])
+            raise KeyError(f"'{chave}' é ambíguo: bate com {len(prefixo)} backups ({opcoes}"
+                           f"{', ...' if len(prefixo) > 5 else ''})")
+        return prefixo[0] if prefixo else None
+
+    def ler(self, entrada):
+        with open(self.caminho_objeto(entrada["hash"]), 'rb') as f:
+            return f.read()
+
+    def restaurar(self, chave, arquivo=None, destino=None):
+        """Grava a cópia encontrada em `destino` (padrão: o próprio arquivo de origem)."""
+        entrada = self.procurar(chave, arquivo)
+        if entrada is None:
+            raise KeyError(f"nenhum backup encontrado para '{chave}'")
+        destino = destino or entrada["arquivo"]
+        os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+        temporario = destino + ".tmp"
+        with open(temporario, 'wb') as f:
+            f.write(self.ler(entrada))
+        os.replace(temporario, destino)
+        return entrada, destino
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta e restaura os backups do backup_automatico.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("listar", help="Lista os backups guardados.")
+    p_rest = sub.add_parser("restaurar", help="Restaura uma versão (versionCode, id, hash ou 'ultimo').")
+    p_rest.add_argument("chave")
+    p_rest.add_argument("--arquivo", help="Filtra pelo arquivo de origem (ex: app/build.gradle.kts).")
+    p_rest.add_argument("--destino", help="Onde gravar (padrão: sobrescreve o arquivo de origem).")
+    sub.add_parser("podar", help="Reaplica a política de retenção agora.")
+    args = parser.parse_args()
+
+    repositorio = RepositorioBackup()
+    if args.comando == "listar":
+        for e in repositorio.entradas:
+            print(f"{e['id']}  {e['criado_em']}  v{e['versao'] or '?':<6} {e['tamanho']:8d}B  {e['arquivo']}")
+        print(f"{len(repositorio.entradas)} backups, {len({e['hash'] for e in repositorio.entradas})} conteúdos distintos")
+    elif args.comando == "restaurar":
+        try:
+            entrada, destino = repositorio.restaurar(args.chave, args.arquivo, args.destino)
+        except KeyError as e:
+            parser.exit(1, f"{e.args[0]}\n")
+        print(f"Backup {entrada['id']} (versão {entrada['versao']}) restaurado em '{destino}'")
+    else:
+        antes = len(repositorio.entradas)
+        repositorio.podar()
+        repositorio.salvar()
+        print(f"Backups: {antes} -> {len(repositorio.entradas)}")
@@ -0,0 +1,230 @@
+import os
+import re
+import json
+import hashlib
+from collections import OrderedDict
+
+# ==============================================================================
+# SCANNER ESTRUTURAL DE KOTLIN
+# ==============================================================================
+# Uma passada linear pelo fonte, ciente de comentários (// e /* */ aninhados),
+# strings ("..." e """..."""), templates (${...}, que podem ter chaves e strings
+# dentro) e literais de caractere. Cada par de chaves de código vira um bloco:
+#
+#   blocos:  cabeçalho normalizado -> [(inicio, fim)]
+#            ex: "if (!Settings.canDrawOverlays(this))" -> span do "if" até a "}"
+#   funcoes: nome -> [(inicio, fim)]
+#            do primeiro modificador da declaração até a "}" do corpo
+#
+# O cabeçalho é o texto entre o fim da instrução anterior (";", "{", "}" ou uma
+# quebra de linha fora de parênteses) e a "{". Funções de corpo por expressão
+# (fun x() = ...) e sem corpo não entram em `funcoes`.
+#
+# O índice fica em cache na memória pelo sha1 do conteúdo: aplicar vários patches
+# no mesmo texto não reescaneia o arquivo. Entre execuções (rodar o mesmo script
+# de patch de novo), indexar_arquivo usa um cache em disco por arquivo, válido
+# enquanto caminho, mtime, tamanho e sha1 forem os mesmos.
+
+# Próximo ponto de interesse em cada modo; o resto do texto é pulado pelo regex
+PROXIMO_CODIGO = re.compile(r'//|/\*|"""|"|\'|[{}();\n=]|\bfun\b')
+PROXIMO_STRING = re.compile(r'\\.|"|\$\{|\n')
+PROXIMO_RAW = re.compile(r'"""|\$\{')
+PROXIMO_COMENTARIO = re.compile(r'/\*|\*/')
+PADRAO_NOME_FUN = re.compile(r'\s*(?:<[^>{}()]*>\s*)?([\w.`<>?, ]+?)\s*\(')
+PADRAO_CHAR = re.compile(r"'(?:\\.[^']*|[^'\\])'")
+
+TAMANHO_CACHE = 32
+_cache = OrderedDict()
+
+# Muda quando o formato ou a lógica do índice mudam (invalida o cache em disco)
+VERSAO_INDICE = 1
+
+def normalizar(cabecalho):
+    return " ".join(cabecalho.split())
+
+def nome_funcao(texto, pos):
+    """Nome da função declarada logo após `fun` (ignora genéricos e o receptor Tipo.)."""
+    m = PADRAO_NOME_FUN.match(texto, pos)
+    if not m:
+        return None
+    return m.group(1).split(".")[-1].strip("` ")
+
+def inicio_declaracao(texto, inicio_instrucao, fim):
+    """Primeiro caractere não branco da instrução (pula indentação e linhas vazias)."""
+    while inicio_instrucao < fim and texto[inicio_instrucao].isspace():
+        inicio_instrucao += 1
+    return inicio_instrucao
+
+def indexar(texto):
+    """Índice {"blocos": {...}, "funcoes": {...}} de `texto`, do cache se o conteúdo já foi visto."""
+    chave = hashlib.sha1(texto.encode('utf-8')).hexdigest()
+    if chave in _cache:
+        _cache.move_to_end(chave)
+        return _cache[chave]
+    indice = escanear(texto)
+    _cache[chave] = indice
+    if len(_cache) > TAMANHO_CACHE:
+        _cache.popitem(last=False)
+    return indice
+
+# ==============================================================================
+# CACHE EM DISCO
+# ==============================================================================
+
+def carregar_cache(caminho):
+    """{arquivo: entrada} salvo por salvar_cache; vazio se não existe, corrompido ou de outra versão."""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(dados, dict) or dados.get("versao") != VERSAO_INDICE:
+        return {}
+    return dados.get("arquivos", {})
+
+def salvar_cache(caminho, arquivos):
+    temporario = caminho + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({"versao": VERSAO_INDICE, "arquivos": arquivos}, f)
+    os.replace(temporario, caminho)
+
+def indexar_arquivo(arquivo, texto, arquivos):
+    """Índice de `arquivo` (já lido em `texto`), do cache em disco `arquivos` se nada mudou.
+
+    Atualiza `arquivos` quando reescaneia; retorna (índice, mudou)."""
+    st = os.stat(arquivo)
+    chave = hashlib.sha1(texto.encode('utf-8')).hexdigest()
+    entrada = arquivos.get(os.path.abspath(arquivo))
+    if (entrada and entrada["mtime"] == st.st_mtime_ns and entrada["tamanho"] == st.st_size
+            and entrada["sha1"] == chave):
+        # JSON não tem tuplas: os spans voltam como listas
+        indice = {tipo: {nome: [tuple(span) for span in spans] for nome, spans in mapa.items()}
+                  for tipo, mapa in entrada["indice"].items()}
+        _cache[chave] = indice
+        _cache.move_to_end(chave)
+        if len(_cache) > TAMANHO_CACHE:
+            _cache.popitem(last=False)
+        return indice, False
+    indice = indexar(texto)
+    arquivos[os.path.abspath(arquivo)] = {"mtime": st.st_mtime_ns, "tamanho": st.st_size,
+                                          "sha1": chave, "indice": indice}
+    return indice, True
+
+def escanear(texto):
+    blocos, funcoes = {}, {}
+    # Pilha de contextos: ("bloco", ...) para chaves de código e ("template", ...)
+    # para ${ ... }, guardando o estado da instrução de fora para restaurar no "}";
+    # ("string",) e ("raw",) enquanto dentro de strings
+    pilha = []
+    inicio_instrucao = 0
+    parenteses = 0
+    funcao = None
+    i = 0
+    n = len(texto)
+    while i < n:
+        contexto = pilha[-1][0] if pilha else "bloco"
+
+        if contexto == "string":
+            m = PROXIMO_STRING.search(texto, i)
+            if not m:
+                break
+            token = m.group()
+            i = m.end()
+            if token == '"' or token == "\n":  # "\n" = string não terminada: volta ao código
+                pilha.pop()
+            elif token == "${":
+                pilha.append(("template", inicio_instrucao, parenteses, funcao))
+                inicio_instrucao, parenteses, funcao = i, 0, None
+            continue
+
+        if contexto == "raw":
+            m = PROXIMO_RAW.search(texto, i)
+            if not m:
+                break
+            i = m.end()
+            if m.group() == '"""':
+                while i < n and texto[i] == '"':  # """" fecha no último par de aspas
+                    i += 1
+                pilha.pop()
+            else:
+                pilha.append(("template", inicio_instrucao, parenteses, funcao))
+                inicio_instrucao, parenteses, funcao = i, 0, None
+            continue
+
+        m = PROXIMO_CODIGO.search(texto, i)
+        if not m:
+            break
+        token = m.group()
+        pos = m.start()
+        i = m.end()
+
+        if token == "//":
+            fim_linha = texto.find("\n", i)
+            i = n if fim_linha == -1 else fim_linha
+        elif token == "/*":
+            profundidade = 1
+            while profundidade and i < n:
+                c = PROXIMO_COMENTARIO.search(texto, i)
+                if not c:
+                    i = n
+                    break
+                profundidade += 1 if c.group() == "/*" else -1
+                i = c.end()
+        elif token == '"""':
+            pilha.append(("raw",))
+        elif token == '"':
+            pilha.append(("string",))
+        elif token == "'":
+            c = PADRAO_CHAR.match(texto, pos)
+            if c:
+                i = c.end()
+        elif token == "(":
+            parenteses += 1
+        elif token == ")":
+            parenteses = max(parenteses - 1, 0)
+        elif token == "fun":
+            if parenteses == 0:
+                funcao = nome_funcao(texto, i)
+        elif token == "=":
+            # fun x() = expr: corpo por expressão, sem bloco próprio ("=" de parâmetro padrão fica entre parênteses)
+            if parenteses == 0 and texto[pos - 1:pos] not in "=!<>" and texto[i:i + 1] != "=":
+                funcao = None
+        elif token == "{":
+            pilha.append(("bloco", inicio_instrucao, pos, funcao, parenteses))
+            inicio_instrucao, parenteses, funcao = i, 0, None
+        elif token == "}":
+            if not pilha:
+                inicio_instrucao = i
+                continue
+            topo = pilha.pop()
+            if topo[0] == "template":
+                # Fim do ${...}: volta para a string que o contém
+                _, inicio_instrucao, parenteses, funcao = topo
+                continue
+            _, inicio_cabecalho, abre, funcao_bloco, parenteses = topo
+            inicio = inicio_declaracao(texto, inicio_cabecalho, abre)
+            span = (inicio, i)
+            cabecalho = normalizar(texto[inicio:abre])
+            blocos.setdefault(cabecalho, []).append(span)
+            if funcao_bloco:
+                funcoes.setdefault(funcao_bloco, []).append(span)
+            funcao = None
+            inicio_instrucao = i
+        elif parenteses == 0:
+            # ";" ou quebra de linha fora de parênteses: começa outra instrução
+            # (exceto a quebra entre a assinatura de uma fun e a "{" na linha seguinte)
+            if token == ";" or (token == "\n" and not funcao):
+                inicio_instrucao = i
+    for spans in blocos.values():
+        spans.sort()
+    for spans in funcoes.values():
+        spans.sort()
+    return {"blocos": blocos, "funcoes": funcoes}
+
+def localizar_funcao(texto, nome):
+    """Spans [(inicio, fim)] das funções `nome` (sobrecargas vêm todas, na ordem do arquivo)."""
+    return indexar(texto)["funcoes"].get(nome, [])
+
+def localizar_bloco(texto, cabecalho):
+    """Spans dos blocos cujo cabeçalho (espaços normalizados) é exatamente `cabecalho`."""
+    return indexar(texto)["blocos"].get(normalizar(cabecalho), [])
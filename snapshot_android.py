@@ -0,0 +1,296 @@
+import os
+import json
+import zlib
+import hashlib
+import argparse
+from bisect import bisect_left
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # Opcional: sem ele o chunking roda byte a byte, com os mesmos cortes
+    np = None
+
+import backup_android
+from restaurar_backup import PASTA_RESTAURADA, destino_seguro, selecionado
+
+# ================= CONFIGURAÇÕES =================
+# Cada snapshot é um manifesto pequeno (caminho -> lista de chunks). O conteúdo
+# fica num repositório de chunks endereçados pelo sha256, compartilhado por todos
+# os snapshots: um arquivo igual (ou quase igual) entre execuções não ocupa espaço novo.
+PASTA_SNAPSHOTS = "Snapshots_Android"
+PASTA_CHUNKS = os.path.join(PASTA_SNAPSHOTS, "chunks")
+PASTA_MANIFESTOS = os.path.join(PASTA_SNAPSHOTS, "snapshots")
+ARQUIVO_HISTORICO = os.path.join(PASTA_SNAPSHOTS, "historico.jsonl")  # Uma linha de resumo por snapshot
+
+# Chunking definido pelo conteúdo (gear hash, como o FastCDC): um corte acontece
+# quando os bits da máscara no topo do hash rolante zeram, então uma edição só muda
+# os chunks vizinhos. Os bits altos dependem dos últimos 64 bytes (os baixos, de
+# poucos bytes). Chunking normalizado: antes de CHUNK_NORMAL a máscara tem mais
+# bits (corte mais raro), depois menos, e os tamanhos se concentram perto da média.
+CHUNK_MIN = 2 * 1024
+CHUNK_NORMAL = 8 * 1024
+CHUNK_MAX = 64 * 1024
+JANELA = 64  # Bytes que o hash de 64 bits "lembra"
+BLOCO_NUMPY = 16 * 1024  # Bytes por bloco no cálculo vetorizado dos hashes
+MASCARA_PEQUENO = ((1 << 15) - 1) << (64 - 15)  # Antes de CHUNK_NORMAL
+MASCARA_GRANDE = ((1 << 11) - 1) << (64 - 11)  # Depois de CHUNK_NORMAL
+NIVEL_ZLIB = 6
+
+# Tabela fixa do gear hash: precisa ser idêntica entre execuções para os cortes baterem
+TABELA_GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], 'little') for i in range(256)]
+MASCARA_64 = (1 << 64) - 1
+
+# ================= CHUNKS =================
+
+# O hash num ponto p é sempre o dos JANELA bytes antes de p (a busca de cada chunk
+# começa JANELA bytes antes de CHUNK_MIN), então não depende de onde o chunk
+# começou: com numpy os hashes do arquivo inteiro saem vetorizados e os cortes
+# batem com os da versão byte a byte.
+
+def cortar_chunks(dados):
+    """Divide `dados` em pedaços definidos pelo conteúdo. Retorna lista de memoryview."""
+    if len(dados) <= CHUNK_MIN:
+        return [memoryview(dados)] if dados else []
+    visao = memoryview(dados)
+    if np is not None:
+        candidatos = candidatos_numpy(visao)
+        proximo = lambda inicio, fim_max: proximo_candidato(candidatos, inicio, fim_max)
+    else:
+        proximo = lambda inicio, fim_max: procurar_corte(visao, inicio, fim_max)
+    chunks = []
+    inicio = 0
+    total = len(dados)
+    while inicio < total:
+        fim_max = min(inicio + CHUNK_MAX, total)
+        corte = proximo(inicio, fim_max) if inicio + CHUNK_MIN < fim_max else fim_max
+        chunks.append(visao[inicio:corte])
+        inicio = corte
+    return chunks
+
+def procurar_corte(visao, inicio, fim_max):
+    """Primeiro p em [inicio + CHUNK_MIN, fim_max) cujo hash zera a máscara da faixa, ou fim_max."""
+    tabela = TABELA_GEAR
+    primeiro = inicio + CHUNK_MIN
+    normal = min(inicio + CHUNK_NORMAL, fim_max)
+    h = 0
+    for g in map(tabela.__getitem__, visao[primeiro - JANELA:primeiro - 1]):
+        h = ((h << 1) + g) & MASCARA_64
+    # p = posição logo depois do byte consumido
+    p = primeiro
+    for g in map(tabela.__getitem__, visao[primeiro - 1:normal - 1]):
+        h = ((h << 1) + g) & MASCARA_64
+        if not h & MASCARA_PEQUENO:
+            return p
+        p += 1
+    for g in map(tabela.__getitem__, visao[normal - 1:fim_max - 1]):
+        h = ((h << 1) + g) & MASCARA_64
+        if not h & MASCARA_GRANDE:
+            return p
+        p += 1
+    return fim_max
+
+def candidatos_numpy(visao):
+    """Posições p (fim de chunk) em que cada máscara zera, para o arquivo inteiro."""
+    tabela = np.array(TABELA_GEAR, dtype=np.uint64)
+    mascara_grande = np.uint64(MASCARA_GRANDE)
+    mascara_pequeno = np.uint64(MASCARA_PEQUENO)
+    todos = np.frombuffer(visao, dtype=np.uint8)
+    pequeno, grande = [], []
+    # Em blocos que cabem no cache, cada um com os JANELA - 1 bytes anteriores
+    for inicio in range(0, len(todos), BLOCO_NUMPY):
+        antes = min(inicio, JANELA - 1)
+        h = tabela[todos[inicio - antes:inicio + BLOCO_NUMPY]]
+        # h[i] = soma de gear[i - j] << j para j < JANELA (mod 2^64), dobrando a janela
+        largura = 1
+        while largura < JANELA:
+            h[largura:] += h[:-largura] << np.uint64(largura)
+            largura *= 2
+        h = h[antes:]
+        posicoes = np.flatnonzero((h & mascara_grande) == 0)
+        # Índice i é o hash depois do byte inicio + i: o corte fica logo depois dele
+        grande.extend((posicoes + (inicio + 1)).tolist())
+        pequeno.extend((posicoes[(h[posicoes] & mascara_pequeno) == 0] + (inicio + 1)).tolist())
+    return pequeno, grande
+
+def proximo_candidato(candidatos, inicio, fim_max):
+    pequeno, grande = candidatos
+    primeiro = inicio + CHUNK_MIN
+    normal = min(inicio + CHUNK_NORMAL, fim_max)
+    k = bisect_left(pequeno, primeiro)
+    if k < len(pequeno) and pequeno[k] < normal:
+        return pequeno[k]
+    k = bisect_left(grande, normal)
+    if k < len(grande) and grande[k] < fim_max:
+        return grande[k]
+    return fim_max
+
+def caminho_chunk(hash_chunk):
+    return os.path.join(PASTA_CHUNKS, hash_chunk[:2], hash_chunk)
+
+def gravar_chunk(dados):
+    """Grava o chunk se ainda não existir. Retorna (hash, bytes novos gravados no disco)."""
+    hash_chunk = hashlib.sha256(dados).hexdigest()
+    destino = caminho_chunk(hash_chunk)
+    if os.path.exists(destino):
+        return hash_chunk, 0
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    compactado = zlib.compress(dados, NIVEL_ZLIB)
+    temporario = destino + ".tmp"
+    with open(temporario, 'wb') as f:
+        f.write(compactado)
+    os.replace(temporario, destino)
+    return hash_chunk, len(compactado)
+
+def ler_chunk(hash_chunk):
+    with open(caminho_chunk(hash_chunk), 'rb') as f:
+        return zlib.decompress(f.read())
+
+# ================= MANIFESTOS =================
+
+def caminho_manifesto(id_snapshot):
+    return os.path.join(PASTA_MANIFESTOS, f"{id_snapshot}.json")
+
+def carregar_snapshot(id_snapshot):
+    with open(caminho_manifesto(id_snapshot), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def listar_snapshots():
+    """Resumos do historico.jsonl, do mais antigo para o mais novo (não abre os manifestos)."""
+    if not os.path.exists(ARQUIVO_HISTORICO):
+        return []
+    with open(ARQUIVO_HISTORICO, 'r', encoding='utf-8') as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+def resolver_id(id_snapshot):
+    """Aceita o id completo, um prefixo único ou 'ultimo'."""
+    ids = [s["id"] for s in listar_snapshots()]
+    if id_snapshot == "ultimo" and ids:
+        return ids[-1]
+    candidatos = [i for i in ids if i.startswith(id_snapshot)]
+    if len(candidatos) != 1:
+        raise SystemExit(f"Snapshot não encontrado ou ambíguo: {id_snapshot}")
+    return candidatos[0]
+
+# ================= OPERAÇÕES =================
+
+def criar_snapshot(descricao=""):
+    os.makedirs(PASTA_MANIFESTOS, exist_ok=True)
+    historico = listar_snapshots()
+    anterior = carregar_snapshot(historico[-1]["id"])["arquivos"] if historico else {}
+
+    id_snapshot = datetime.now().strftime("%Y%m%d_%H%M%S")
+    sufixo = 1
+    while os.path.exists(caminho_manifesto(id_snapshot)):
+        sufixo += 1
+        id_snapshot = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{sufixo}"
+
+    print(f"--- CRIANDO SNAPSHOT {id_snapshot} ---")
+    arquivos = {}
+    bytes_novos = 0
+    tamanho_total = 0
+    for _, arquivos_validos in backup_android.coletar_grupos():
+        for caminho_origem in arquivos_validos:
+            caminho_rel = os.path.relpath(caminho_origem, backup_android.DIRETORIO_RAIZ)
+            try:
+                st = os.stat(caminho_origem)
+                antigo = anterior.get(caminho_rel)
+                if antigo and antigo["mtime"] == st.st_mtime_ns and antigo["tamanho"] == st.st_size:
+                    # Mesmo mtime e tamanho do último snapshot: reaproveita a lista de chunks sem ler
+                    arquivos[caminho_rel] = antigo
+                    tamanho_total += st.st_size
+                    continue
+                with open(caminho_origem, 'rb') as f:
+                    dados = f.read()
+            except OSError as e:
+                print(f"   [ERRO] {caminho_rel}: {e}")
+                continue
+
+            chunks = []
+            for pedaco in cortar_chunks(dados):
+                hash_chunk, novos = gravar_chunk(pedaco)
+                chunks.append(hash_chunk)
+                bytes_novos += novos
+            arquivos[caminho_rel] = {"mtime": st.st_mtime_ns, "tamanho": len(dados),
+                                     "hash": hashlib.sha256(dados).hexdigest(), "chunks": chunks}
+            tamanho_total += len(dados)
+
+    resumo = {"id": id_snapshot, "criado_em": datetime.now().isoformat(timespec="seconds"),
+              "descricao": descricao, "arquivos": len(arquivos),
+              "tamanho": tamanho_total, "bytes_novos": bytes_novos}
+    temporario = caminho_manifesto(id_snapshot) + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dict(resumo, arquivos=arquivos), f, sort_keys=True)
+    os.replace(temporario, caminho_manifesto(id_snapshot))
+    with open(ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(resumo, ensure_ascii=False) + "\n")
+
+    print(f"Arquivos: {len(arquivos)} | Tamanho: {tamanho_total/1024:.0f}KB | "
+          f"Gravado em chunks novos: {bytes_novos/1024:.1f}KB")
+    return id_snapshot
+
+def diferencas(id_a, id_b):
+    """Retorna (adicionados, removidos, alterados) de A para B comparando só os hashes."""
+    a = carregar_snapshot(id_a)["arquivos"]
+    b = carregar_snapshot(id_b)["arquivos"]
+    adicionados = sorted(set(b) - set(a))
+    removidos = sorted(set(a) - set(b))
+    alterados = sorted(c for c in set(a) & set(b) if a[c]["hash"] != b[c]["hash"])
+    return adicionados, removidos, alterados
+
+def restaurar_snapshot(id_snapshot, destino, padroes=None):
+    arquivos = carregar_snapshot(id_snapshot)["arquivos"]
+    total = 0
+    for caminho_rel in sorted(arquivos):
+        if not selecionado(caminho_rel, padroes):
+            continue
+        entrada = arquivos[caminho_rel]
+        caminho = destino_seguro(destino, caminho_rel)
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        h = hashlib.sha256()
+        with open(caminho, 'wb') as f:
+            for hash_chunk in entrada["chunks"]:
+                dados = ler_chunk(hash_chunk)
+                h.update(dados)
+                f.write(dados)
+        if h.hexdigest() != entrada["hash"]:
+            print(f"   [ERRO] {caminho_rel}: conteúdo restaurado não confere com o snapshot")
+            continue
+        total += 1
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshots deduplicados do projeto Android.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_criar = sub.add_parser("criar", help="Cria um snapshot do estado atual.")
+    p_criar.add_argument("-m", "--descricao", default="")
+    sub.add_parser("listar", help="Lista os snapshots existentes.")
+    p_diff = sub.add_parser("diff", help="Mostra o que mudou entre dois snapshots.")
+    p_diff.add_argument("a")
+    p_diff.add_argument("b", nargs="?", default="ultimo")
+    p_rest = sub.add_parser("restaurar", help="Restaura um snapshot numa pasta.")
+    p_rest.add_argument("id")
+    p_rest.add_argument("--destino", default=PASTA_RESTAURADA)
+    p_rest.add_argument("--incluir", action="append", metavar="GLOB")
+    args = parser.parse_args()
+
+    if args.comando == "criar":
+        criar_snapshot(args.descricao)
+    elif args.comando == "listar":
+        for s in listar_snapshots():
+            print(f"{s['id']}  {s['arquivos']:5d} arquivos  {s['tamanho']/1024:8.0f}KB  "
+                  f"+{s['bytes_novos']/1024:.1f}KB  {s['descricao']}")
+    elif args.comando == "diff":
+        id_a, id_b = resolver_id(args.a), resolver_id(args.b)
+        adicionados, removidos, alterados = diferencas(id_a, id_b)
+        for c in adicionados:
+            print(f"+ {c}")
+        for c in removidos:
+            print(f"- {c}")
+        for c in alterados:
+            print(f"M {c}")
+        print(f"{id_a} -> {id_b}: {len(adicionados)} novos, {len(removidos)} removidos, {len(alterados)} alterados")
+    else:
+        id_snapshot = resolver_id(args.id)
+        total = restaurar_snapshot(id_snapshot, args.destino, args.incluir)
+        print(f"Snapshot {id_snapshot}: {total} arquivos restaurados em '{args.destino}'")
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+# Árvore Android pequena, com um arquivo maior que uma parte do backup (200 KB)
+ARQUIVOS_ANDROID = {
+    "settings.gradle.kts": 'include(":app")\n',
+    "app/build.gradle.kts": 'android {\n    defaultConfig {\n        versionCode = 7\n        versionName = "1.6"\n    }\n}\n',
+    "app/src/main/AndroidManifest.xml": "<manifest package=\"com.motoristapro\"/>\n",
+    "app/src/main/java/com/motoristapro/MainActivity.kt": "package com.motoristapro\n\nclass MainActivity\n",
+    "app/src/main/java/com/motoristapro/OcrService.kt": "package com.motoristapro\n\n"
+                                                         + "// linha de código com acentuação: ação\n" * 6000,
+    "app/src/main/res/layout/activity_main.xml": "<LinearLayout/>\r\n",
+    "app/src/main/res/values/strings.xml": "<resources><string name=\"app\">Motorista Pro</string></resources>\n",
+    "notas.md": "# Notas\n",
+    # Fora do backup pelas regras padrão
+    "app/build/gerado.kt": "ignorado\n",
+    "local.properties": "sdk.dir=/opt/android\n",
+    "app/src/main/res/drawable/icone.png": "\x89PNG",
+}
+IGNORADOS = {"app/build/gerado.kt", "local.properties", "app/src/main/res/drawable/icone.png"}
+
+@pytest.fixture
+def projeto_android(tmp_path, monkeypatch):
+    for caminho, conteudo in ARQUIVOS_ANDROID.items():
+        destino = tmp_path / caminho
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_bytes(conteudo.encode("utf-8"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def arquivos_do_backup():
+    """Caminhos relativos que o backup deve conter (o que as regras padrão aceitam)."""
+    return sorted(c for c in ARQUIVOS_ANDROID if c not in IGNORADOS)
+
+def ler_arvore(raiz):
+    conteudo = {}
+    for pasta, _, arquivos in os.walk(raiz):
+        for nome in arquivos:
+            caminho = os.path.join(pasta, nome)
+            conteudo[os.path.relpath(caminho, raiz).replace(os.sep, "/")] = open(caminho, 'rb').read()
+    return conteudo
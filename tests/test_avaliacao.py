@@ -0,0 +1,33 @@
+import json
+
+from analisador_ocr.avaliacao import avaliar, avaliar_arquivo, resumir
+
+CARD = [{"text": "R$ 25,90", "h": 95, "y": 800}, {"text": "5 min (1,2 km)", "h": 40, "y": 1000},
+        {"text": "20 min (8,5 km)", "h": 40, "y": 1100}]
+QUADRO = {"blocos": CARD, "pacote": "com.ubercab.driver", "altura_tela": 2400}
+
+def gravar(caminho, registros):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        for r in registros:
+            f.write(json.dumps(r) + "\n")
+    return str(caminho)
+
+def test_sem_rotulo_nao_tem_acerto(tmp_path):
+    caminho = gravar(tmp_path / "c.jsonl", [QUADRO] * 3)
+    resumo = resumir(avaliar_arquivo(caminho, ["nova_logica"])["nova_logica"])
+    assert resumo["quadros"] == 3 and resumo["rotulados"] == 0
+    assert [resumo[f"acerto_{c}"] for c in ("card", "price", "dist", "time")] == [None] * 4
+
+def test_rotulos_sem_card_so_medem_o_card(tmp_path):
+    caminho = gravar(tmp_path / "c.jsonl", [dict(QUADRO, blocos=[], rotulo=None)] * 2)
+    resumo = resumir(avaliar_arquivo(caminho, ["nova_logica"])["nova_logica"])
+    assert resumo["acerto_card"] == 1.0
+    assert resumo["acerto_price"] is None
+
+def test_acertos_com_rotulo_em_varios_arquivos(tmp_path):
+    certo = dict(QUADRO, rotulo={"price": 25.9, "dist": 9.7, "time": 25.0})
+    errado = dict(QUADRO, rotulo={"price": 30.0, "dist": 9.7, "time": 25.0})
+    arquivos = [gravar(tmp_path / "a.jsonl", [certo]), gravar(tmp_path / "b.jsonl", [errado])]
+    resumos, _ = avaliar(arquivos, ["nova_logica"], processos=1)
+    r = resumos["nova_logica"]
+    assert (r["quadros"], r["acerto_card"], r["acerto_price"], r["acerto_dist"]) == (2, 1.0, 0.5, 1.0)
@@ -0,0 +1,54 @@
+import os
+
+import backup_android
+from conftest import arquivos_do_backup
+
+def partes_com_mtime(pasta):
+    return {nome: os.stat(os.path.join(pasta, nome)).st_mtime_ns
+            for nome in os.listdir(pasta) if nome.startswith("android_")}
+
+def envelhecer(pasta):
+    """Joga o mtime das partes para o passado: qualquer regravação fica visível."""
+    for nome in os.listdir(pasta):
+        os.utime(os.path.join(pasta, nome), ns=(0, 0))
+
+def test_incremental_sem_mudancas_nao_regrava_nada(projeto_android, monkeypatch):
+    backup_android.realizar_backup_incremental(trabalhadores=2)
+    destino = projeto_android / backup_android.PASTA_DESTINO
+    envelhecer(destino)
+    antes = partes_com_mtime(destino)
+
+    def nao_reler(caminho):
+        raise AssertionError(f"{caminho} relido sem ter mudado")
+    monkeypatch.setattr(backup_android, "hash_arquivo", nao_reler)
+    backup_android.realizar_backup_incremental(trabalhadores=2)
+    assert partes_com_mtime(destino) == antes
+    assert set(antes.values()) == {0}
+
+def test_incremental_regrava_so_o_grupo_alterado(projeto_android):
+    backup_android.realizar_backup_incremental(trabalhadores=2)
+    destino = projeto_android / backup_android.PASTA_DESTINO
+    envelhecer(destino)
+
+    (projeto_android / "notas.md").write_text("# Notas\nnova linha\n", encoding="utf-8")
+    backup_android.realizar_backup_incremental(trabalhadores=2)
+    regravadas = {nome for nome, mtime in partes_com_mtime(destino).items() if mtime != 0}
+    manifesto = backup_android.carregar_manifesto()
+    grupo_notas = [nome for nome, entrada in manifesto["grupos"].items() if "notas.md" in entrada["arquivos"]]
+    assert len(grupo_notas) == 1
+    assert regravadas == set(manifesto["grupos"][grupo_notas[0]]["partes"])
+
+def test_incremental_igual_ao_completo(projeto_android):
+    backup_android.realizar_backup_incremental(trabalhadores=2)
+    (projeto_android / "app/src/main/java/com/motoristapro/MainActivity.kt").write_text("class Outra\n")
+    os.remove(projeto_android / "notas.md")
+    backup_android.realizar_backup_incremental(trabalhadores=2)
+    destino = projeto_android / backup_android.PASTA_DESTINO
+    incremental = {nome: (destino / nome).read_bytes() for nome in partes_com_mtime(destino)}
+    manifesto = backup_android.carregar_manifesto()
+    arquivos = sorted(c for entrada in manifesto["grupos"].values() for c in entrada["arquivos"])
+    assert arquivos == [c for c in arquivos_do_backup() if c != "notas.md"]
+
+    backup_android.realizar_backup(trabalhadores=2)
+    completo = {nome: (destino / nome).read_bytes() for nome in partes_com_mtime(destino)}
+    assert incremental == completo
@@ -0,0 +1,24 @@
+import pytest
+
+from analisador_ocr import VARIANTES, AnalisadorOcr, CacheQuadros
+
+# Quadro do bak2 (99): o bloco extra fica na faixa entre 5% e 10% da altura,
+# que o bak2 lê e as outras variantes cortam
+BLOCOS = [
+    {"text": "99 pop", "h": 40, "y": 900},
+    {"text": "r$ 25,90", "h": 90, "y": 800},
+    {"text": "5 min (1,2 km)", "h": 40, "y": 1000},
+    {"text": "20 min (8,5 km)", "h": 40, "y": 1100},
+]
+FAIXA_5_A_10 = BLOCOS + [{"text": "99 dinheiro 8 min", "h": 40, "y": 150}]
+
+@pytest.mark.parametrize("variante", sorted(VARIANTES))
+def test_cache_respeita_o_corte_do_topo_da_variante(variante):
+    analisador = AnalisadorOcr(variante, cache=CacheQuadros())
+    for blocos in (BLOCOS, FAIXA_5_A_10):
+        assert analisador.ler(blocos, "", 2000) == VARIANTES[variante](blocos, "", 2000)
+
+def test_bak2_le_a_faixa_entre_5_e_10_por_cento_com_cache():
+    analisador = AnalisadorOcr("bak2", cache=CacheQuadros())
+    assert analisador.ler(BLOCOS, "", 2000)[0].time == 25.0
+    assert analisador.ler(FAIXA_5_A_10, "", 2000)[0].time == 33.0
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+import controle_versao
+
+SETTINGS = 'rootProject.name = "MotoristaPro"\ninclude(":app", ":lib:core")\n'
+APP = """android {
+    defaultConfig {
+        versionCode = 14
+        versionName = "1.5"
+    }
+    productFlavors {
+        create("x") {
+            // versionCode = 99
+            versionCode = 40
+            versionName = "x"
+        }
+    }
+}
+"""
+CORE = 'android {\r\n    defaultConfig {\r\n        versionCode = 3\r\n        versionName = "2.0.9"\r\n    }\r\n}\r\n'
+
+@pytest.fixture
+def projeto(tmp_path, monkeypatch):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "lib" / "core").mkdir(parents=True)
+    (tmp_path / "settings.gradle.kts").write_text(SETTINGS, encoding="utf-8")
+    (tmp_path / "app" / "build.gradle.kts").write_text(APP, encoding="utf-8")
+    (tmp_path / "lib" / "core" / "build.gradle.kts").write_bytes(CORE.encode("utf-8"))
+    (tmp_path / controle_versao.ARQUIVO_RASTREADOR).write_text("iniciado", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def versoes(caminho):
+    with open(caminho, 'r', encoding='utf-8', newline='') as f:
+        codes, names = controle_versao.ler_versoes(f.read())
+    return [v for _, _, v in codes], [v for _, _, v in names]
+
+def test_cada_modulo_e_flavor_sobe_a_propria_versao(projeto):
+    msg, arquivos = controle_versao.atualizar_versao()
+    assert sorted(arquivos) == sorted([os.path.join("app", "build.gradle.kts"),
+                                       os.path.join("lib/core", "build.gradle.kts")])
+    assert versoes("app/build.gradle.kts") == ([15, 41], ["1.6", "x.1"])
+    assert versoes("lib/core/build.gradle.kts") == ([4], ["2.0.10"])
+    assert msg == "Bump version codes: :app 15, :lib:core 4"
+    # Comentário intacto e CRLF preservado
+    assert "// versionCode = 99" in (projeto / "app" / "build.gradle.kts").read_text(encoding="utf-8")
+    assert (projeto / "lib" / "core" / "build.gradle.kts").read_bytes().count(b"\r\n") == CORE.count("\n")
+
+def test_versao_unica_e_opcional(projeto):
+    msg, _ = controle_versao.atualizar_versao(versao_unica=True)
+    assert versoes("app/build.gradle.kts") == ([41, 41], ["1.6", "1.6"])
+    assert versoes("lib/core/build.gradle.kts") == ([41], ["1.6"])
+    assert msg == "Bump version code: 41"
+
+def test_simular_nao_grava(projeto):
+    assert controle_versao.atualizar_versao(simular=True) == (None, [])
+    assert (projeto / "app" / "build.gradle.kts").read_text(encoding="utf-8") == APP
+
+def test_gravar_todos_desfaz_os_ja_renomeados(projeto, monkeypatch):
+    plano = {"app/build.gradle.kts": (APP, "novo app"), "lib/core/build.gradle.kts": (CORE, "novo core")}
+    replace = os.replace
+    chamadas = []
+
+    def replace_que_falha(origem, destino):
+        chamadas.append(destino)
+        if len(chamadas) == 2:
+            raise OSError("disco cheio")
+        replace(origem, destino)
+
+    monkeypatch.setattr(os, "replace", replace_que_falha)
+    with pytest.raises(OSError):
+        controle_versao.gravar_todos(plano)
+    assert (projeto / "app" / "build.gradle.kts").read_text(encoding="utf-8") == APP
+    assert (projeto / "lib" / "core" / "build.gradle.kts").read_bytes() == CORE.encode("utf-8")
+    assert not list(projeto.rglob("*.tmp"))
@@ -0,0 +1,79 @@
+import json
+import random
+
+import pytest
+
+from analisador_ocr.filtros import (FiltroBlocos, REGRA_ESPELHO, VOCABULARIO_NOVA_LOGICA, carregar_filtro,
+                                    carregar_vocabulario)
+
+# Termos com prefixos e sufixos em comum, repetidos entre regras, maiúsculas e
+# metacaracteres de regex
+VOCABULARIO_PROPRIO = {
+    "curto": ["ab", "x.y"],
+    "longo": ["abc", "bcd", "AB"],
+    "meio": ["b", "(r$)", ""],
+    "ultimo": ["cd", "abcd", "[z]"],
+}
+
+def referencia(texto, vocabulario, espelho=True):
+    """A corrente de ifs com contains do NOVA_LOGICA: a primeira regra com algum termo ganha."""
+    if espelho and texto.startswith("[") and "]" in texto:
+        return REGRA_ESPELHO
+    for regra, termos in vocabulario.items():
+        if any(termo and termo.lower() in texto for termo in termos):
+            return regra
+    return None
+
+def textos_aleatorios(vocabulario, semente, quantidade):
+    termos = [t.lower() for ts in vocabulario.values() for t in ts if t]
+    pedacos = termos + [t[:-1] for t in termos] + [t[1:] for t in termos] + list("[] abcdxyz.$()")
+    rng = random.Random(semente)
+    for _ in range(quantidade):
+        yield "".join(rng.choice(pedacos) for _ in range(rng.randint(0, 6)))
+
+@pytest.mark.parametrize("vocabulario", [VOCABULARIO_NOVA_LOGICA, VOCABULARIO_PROPRIO], ids=["nova_logica", "proprio"])
+@pytest.mark.parametrize("espelho", [True, False])
+def test_igual_a_corrente_de_contains(vocabulario, espelho):
+    filtro = FiltroBlocos(vocabulario, espelho=espelho)
+    for texto in textos_aleatorios(vocabulario, 25, 20000):
+        esperado = referencia(texto, vocabulario, espelho)
+        assert filtro.verificar(texto) == esperado, texto
+        assert filtro.descarta(texto) == (esperado is not None), texto
+
+@pytest.mark.parametrize("texto, regra", [
+    ("[12:30] lido: r$ 10", REGRA_ESPELHO),
+    ("limpo: candidato", "log_limpo"),
+    ("candidato lido:", "log_lido"),
+    ("ganhe r$/km hoje", "promocao"),
+    ("1,20 r$/km", "indicador"),
+    ("motorista pro - configurações", "app_proprio"),
+    ("r$ 25,90", None),
+])
+def test_prioridade_das_regras(texto, regra):
+    assert FiltroBlocos().verificar(texto) == regra
+
+def test_contagem_por_regra():
+    filtro = FiltroBlocos(VOCABULARIO_PROPRIO, contar=True)
+    for texto in ["[a]", "abcd", "zzz", "cd", "x.y b"]:
+        filtro.verificar(texto)
+    assert filtro.estatisticas() == {
+        "verificados": 5, "descartados": 4,
+        "por_regra": {REGRA_ESPELHO: 1, "curto": 2, "longo": 0, "meio": 0, "ultimo": 1},
+    }
+
+def test_vocabulario_vazio_nao_descarta():
+    filtro = FiltroBlocos({}, espelho=False)
+    assert filtro.verificar("qualquer coisa") is None
+    assert not filtro.descarta("")
+
+def test_vocabulario_em_json(tmp_path):
+    caminho = tmp_path / "vocabulario.json"
+    caminho.write_text(json.dumps(VOCABULARIO_PROPRIO), encoding="utf-8")
+    filtro = carregar_filtro(str(caminho))
+    assert filtro.regras == [REGRA_ESPELHO] + list(VOCABULARIO_PROPRIO)
+    assert filtro.verificar("xbcdx") == "longo"
+    assert carregar_filtro(None) is None
+
+    caminho.write_text(json.dumps(["lido:"]), encoding="utf-8")
+    with pytest.raises(ValueError):
+        carregar_vocabulario(str(caminho))
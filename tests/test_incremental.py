@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from analisador_ocr import ESTADOS, VARIANTES, LeituraIncremental
+from analisador_ocr.benchmark import TEXTOS_SINTETICOS, quadros_sinteticos
+from analisador_ocr.incremental import ler_fluxo
+
+PACOTES = ("com.ubercab.driver", "com.taxis99", "")
+EXTRAS = ("99 pop", "uberx", "dinheiro", "(1,2 km)", "(800 m)", "1 h 5 min", "10:45", "meta de ganhos",
+          "lido: r$ 9,90", "[12/03] x", "R$ 7,50", "R$ 1.234,56", "25,90", "3 km", "")
+
+def quadros_sorteados(quantidade, semente=0):
+    sorteio = random.Random(semente)
+    textos = TEXTOS_SINTETICOS + EXTRAS
+    for _ in range(quantidade):
+        altura = sorteio.choice((0, 2000, 2400))
+        blocos = [{"text": sorteio.choice(textos), "h": sorteio.choice((30, 40, 85, 90, 95)),
+                   "y": sorteio.randint(0, altura or 2400)} for _ in range(sorteio.randint(0, 14))]
+        yield blocos, sorteio.choice(PACOTES), altura
+
+@pytest.mark.parametrize("variante", sorted(ESTADOS))
+def test_leitura_final_igual_ao_lote(variante):
+    quadros = list(quadros_sorteados(400))
+    quadros += [(q["blocos"], q["pacote"], q["altura_tela"]) for q in quadros_sinteticos(12, 50)]
+    for blocos, pacote, altura in quadros:
+        leitura = LeituraIncremental(variante, pacote, altura)
+        provisorias = [leitura.adicionar(bloco) for bloco in blocos]
+        final = leitura.concluir()
+        assert final == VARIANTES[variante](blocos, pacote, altura)
+        # A última provisória emitida é a leitura final
+        emitidas = [p for p in provisorias if p is not None]
+        if final[0] is not None:
+            assert emitidas and emitidas[-1] == final[0]
+
+def test_fluxo_emite_provisoria_antes_da_final():
+    eventos = [{"quadro": {"pacote": "com.ubercab.driver", "altura_tela": 2400}},
+               {"text": "R$ 25,90", "h": 95, "y": 800},
+               {"text": "5 min (1,2 km)", "h": 40, "y": 1000},
+               {"text": "20 min (8,5 km)", "h": 40, "y": 1100},
+               {"fim": True}]
+    saidas = list(ler_fluxo(eventos))
+    assert [("provisoria" in s, "final" in s) for s in saidas] == [(True, False), (True, False), (False, True)]
+    assert saidas[-1]["final"] == saidas[-2]["provisoria"]
+
+def test_variante_sem_estado_falha():
+    with pytest.raises(ValueError):
+        LeituraIncremental("inexistente")
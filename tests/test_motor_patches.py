@@ -0,0 +1,96 @@
+import os
+import re
+import shutil
+
+import pytest
+
+import fix_ocr_logic
+import motor_patches
+import pipeline_git
+import update_ocr_logs
+import update_permissions_text
+
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Versões antigas dos blocos de permissão, como estavam antes do update_permissions_text
+OVERLAY_ANTIGO = """if (!Settings.canDrawOverlays(this)) {
+            Toast.makeText(this, "Permita a sobreposição", Toast.LENGTH_LONG).show()
+            val intent = Intent(Settings.ACTION_MANAGE_OVERLAY_PERMISSION, Uri.parse("package:$packageName"))
+            startActivity(intent)
+            return
+        }"""
+ACESSIBILIDADE_ANTIGO = """if (!isAccessibilityServiceEnabled()) {
+            Toast.makeText(this, "Ative a acessibilidade { Motorista Pro }", Toast.LENGTH_LONG).show()
+            startActivity(Intent(Settings.ACTION_ACCESSIBILITY_SETTINGS))
+            return
+        }"""
+
+# Lógica dos scripts originais (regex + replace), referência para o motor
+def referencia_analyze(conteudo, novo):
+    m = re.search(r'private fun analyzeSmartData.*?private fun showCard', conteudo, re.DOTALL)
+    return conteudo.replace(m.group(0), novo.strip() + "\n\n    private fun showCard")
+
+def referencia_permissoes(conteudo):
+    for regex, texto in ((r'if \(!Settings\.canDrawOverlays\(this\)\) \{[\s\S]*?return\s+}',
+                          update_permissions_text.TEXTO_OVERLAY),
+                         (r'if \(!isAccessibilityServiceEnabled\(\)\) \{[\s\S]*?return\s+}',
+                          update_permissions_text.TEXTO_ACESSIBILIDADE)):
+        m = re.search(regex, conteudo)
+        conteudo = conteudo.replace(m.group(0), texto.strip())
+    return conteudo
+
+@pytest.fixture
+def fontes(tmp_path, monkeypatch):
+    for alvo in (fix_ocr_logic.ARQUIVO_ALVO, update_permissions_text.ARQUIVO_ALVO):
+        (tmp_path / alvo).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(os.path.join(RAIZ_REPO, alvo), tmp_path / alvo)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pipeline_git, "PASTA_GIT", str(tmp_path))
+    return tmp_path
+
+def ler(caminho):
+    with open(caminho, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+def gravar(caminho, conteudo):
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        f.write(conteudo)
+
+def aplicar_duas_vezes(patches, arquivo):
+    """Aplica, confere que a segunda rodada não muda nada e retorna o conteúdo final."""
+    assert motor_patches.aplicar_patches(patches) == [arquivo]
+    depois = ler(arquivo)
+    assert motor_patches.aplicar_patches(patches) == []
+    assert ler(arquivo) == depois
+    return depois
+
+@pytest.mark.parametrize("anterior, script", [(fix_ocr_logic.NOVA_LOGICA, update_ocr_logs),
+                                              (update_ocr_logs.NOVO_ANALYZE, fix_ocr_logic)])
+def test_analyze_igual_ao_script_original(fontes, anterior, script):
+    arquivo = script.ARQUIVO_ALVO
+    gravar(arquivo, referencia_analyze(ler(arquivo), anterior))
+    esperado = referencia_analyze(ler(arquivo), script.PATCHES[0]["novo"])
+
+    assert aplicar_duas_vezes(script.PATCHES, arquivo) == esperado
+
+def test_permissoes_iguais_ao_script_original(fontes):
+    arquivo = update_permissions_text.ARQUIVO_ALVO
+    conteudo = ler(arquivo)
+    conteudo = conteudo.replace(update_permissions_text.TEXTO_OVERLAY.strip(), OVERLAY_ANTIGO)
+    conteudo = conteudo.replace(update_permissions_text.TEXTO_ACESSIBILIDADE.strip(), ACESSIBILIDADE_ANTIGO)
+    gravar(arquivo, conteudo)
+
+    assert aplicar_duas_vezes(update_permissions_text.PATCHES, arquivo) == referencia_permissoes(conteudo)
+
+def test_fontes_atuais_ja_estao_aplicadas(fontes):
+    antes = {alvo: ler(alvo) for alvo in (fix_ocr_logic.ARQUIVO_ALVO, update_permissions_text.ARQUIVO_ALVO)}
+    assert motor_patches.aplicar_patches(fix_ocr_logic.PATCHES + update_permissions_text.PATCHES) == []
+    assert {alvo: ler(alvo) for alvo in antes} == antes
+
+def test_falha_em_um_arquivo_nao_grava_nenhum(fontes):
+    antes = ler(update_ocr_logs.ARQUIVO_ALVO)
+    quebrado = dict(update_permissions_text.PATCHES[0], bloco="if (naoExiste())", novo="if (x) {}")
+    with pytest.raises(motor_patches.ErroPatch):
+        motor_patches.aplicar_patches(update_ocr_logs.PATCHES + [quebrado])
+    assert ler(update_ocr_logs.ARQUIVO_ALVO) == antes
+    assert not os.path.exists(update_ocr_logs.ARQUIVO_ALVO + ".tmp")
@@ -0,0 +1,66 @@
+import os
+import json
+import subprocess
+
+import pytest
+
+import pipeline_git
+
+def git(*args, cwd=None):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+@pytest.fixture
+def repositorio(tmp_path, monkeypatch):
+    remoto = tmp_path / "remoto.git"
+    local = tmp_path / "local"
+    git("init", "-q", "--bare", str(remoto))
+    git("init", "-q", str(local))
+    for chave, valor in (("user.email", "ci@example.com"), ("user.name", "ci")):
+        git("config", chave, valor, cwd=local)
+    (local / "a.txt").write_text("a\n")
+    git("add", "a.txt", cwd=local)
+    git("commit", "-q", "-m", "inicial", cwd=local)
+    git("remote", "add", "origin", str(remoto), cwd=local)
+    git("push", "-q", "-u", "origin", "HEAD", cwd=local)
+    monkeypatch.chdir(local)
+    monkeypatch.setattr(pipeline_git, "PASTA_GIT", None)
+    return local
+
+def test_fila_fica_dentro_do_git(repositorio):
+    (repositorio / "a.txt").write_text("b\n")
+    pipeline_git.enfileirar(["a.txt"], "altera a")
+    assert os.path.exists(repositorio / ".git" / pipeline_git.ARQUIVO_FILA)
+    assert git("status", "--porcelain") == " M a.txt\n"
+
+def test_entrada_ruim_vai_para_a_quarentena(repositorio):
+    (repositorio / "a.txt").write_text("b\n")
+    pipeline_git.enfileirar(["a.txt", "nunca_existiu.txt"], "altera a")
+    assert pipeline_git.descarregar_fila(push=False)
+    assert git("log", "-1", "--format=%s") == "altera a\n"
+    assert not os.path.exists(pipeline_git.arquivo_interno(pipeline_git.ARQUIVO_FILA))
+    with open(pipeline_git.arquivo_interno(pipeline_git.ARQUIVO_QUARENTENA), encoding='utf-8') as f:
+        assert json.load(f)[0]["arquivos"] == ["nunca_existiu.txt"]
+    # A fila não fica presa: a próxima descarga funciona
+    (repositorio / "a.txt").write_text("c\n")
+    pipeline_git.enfileirar(["a.txt"], "altera a de novo")
+    assert pipeline_git.descarregar_fila(push=False)
+
+def test_commit_durante_a_liberacao_da_trava_tambem_sobe(repositorio, monkeypatch):
+    (repositorio / "a.txt").write_text("b\n")
+    git("commit", "-q", "-am", "primeiro")
+    remover = os.remove
+    corridas = []
+
+    def remover_com_commit_concorrente(caminho):
+        # Outro disparo commita enquanto a trava ainda existe (ele vê a trava viva e sai)
+        if caminho.endswith(pipeline_git.ARQUIVO_TRAVA_PUSH) and not corridas:
+            corridas.append(caminho)
+            (repositorio / "a.txt").write_text("c\n")
+            git("commit", "-q", "-am", "concorrente")
+            assert pipeline_git.enviar()  # Sai na hora: a trava é deste processo
+        remover(caminho)
+
+    monkeypatch.setattr(os, "remove", remover_com_commit_concorrente)
+    assert pipeline_git.enviar()
+    assert corridas
+    assert pipeline_git.commits_pendentes() == 0
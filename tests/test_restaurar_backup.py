@@ -0,0 +1,50 @@
+import pytest
+
+import backup_android
+import restaurar_backup
+from conftest import ARQUIVOS_ANDROID, arquivos_do_backup, ler_arvore
+
+# O backup grava texto com quebras de linha universais: CRLF volta como LF
+def esperado(caminho):
+    return ARQUIVOS_ANDROID[caminho].replace("\r\n", "\n").encode("utf-8")
+
+@pytest.mark.parametrize("empacotar", [False, True])
+@pytest.mark.parametrize("formato", sorted(backup_android.FORMATOS))
+def test_backup_restaura_e_verifica(projeto_android, formato, empacotar):
+    if formato == "zst" and backup_android.zstandard is None:
+        pytest.skip("zstandard não instalado")
+    backup_android.realizar_backup(trabalhadores=2, formato=formato, empacotar=empacotar)
+    destino = projeto_android / restaurar_backup.PASTA_RESTAURADA
+
+    assert restaurar_backup.restaurar(backup_android.PASTA_DESTINO, str(destino)) == len(arquivos_do_backup())
+    assert ler_arvore(destino) == {c: esperado(c) for c in arquivos_do_backup()}
+    assert restaurar_backup.verificar(backup_android.PASTA_DESTINO)
+
+@pytest.mark.parametrize("formato", ["txt", "gz"])
+def test_restauracao_parcial(projeto_android, formato):
+    backup_android.realizar_backup(trabalhadores=2, formato=formato, empacotar=True)
+    destino = projeto_android / restaurar_backup.PASTA_RESTAURADA
+    padroes = ["app/src/**/*.kt"]
+
+    assert restaurar_backup.restaurar(backup_android.PASTA_DESTINO, str(destino), padroes) == 2
+    kotlin = [c for c in arquivos_do_backup() if c.endswith(".kt")]
+    assert ler_arvore(destino) == {c: esperado(c) for c in kotlin}
+
+def test_verificar_acusa_diferencas(projeto_android, capsys):
+    backup_android.realizar_backup(trabalhadores=2)
+    (projeto_android / "notas.md").write_text("# Outras notas\n", encoding="utf-8")
+    (projeto_android / "app/src/main/java/com/motoristapro/Novo.kt").write_text("class Novo\n")
+    (projeto_android / "app/src/main/res/values/strings.xml").unlink()
+    capsys.readouterr()
+
+    assert not restaurar_backup.verificar(backup_android.PASTA_DESTINO)
+    saida = capsys.readouterr().out
+    assert "[DIFERENTE] notas.md" in saida
+    assert "[FALTA NO BACKUP] app/src/main/java/com/motoristapro/Novo.kt" in saida
+    assert "[SÓ NO BACKUP] app/src/main/res/values/strings.xml" in saida
+
+def test_verificar_usa_as_regras_do_backup(projeto_android):
+    regras = backup_android.regras_padrao(excluir=["*.md"])
+    backup_android.realizar_backup(trabalhadores=2, regras=regras)
+    assert not restaurar_backup.verificar(backup_android.PASTA_DESTINO)
+    assert restaurar_backup.verificar(backup_android.PASTA_DESTINO, regras=regras)
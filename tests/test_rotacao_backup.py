@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from rotacao_backup import RepositorioBackup
+
+ARQUIVO = "app/build.gradle.kts"
+
+@pytest.fixture
+def repositorio(tmp_path):
+    repositorio = RepositorioBackup(str(tmp_path / "backup_automatico"), legados={})
+    inicio = datetime(2026, 3, 1, 12, 0, 0)
+    for code in range(1, 15):
+        repositorio.adicionar(ARQUIVO, str(code), inicio + timedelta(minutes=code),
+                              dados=f"versionCode = {code}\n".encode())
+    return repositorio
+
+def test_versao_vence_prefixo_de_id_e_de_hash(repositorio):
+    # Ids começam com "2026..." e hashes são hex: "2", "7" e "8" também são prefixos deles
+    for code in range(1, 15):
+        entrada = repositorio.procurar(str(code))
+        assert entrada["versao"] == str(code)
+        assert repositorio.ler(entrada) == f"versionCode = {code}\n".encode()
+
+def test_id_exato_e_prefixo_unico_de_id_ou_hash(repositorio):
+    alvo = repositorio.entradas[4]
+    assert repositorio.procurar(alvo["id"]) is alvo
+    assert repositorio.procurar(alvo["id"][:-3]) is alvo
+    assert repositorio.procurar(alvo["hash"][:12]) is alvo
+
+def test_prefixo_ambiguo_falha(repositorio):
+    with pytest.raises(KeyError):
+        repositorio.procurar("2026")
+    with pytest.raises(KeyError):
+        repositorio.restaurar("2026")
+
+def test_ultimo_e_filtro_por_arquivo(repositorio, tmp_path):
+    assert repositorio.procurar("ultimo")["versao"] == "14"
+    assert repositorio.procurar("ultimo", "lib/build.gradle.kts") is None
+    entrada, destino = repositorio.restaurar("3", destino=str(tmp_path / "restaurado.kts"))
+    assert entrada["versao"] == "3"
+    assert open(destino, 'rb').read() == b"versionCode = 3\n"
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+import motor_patches
+import pipeline_git
+import scanner_kotlin
+
+FONTE = """class OcrService {
+    private fun analyzeSmartData(texto: String) {
+        val s = "}"
+        if (texto.isEmpty()) { return }
+    }
+
+    private fun showCard() {
+    }
+}
+"""
+
+PATCH = {"arquivo": "OcrService.kt", "descricao": "nova analyze", "funcao": "analyzeSmartData",
+         "novo": "private fun analyzeSmartData(texto: String) {\n    }"}
+
+@pytest.fixture
+def projeto(tmp_path, monkeypatch):
+    (tmp_path / "OcrService.kt").write_text(FONTE, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pipeline_git, "PASTA_GIT", str(tmp_path))
+    scanner_kotlin._cache.clear()
+    return tmp_path
+
+def contar_escaneamentos(monkeypatch):
+    chamadas = []
+    original = scanner_kotlin.escanear
+    def escanear(texto):
+        chamadas.append(texto)
+        return original(texto)
+    monkeypatch.setattr(scanner_kotlin, "escanear", escanear)
+    return chamadas
+
+def test_indice_persiste_entre_execucoes(projeto, monkeypatch):
+    chamadas = contar_escaneamentos(monkeypatch)
+    plano = motor_patches.planejar([PATCH])
+    assert len(chamadas) == 1
+    assert (projeto / motor_patches.ARQUIVO_CACHE_INDICES).exists()
+
+    # "Nova execução": sem cache na memória, o índice vem do disco
+    scanner_kotlin._cache.clear()
+    assert motor_patches.planejar([PATCH]) == plano
+    assert len(chamadas) == 1
+
+def test_cache_em_disco_invalida_quando_o_arquivo_muda(projeto, monkeypatch):
+    chamadas = contar_escaneamentos(monkeypatch)
+    motor_patches.planejar([PATCH])
+    scanner_kotlin._cache.clear()
+
+    (projeto / "OcrService.kt").write_text("// topo\n" + FONTE, encoding="utf-8")
+    ((inicio, fim),) = scanner_kotlin.localizar_funcao("// topo\n" + FONTE, "analyzeSmartData")
+    scanner_kotlin._cache.clear()
+    chamadas.clear()
+    original, novo, _ = motor_patches.planejar([PATCH])["OcrService.kt"]
+    assert len(chamadas) == 1
+    assert novo == original[:inicio] + PATCH["novo"] + original[fim:]
+
+def test_cache_corrompido_e_ignorado(projeto):
+    (projeto / motor_patches.ARQUIVO_CACHE_INDICES).write_text("{quebrado", encoding="utf-8")
+    assert "OcrService.kt" in motor_patches.planejar([PATCH])
+    assert scanner_kotlin.carregar_cache(str(projeto / motor_patches.ARQUIVO_CACHE_INDICES)) != {}
+
+def test_spans_do_disco_sao_tuplas(projeto):
+    arquivos = {}
+    indice, mudou = scanner_kotlin.indexar_arquivo("OcrService.kt", FONTE, arquivos)
+    assert mudou
+    scanner_kotlin.salvar_cache("cache.json", arquivos)
+    scanner_kotlin._cache.clear()
+    do_disco, mudou = scanner_kotlin.indexar_arquivo("OcrService.kt", FONTE,
+                                                     scanner_kotlin.carregar_cache("cache.json"))
+    assert not mudou
+    assert do_disco == indice
+    assert all(isinstance(span, tuple) for spans in do_disco["funcoes"].values() for span in spans)
+    assert not os.path.exists("cache.json.tmp")
@@ -0,0 +1,58 @@
+import os
+import random
+
+import pytest
+
+import snapshot_android
+from conftest import arquivos_do_backup, ler_arvore
+
+def pedacos(dados):
+    return [bytes(c) for c in snapshot_android.cortar_chunks(dados)]
+
+def amostras():
+    sorteio = random.Random(6)
+    yield b""
+    yield b"x"
+    for tamanho in (snapshot_android.CHUNK_MIN, snapshot_android.CHUNK_MIN + 1, 16383, 16385, 70000, 300000):
+        yield sorteio.randbytes(tamanho)
+    yield b"a" * 200000
+    yield bytes(sorteio.choice(b"ab \n") for _ in range(100000))
+
+@pytest.mark.parametrize("dados", list(amostras()), ids=len)
+def test_chunks_cobrem_os_dados_dentro_dos_limites(dados):
+    chunks = pedacos(dados)
+    assert b"".join(chunks) == dados
+    assert all(len(c) <= snapshot_android.CHUNK_MAX for c in chunks)
+    assert all(len(c) >= snapshot_android.CHUNK_MIN for c in chunks[:-1])
+
+@pytest.mark.skipif(snapshot_android.np is None, reason="requer numpy")
+@pytest.mark.parametrize("dados", list(amostras()), ids=len)
+def test_numpy_corta_igual_ao_byte_a_byte(dados, monkeypatch):
+    com_numpy = pedacos(dados)
+    monkeypatch.setattr(snapshot_android, "np", None)
+    assert pedacos(dados) == com_numpy
+
+def test_edicao_so_muda_os_chunks_vizinhos():
+    dados = random.Random(1).randbytes(1 << 20)
+    editado = dados[:500000] + b"inserido" + dados[500000:]
+    antes, depois = pedacos(dados), pedacos(editado)
+    assert len(set(antes) - set(depois)) <= 2
+    # O corte depende dos últimos JANELA bytes, não só dos 13 finais
+    assert sum(map(len, antes)) / len(antes) > snapshot_android.CHUNK_MIN * 2
+
+def test_snapshot_e_restauracao(projeto_android):
+    primeiro = snapshot_android.criar_snapshot("primeiro")
+    (projeto_android / "app/src/main/java/com/motoristapro/MainActivity.kt").write_text("class Outra\n")
+    segundo = snapshot_android.criar_snapshot("segundo")
+    assert snapshot_android.diferencas(primeiro, segundo) == (
+        [], [], ["app/src/main/java/com/motoristapro/MainActivity.kt"])
+    assert snapshot_android.listar_snapshots()[-1]["bytes_novos"] < 1024
+
+    destino = projeto_android / "restaurado"
+    assert snapshot_android.restaurar_snapshot(primeiro, str(destino)) == len(arquivos_do_backup())
+    original = ler_arvore(projeto_android)
+    restaurado = ler_arvore(destino)
+    assert sorted(restaurado) == arquivos_do_backup()
+    for caminho, dados in restaurado.items():
+        if not caminho.endswith("MainActivity.kt"):
+            assert dados == original[caminho]
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from analisador_ocr import sanitizar_erros_ocr
+from analisador_ocr.tokenizador import extrair_referencia, extrair_tokens
+
+# Pedaços que exercitam os cantos das regex: prefixo de preço, decimais, unidades
+# parecidas (min x minuto x mineiro, m x metro, h x hora), horários e espaços
+PEDACOS = ["r$", "rs", "r", "$", "s", "(", ")", ".", ":", " ", "  ", "\t", " ", "0", "7", "12", "305",
+           "4.5", "25.90", "1.234", "12:30", "9:05", "km", "k", "m", "mi", "min", "mins", "minutos",
+           "m1n", "m1ns", "metro", "mil", "mine", "mina", "mino", "h", "hr", "hrs", "hora", "horas",
+           "horario", "e", "a", "o", "l", "in", "x", "uber", "99", "١", "²", ","]
+
+CASOS = [
+    "", "r$ 25.90", "rs12", "r$ 7 r$ 9.99", "5 min (1.2 km)", "20 min (8.5 km)", "800 m",
+    "1 h 5 min", "1h5min", "12:30 15 min", "9:05min", "10 minutos", "3 mineiros", "4 metros",
+    "2 horas 3 hrs", "(300m)", "1.5km2km", "r$25.90 12 min 3.4 km", "7 m1ns 8 m1n", "r$ \t 4.50",
+    "12:345 min", "1:2:30 h", "١ min", "5 km", "5² km", "rs 10.999",
+]
+
+def texto_aleatorio(rng):
+    return "".join(rng.choice(PEDACOS) for _ in range(rng.randint(0, 14)))
+
+@pytest.mark.parametrize("texto", CASOS)
+def test_casos_conhecidos(texto):
+    assert extrair_tokens(texto) == extrair_referencia(texto)
+
+def test_textos_aleatorios_iguais_a_referencia():
+    rng = random.Random(17)
+    for _ in range(20000):
+        texto = texto_aleatorio(rng)
+        assert extrair_tokens(texto) == extrair_referencia(texto), texto
+
+def test_textos_sanitizados_iguais_a_referencia():
+    rng = random.Random(25)
+    for _ in range(5000):
+        limpo = sanitizar_erros_ocr(texto_aleatorio(rng).upper().replace(".", ","))
+        assert extrair_tokens(limpo) == extrair_referencia(limpo), limpo
@@ -1,4 +1,4 @@
-import os
+from motor_patches import executar, executar_script
 
 PROJETO = "MotoristaPro-Android"
 ARQUIVO_ALVO = "app/src/main/java/com/motoristapro/android/OcrService.kt"
@@ -146,42 +146,17 @@ NOVO_ANALYZE = r"""
     }
 """
 
-def log(msg): print(f"\033[36m[{PROJETO}] {msg}\033[0m")
-
-def aplicar():
-    if not os.path.exists(ARQUIVO_ALVO):
-        log("Arquivo não encontrado.")
-        return
-
-    with open(ARQUIVO_ALVO, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Usa Regex para encontrar e substituir o método analyzeSmartData antigo
-    # Procura desde "private fun analyzeSmartData" até o fechamento antes de "private fun showCard"
-    
-    # Estratégia: Identificar o cabeçalho da função e substituir tudo até o início da próxima função
-    pattern = r'private fun analyzeSmartData.*?private fun showCard'
-    
-    # Verifica se a próxima função é showCard (padrão do arquivo que mandei)
-    import re
-    match = re.search(pattern, content, re.DOTALL)
-    
-    if match:
-        # Reconstrói o bloco substituindo o corpo
-        novo_bloco = NOVO_ANALYZE.strip() + "\n\n    private fun showCard"
-        new_content = content.replace(match.group(0), novo_bloco)
-        
-        with open(ARQUIVO_ALVO, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        log("Logs de diagnóstico detalhados aplicados com sucesso!")
-        
-        os.system("git add .")
-        os.system('git commit -m "Dev: Logs detalhados de OCR para diagnostico"')
-        os.system("git push")
-        log("Git Push realizado.")
-    else:
-        log("Não foi possível localizar o método analyzeSmartData para substituição.")
+# Substitui o método analyzeSmartData antigo inteiro
+PATCHES = [
+    {"arquivo": ARQUIVO_ALVO,
+     "descricao": "Logs de diagnóstico detalhados aplicados com sucesso!",
+     "funcao": "analyzeSmartData",
+     "novo": NOVO_ANALYZE.strip()},
+]
+MENSAGEM = "Dev: Logs detalhados de OCR para diagnostico"
 
-if __name__ == "__main__":
-    aplicar()
+def aplicar(simular=False):
+    return executar(PATCHES, [MENSAGEM], simular)
 
+if __name__ == "__main__":
+    executar_script(PATCHES, MENSAGEM)
@@ -1,5 +1,4 @@
-import os
-import re
+from motor_patches import executar, executar_script
 
 PROJETO = "MotoristaPro-Android"
 ARQUIVO_ALVO = "app/src/main/java/com/motoristapro/android/MainActivity.kt"
@@ -34,49 +33,21 @@ TEXTO_ACESSIBILIDADE = """
         }
 """
 
-def log(msg): print(f"\033[36m[{PROJETO}] {msg}\033[0m")
-
-def aplicar():
-    if not os.path.exists(ARQUIVO_ALVO):
-        log("Arquivo não encontrado.")
-        return
-
-    with open(ARQUIVO_ALVO, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Substituição Inteligente usando Regex para capturar os blocos if antigos
-    
-    # 1. Overlay
-    # Procura: if (!Settings.canDrawOverlays(this)) { ... }
-    # O regex pega o if até o return correspondente
-    regex_overlay = r'if \(!Settings\.canDrawOverlays\(this\)\) \{[\s\S]*?return\s+}'
-    
-    match_overlay = re.search(regex_overlay, content)
-    if match_overlay:
-        content = content.replace(match_overlay.group(0), TEXTO_OVERLAY.strip())
-        log("Texto de permissão Overlay atualizado.")
-    else:
-        log("Não encontrei o bloco de permissão Overlay.")
-
-    # 2. Acessibilidade
-    # Procura: if (!isAccessibilityServiceEnabled()) { ... }
-    regex_access = r'if \(!isAccessibilityServiceEnabled\(\)\) \{[\s\S]*?return\s+}'
-    
-    match_access = re.search(regex_access, content)
-    if match_access:
-        content = content.replace(match_access.group(0), TEXTO_ACESSIBILIDADE.strip())
-        log("Texto de permissão Acessibilidade atualizado.")
-    else:
-        log("Não encontrei o bloco de permissão Acessibilidade.")
-
-    with open(ARQUIVO_ALVO, 'w', encoding='utf-8') as f:
-        f.write(content)
-        
-    os.system("git add .")
-    os.system('git commit -m "UX: Textos de permissao mais claros e profissionais"')
-    os.system("git push")
-    log("Git Push realizado.")
+# Cada patch troca o if da permissão inteiro, até a "}" correspondente
+PATCHES = [
+    {"arquivo": ARQUIVO_ALVO,
+     "descricao": "Texto de permissão Overlay atualizado.",
+     "bloco": "if (!Settings.canDrawOverlays(this))",
+     "novo": TEXTO_OVERLAY.strip()},
+    {"arquivo": ARQUIVO_ALVO,
+     "descricao": "Texto de permissão Acessibilidade atualizado.",
+     "bloco": "if (!isAccessibilityServiceEnabled())",
+     "novo": TEXTO_ACESSIBILIDADE.strip()},
+]
+MENSAGEM = "UX: Textos de permissao mais claros e profissionais"
+
+def aplicar(simular=False):
+    return executar(PATCHES, [MENSAGEM], simular)
 
 if __name__ == "__main__":
-    aplicar()
-
+    executar_script(PATCHES, MENSAGEM)